@@ -1,13 +1,21 @@
 from .constants import Constants
 from .task_classes import Task, TaskType, TaskValue, TaskValue2, SchedulingResult
-from .cache_classes import CacheEntry, AccessRecord
-from .virtual_node import VirtualNode
+from .cache_classes import CacheEntry, AccessRecord, AccessHistory, EvictionHeap, FrequencySketch
+from .cache_policies import (CachePolicy, FIFOPolicy, LFUPolicy, LRUPolicy, PriorityPolicy, KnapsackPolicy,
+                             ARCPolicy, GDSFPolicy, TinyLFUAdmission, register_cache_policy, create_cache_policy)
+from .virtual_node import VirtualNode, VirtualNodeView, VirtualNodePool
+from .backlog_classes import TypeBacklog, CandidateIndex, ExpiryWheel
 from .lyapunov_classes import LyapunovQueue, LyapunovManager
 from .stats_classes import TaskTypeStat, SimulationStats
 from .task_manager import TaskManager
 from .mec import MEC
 from .scheduler import Scheduler
 from .simulator import Simulator
+from .event_calendar import EventCalendar
+from .popularity import PopularityEstimator
+from .trace_recorder import TraceRecorder, load_trace
+from .arrival_source import ArrivalSource, ArrivalTrace
+from .lookup_tables import LookupTables
 
 __version__ = "1.0.0"
 __author__ = "Converted from MATLAB"
@@ -16,12 +24,21 @@ __author__ = "Converted from MATLAB"
 __all__ = [
     'Constants',
     'Task', 'TaskType', 'TaskValue', 'TaskValue2', 'SchedulingResult',
-    'CacheEntry', 'AccessRecord',
-    'VirtualNode',
+    'CacheEntry', 'AccessRecord', 'AccessHistory', 'EvictionHeap', 'FrequencySketch',
+    'CachePolicy', 'FIFOPolicy', 'LFUPolicy', 'LRUPolicy', 'PriorityPolicy', 'KnapsackPolicy', 'ARCPolicy',
+    'GDSFPolicy', 'TinyLFUAdmission',
+    'register_cache_policy', 'create_cache_policy',
+    'VirtualNode', 'VirtualNodeView', 'VirtualNodePool',
+    'TypeBacklog', 'CandidateIndex', 'ExpiryWheel',
     'LyapunovQueue', 'LyapunovManager',
     'TaskTypeStat', 'SimulationStats',
     'TaskManager',
     'MEC',
     'Scheduler',
-    'Simulator'
+    'Simulator',
+    'EventCalendar',
+    'PopularityEstimator',
+    'TraceRecorder', 'load_trace',
+    'ArrivalSource', 'ArrivalTrace',
+    'LookupTables'
 ]
@@ -0,0 +1,109 @@
+"""
+任务到达来源（预先生成并在多个仿真之间共享的到达序列）
+"""
+
+import random
+import numpy as np
+try:
+    from .constants import Constants
+    from .task_classes import TaskType, TaskBatch
+    from .task_manager import TaskManager
+except ImportError:
+    from constants import Constants
+    from task_classes import TaskType, TaskBatch
+    from task_manager import TaskManager
+
+
+class ArrivalSource:
+    """
+    ArrivalSource 任务到达来源接口
+    TaskManager(arrival_source=...) 从来源读取任务类型表和每个时隙到达的任务，不再自行随机生成
+    """
+
+    def task_types(self):
+        """返回任务类型1~K的TaskType列表（每次调用返回新的对象）"""
+        raise NotImplementedError
+
+    def batch(self, task_manager, time_slot):
+        """返回time_slot时隙到达的任务（TaskBatch），任务ID从task_manager.nextTaskID开始分配"""
+        raise NotImplementedError
+
+    def next_arrival_slot(self, time_slot):
+        """time_slot之后下一个有任务到达的时隙（没有则返回None）"""
+        raise NotImplementedError
+
+
+class ArrivalTrace(ArrivalSource):
+    """
+    ArrivalTrace 预先生成的任务类型表和到达序列（列式存储）
+    第t个时隙到达的任务为 TaskType/MKR/SKR 列中 [Offsets[t], Offsets[t+1]) 的行；
+    同一序列可被多个仿真器回放，各算法面对完全相同的任务，与各自消耗随机数的多少无关
+    """
+
+    def __init__(self, priorities, cks, meta_ks, pks, offsets, task_types, mkrs, skrs):
+        """构造函数，前四个参数为任务类型1~K的属性数组，offsets长度为时隙数+1"""
+        self.Priority = np.asarray(priorities, dtype=np.int64)
+        self.Ck = np.asarray(cks, dtype=np.int64)
+        self.MetaK = np.asarray(meta_ks, dtype=np.int64)
+        self.PK = np.asarray(pks, dtype=np.float64)
+        self.Offsets = np.asarray(offsets, dtype=np.int64)
+        self.TaskType = np.asarray(task_types, dtype=np.int64)
+        self.MKR = np.asarray(mkrs, dtype=np.int64)
+        self.SKR = np.asarray(skrs, dtype=np.int64)
+        self.ActiveSlots = np.flatnonzero(np.diff(self.Offsets))  # 有任务到达的时隙
+
+    @property
+    def K(self):
+        """任务类型数"""
+        return len(self.Priority)
+
+    @property
+    def NumSlots(self):
+        """序列覆盖的时隙数"""
+        return len(self.Offsets) - 1
+
+    @classmethod
+    def record(cls, task_manager, num_slots):
+        """用task_manager的任务类型表和随机到达过程生成前num_slots个时隙的到达序列（会消耗task_manager的随机数和任务ID）"""
+        K = Constants.K()
+        types = [task_manager.TaskTypes[i] for i in range(1, K + 1)]
+        batches = [task_manager.generate_task_batch(t) for t in range(num_slots)]
+        offsets = np.zeros(num_slots + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(batch) for batch in batches])
+        empty = np.zeros(0, dtype=np.int64)
+        return cls([tt.Priority for tt in types], [tt.Ck for tt in types], [tt.MetaK for tt in types],
+                   [tt.PK for tt in types], offsets,
+                   np.concatenate([batch.TaskType for batch in batches] + [empty]),
+                   np.concatenate([batch.MKR for batch in batches] + [empty]),
+                   np.concatenate([batch.SKR for batch in batches] + [empty]))
+
+    @classmethod
+    def generate(cls, num_slots, seed=0):
+        """按当前的K、N生成num_slots个时隙的到达序列，结果只由 (seed, K, N, num_slots) 决定，不改变random模块的状态"""
+        state = random.getstate()
+        try:
+            random.seed(seed)
+            task_manager = TaskManager()
+        finally:
+            random.setstate(state)
+        return cls.record(task_manager, num_slots)
+
+    def task_types(self):
+        """返回任务类型1~K的TaskType列表"""
+        return [TaskType(i + 1, int(self.Priority[i]), int(self.Ck[i]), int(self.MetaK[i]), float(self.PK[i]))
+                for i in range(self.K)]
+
+    def batch(self, task_manager, time_slot):
+        """返回time_slot时隙到达的任务（超出序列范围时没有任务到达）"""
+        if 0 <= time_slot < self.NumSlots:
+            start, end = self.Offsets[time_slot], self.Offsets[time_slot + 1]
+        else:
+            start = end = 0
+        task_ids = np.arange(task_manager.nextTaskID, task_manager.nextTaskID + end - start, dtype=np.int64)
+        task_manager.nextTaskID += int(end - start)
+        return TaskBatch(task_ids, self.TaskType[start:end], self.MKR[start:end], self.SKR[start:end], time_slot)
+
+    def next_arrival_slot(self, time_slot):
+        """time_slot之后下一个有任务到达的时隙"""
+        index = np.searchsorted(self.ActiveSlots, time_slot, side='right')
+        return int(self.ActiveSlots[index]) if index < len(self.ActiveSlots) else None
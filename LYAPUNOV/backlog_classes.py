@@ -0,0 +1,378 @@
+"""
+积压队列相关的类定义（列式存储）
+"""
+
+import numpy as np
+
+try:
+    from .constants import Constants
+except ImportError:
+    from constants import Constants
+
+
+class TypeBacklog:
+    """
+    TypeBacklog 单一任务类型的积压队列（按到达顺序的NumPy列式存储）
+    过期任务由时间轮计数后先标记为失效，物理删除延迟到下一次需要读取具体任务时进行
+    """
+
+    INITIAL_CAPACITY = 16  # 初始预分配长度
+    COLUMNS = ('ID', 'MKR', 'SKR', 'CreateTime', 'ExpireAt', 'Seq')
+
+    def __init__(self, task_type):
+        """构造函数"""
+        self.TaskType = task_type                                      # 任务类型
+        self.Size = 0                                                  # 列中的任务行数（含已过期未删除的行）
+        self.DeadCount = 0                                             # 已过期但尚未物理删除的任务数
+        self.ID = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)          # 任务ID列
+        self.MKR = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)         # 输入数据量列
+        self.SKR = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)         # 时延预警值列
+        self.CreateTime = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)  # 创建时隙列
+        self.ExpireAt = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)    # 被移除的时隙（Age > SKR 的第一个时隙）
+        self.Seq = np.zeros(self.INITIAL_CAPACITY, dtype=np.int64)         # 在CandidateIndex中的到达序号
+
+    def __len__(self):
+        return self.Size - self.DeadCount
+
+    def _ensure_capacity(self, extra):
+        """保证还能追加extra个任务，不足时按倍数扩容"""
+        required = self.Size + extra
+        capacity = len(self.ID)
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        for name in self.COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=np.int64)
+            new[:self.Size] = old[:self.Size]
+            setattr(self, name, new)
+
+    def append(self, task_id, mkr, skr, create_time, expire_at, seq=0):
+        """追加单个任务"""
+        self._ensure_capacity(1)
+        n = self.Size
+        self.ID[n] = task_id
+        self.MKR[n] = mkr
+        self.SKR[n] = skr
+        self.CreateTime[n] = create_time
+        self.ExpireAt[n] = expire_at
+        self.Seq[n] = seq
+        self.Size = n + 1
+
+    def extend(self, ids, mkrs, skrs, create_times, expire_ats, seqs=0):
+        """批量追加任务（各参数为等长数组）"""
+        count = len(ids)
+        if count == 0:
+            return
+        self._ensure_capacity(count)
+        n = self.Size
+        self.ID[n:n + count] = ids
+        self.MKR[n:n + count] = mkrs
+        self.SKR[n:n + count] = skrs
+        self.CreateTime[n:n + count] = create_times
+        self.ExpireAt[n:n + count] = expire_ats
+        self.Seq[n:n + count] = seqs
+        self.Size = n + count
+
+    def clear(self):
+        """清空积压队列（保留已分配的内存）"""
+        self.Size = 0
+        self.DeadCount = 0
+
+    def pop_front(self, count):
+        """移除最早到达的count个任务（调用前需先purge）"""
+        if count <= 0:
+            return
+        if count >= self.Size:
+            self.clear()
+            return
+        remaining = self.Size - count
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:remaining] = column[count:self.Size]
+        self.Size = remaining
+
+    def mark_expired(self, count):
+        """记录由时间轮判定过期的任务数量"""
+        self.DeadCount += count
+
+    def purge(self, last_expiry_slot):
+        """物理删除 ExpireAt <= last_expiry_slot 的任务行"""
+        if self.DeadCount == 0:
+            return
+        n = self.Size
+        keep = self.ExpireAt[:n] > last_expiry_slot
+        remaining = int(np.count_nonzero(keep))
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:remaining] = column[:n][keep]
+        self.Size = remaining
+        self.DeadCount = 0
+
+    def ages(self, current_time_slot):
+        """各任务的当前年龄（由CreateTime推导）"""
+        return current_time_slot - self.CreateTime[:self.Size]
+
+    def best_index(self, current_time_slot, ck):
+        """
+        选择所需计算频率 Ck*MKR/(SKR-Age) 最小的任务
+        返回 (下标, 所需计算频率)，没有可行任务时返回 (-1, inf)
+        """
+        n = self.Size
+        if n == 0:
+            return -1, float('inf')
+        deadline_slots = self.SKR[:n] - self.ages(current_time_slot)
+        valid = deadline_slots > 0
+        if not valid.any():
+            return -1, float('inf')
+        safe_slots = np.where(valid, deadline_slots, 1)
+        required_freq = (ck * self.MKR[:n]) / (safe_slots * Constants.Tslot) / 1e6
+        required_freq[~valid] = np.inf
+        # argmin 返回第一个最小值，与按到达顺序严格比较的选择结果一致
+        idx = int(np.argmin(required_freq))
+        return idx, float(required_freq[idx])
+
+
+class CandidateIndex:
+    """
+    CandidateIndex 所有任务类型的最优候选任务索引
+    按 (任务类型, MKR, 截止时隙 CreateTime+SKR) 分桶计数，截止时隙按 W = MAX_SKR+2 取模存放。
+    所需计算频率 Ck*MKR/(截止时隙-当前时隙) 只取决于桶，因此查询最优任务的代价与积压规模无关。
+    每个桶记录最早进入的任务序号，同频率时按到达顺序选择，与逐个扫描积压队列的结果一致。
+    从队首移除任务时只减少被移除任务所在桶的计数，并只为仍有任务的桶重新确定最早序号。
+    """
+
+    EMPTY_SEQ = np.iinfo(np.int64).max  # 空桶的序号标记
+
+    def __init__(self, task_types, K):
+        """构造函数，task_types为任务类型映射 (dict)"""
+        self.K = K
+        self.NumMKR = Constants.MAX_MKR - Constants.MIN_MKR + 1
+        self.W = Constants.MAX_SKR + 2
+        shape = (K + 1, self.NumMKR, self.W)
+        self.Count = np.zeros(shape, dtype=np.int64)                  # 桶内任务数
+        self.Deadline = np.zeros(shape, dtype=np.int64)               # 桶对应的截止时隙
+        self.FirstSeq = np.full(shape, self.EMPTY_SEQ, dtype=np.int64)  # 桶内最早任务的到达序号
+        self.Exact = np.ones(K + 1, dtype=bool)                       # 该类型的索引是否可用（截止时隙跨度超过W时回退为扫描）
+        self.NextSeq = 0                                              # 下一个到达序号
+
+        self.Ck = np.zeros(K + 1, dtype=np.int64)                     # 各类型计算复杂度
+        for task_type, tt in task_types.items():
+            if 1 <= task_type <= K:
+                self.Ck[task_type] = tt.Ck
+        self.MKRValues = np.arange(Constants.MIN_MKR, Constants.MAX_MKR + 1, dtype=np.int64)
+
+        # 查询结果缓存：类型 -> (最优MKR, 所需计算频率)，数据变化的类型标记为dirty
+        self.BestMKR = np.zeros(K + 1, dtype=np.int64)
+        self.BestFreq = np.full(K + 1, np.inf)
+        self.BestTime = None
+        self.Dirty = np.ones(K + 1, dtype=bool)
+
+    def covers(self, task_type):
+        """该类型是否由索引维护"""
+        return 1 <= task_type <= self.K
+
+    def add(self, task_type, mkrs, deadlines):
+        """追加一批同类型任务（按到达顺序），mkrs和deadlines为等长数组，返回分配的到达序号（存入积压队列的Seq列）"""
+        count = len(mkrs)
+        seqs = np.arange(self.NextSeq, self.NextSeq + count, dtype=np.int64)
+        self.NextSeq += count
+        if count > 0 and self.covers(task_type):
+            self._insert(task_type, mkrs, deadlines, seqs)
+        return seqs
+
+    def _insert(self, task_type, mkrs, deadlines, seqs):
+        """把已分配序号的任务放入桶中"""
+        self.Dirty[task_type] = True
+        if not self.Exact[task_type]:
+            return
+
+        m_idx = mkrs - Constants.MIN_MKR
+        w_idx = deadlines % self.W
+        counts = self.Count[task_type]
+        stored = self.Deadline[task_type]
+        collided = (counts[m_idx, w_idx] > 0) & (stored[m_idx, w_idx] != deadlines)
+        if (m_idx.min() < 0 or m_idx.max() >= self.NumMKR
+                or deadlines.max() - deadlines.min() >= self.W or collided.any()):
+            self.Exact[task_type] = False
+            return
+
+        np.add.at(counts, (m_idx, w_idx), 1)
+        stored[m_idx, w_idx] = deadlines
+        np.minimum.at(self.FirstSeq[task_type], (m_idx, w_idx), seqs)
+
+    def clear_type(self, task_type):
+        """清空某一类型的索引（积压队列被清空时调用）"""
+        if not self.covers(task_type):
+            return
+        self.Count[task_type] = 0
+        self.FirstSeq[task_type] = self.EMPTY_SEQ
+        self.Exact[task_type] = True
+        self.Dirty[task_type] = True
+
+    def rebuild_type(self, task_type, backlog):
+        """按积压队列的剩余任务（保留原到达序号）重建某一类型的索引"""
+        self.clear_type(task_type)
+        n = backlog.Size
+        if n > 0:
+            self._insert(task_type, backlog.MKR[:n], backlog.CreateTime[:n] + backlog.SKR[:n], backlog.Seq[:n])
+
+    def remove_front(self, task_type, mkrs, deadlines, backlog):
+        """
+        移除某一类型最早到达的一批任务，mkrs和deadlines为被移除任务的列，backlog为移除后（已物理删除过期行）的积压队列
+        被移除任务所在的桶减少计数；仍有任务的桶从队首按到达顺序查找其最早的任务，查找范围按需倍增，通常只需读取队首少量任务
+        """
+        if len(mkrs) == 0 or not self.covers(task_type):
+            return
+        if not self.Exact[task_type]:
+            # 该类型已回退为扫描：按剩余任务重建，剩余任务满足条件时恢复索引
+            self.rebuild_type(task_type, backlog)
+            return
+        self.Dirty[task_type] = True
+
+        m_idx = mkrs - Constants.MIN_MKR
+        w_idx = deadlines % self.W
+        counts = self.Count[task_type]
+        # 桶已因过期被清除并被其他截止时隙复用时不再属于被移除的任务
+        live = self.Deadline[task_type][m_idx, w_idx] == deadlines
+        m_idx, w_idx = m_idx[live], w_idx[live]
+        np.subtract.at(counts, (m_idx, w_idx), 1)
+        counts[m_idx, w_idx] = np.maximum(counts[m_idx, w_idx], 0)  # 过期清除后计数可能已为0
+
+        keys = np.unique(m_idx * self.W + w_idx)
+        flat_counts = counts.reshape(-1)
+        flat_first = self.FirstSeq[task_type].reshape(-1)
+        flat_first[keys[flat_counts[keys] == 0]] = self.EMPTY_SEQ
+        pending = keys[flat_counts[keys] > 0]
+        if len(pending) == 0:
+            return
+
+        n = backlog.Size
+        flat_deadline = self.Deadline[task_type].reshape(-1)
+        window = min(max(4 * len(pending), 64), n)
+        while True:
+            row_deadlines = backlog.CreateTime[:window] + backlog.SKR[:window]
+            row_keys = (backlog.MKR[:window] - Constants.MIN_MKR) * self.W + row_deadlines % self.W
+            row_keys[flat_deadline[row_keys] != row_deadlines] = -1  # 所在桶已被其他截止时隙复用的任务
+            found = np.isin(pending, row_keys)
+            if found.all() or window == n:
+                break
+            window = min(2 * window, n)
+        # 同一桶在队首的第一行即为剩余任务中最早到达的任务
+        unique_keys, first_rows = np.unique(row_keys, return_index=True)
+        hit = np.isin(unique_keys, pending)
+        flat_first[unique_keys[hit]] = backlog.Seq[first_rows[hit]]
+
+    def drop_expired_type(self, task_type, current_time_slot):
+        """清除某一类型中截止时隙早于current_time_slot的桶（时间轮报告该类型有任务过期时调用）"""
+        if not self.covers(task_type):
+            return
+        expired = (self.Count[task_type] > 0) & (self.Deadline[task_type] < current_time_slot)
+        self.Count[task_type][expired] = 0
+        self.FirstSeq[task_type][expired] = self.EMPTY_SEQ
+        self.Dirty[task_type] = True
+
+    def best(self, current_time_slot):
+        """
+        返回各类型的 (最优MKR数组, 所需计算频率数组)，下标为任务类型
+        不存在可行任务或索引不可用的类型频率为inf
+        """
+        if self.BestTime != current_time_slot:
+            # 时隙推进后剩余时隙全部变化，需要重新计算所有类型
+            self.Dirty[:] = True
+            self.BestTime = current_time_slot
+        rows = np.flatnonzero(self.Dirty)
+        if len(rows) == 0:
+            return self.BestMKR, self.BestFreq
+        self.Dirty[:] = False
+
+        counts = self.Count[rows]
+        slack = self.Deadline[rows] - current_time_slot
+        valid = (counts > 0) & (slack > 0)
+        safe_slack = np.where(valid, slack, 1)
+        work = self.Ck[rows][:, None, None] * self.MKRValues[None, :, None]
+        freq = work / (safe_slack * Constants.Tslot) / 1e6
+        freq[~valid] = np.inf
+
+        flat_freq = freq.reshape(len(rows), -1)
+        min_freq = flat_freq.min(axis=1)
+        # 同频率的桶中选择最早到达的任务
+        tie_seq = np.where(flat_freq == min_freq[:, None], self.FirstSeq[rows].reshape(len(rows), -1), self.EMPTY_SEQ)
+        best_cell = np.argmin(tie_seq, axis=1)
+
+        self.BestMKR[rows] = self.MKRValues[best_cell // self.W]
+        self.BestFreq[rows] = min_freq
+        self.BestFreq[rows[~self.Exact[rows]]] = np.inf
+        return self.BestMKR, self.BestFreq
+
+
+class ExpiryWheel:
+    """
+    ExpiryWheel 积压任务过期的哈希时间轮
+    按任务被移除的时隙登记各类型的任务数量，每格存放一个绝对时隙的登记，超出一圈的登记放入溢出表。
+    登记以 (任务类型, 代数) 为键，类型积压队列被整体清空时代数加一，旧登记在到期时被忽略。
+    """
+
+    def __init__(self):
+        """构造函数"""
+        self.W = Constants.MAX_SKR + 2
+        self.Slots = [None] * self.W  # 每格为 (绝对时隙, {(类型, 代数): 数量}) 或 None
+        self.Overflow = {}            # 超出一圈的登记：绝对时隙 -> {(类型, 代数): 数量}
+        self.LastSlot = -1            # 已推进到的时隙
+
+    def schedule(self, expire_slot, key, count):
+        """登记count个在expire_slot时隙过期的任务"""
+        if expire_slot > self.LastSlot + self.W:
+            bucket = self.Overflow.setdefault(expire_slot, {})
+        else:
+            pos = expire_slot % self.W
+            entry = self.Slots[pos]
+            if entry is None or entry[0] != expire_slot:
+                entry = (expire_slot, {})
+                self.Slots[pos] = entry
+            bucket = entry[1]
+        bucket[key] = bucket.get(key, 0) + count
+
+    def unschedule(self, expire_slot, key, count):
+        """撤销登记（任务在过期前被部分移除时调用）"""
+        if expire_slot <= self.LastSlot:
+            return
+        if expire_slot in self.Overflow:
+            bucket = self.Overflow[expire_slot]
+        else:
+            entry = self.Slots[expire_slot % self.W]
+            if entry is None or entry[0] != expire_slot:
+                return
+            bucket = entry[1]
+        remaining = bucket.get(key, 0) - count
+        if remaining > 0:
+            bucket[key] = remaining
+        else:
+            bucket.pop(key, None)
+
+    def advance(self, current_time_slot):
+        """推进到current_time_slot，返回 (LastSlot, current_time_slot] 内到期的登记列表"""
+        buckets = []
+        if current_time_slot <= self.LastSlot:
+            return buckets
+        if current_time_slot - self.LastSlot >= self.W:
+            positions = range(self.W)
+        else:
+            positions = [slot % self.W for slot in range(self.LastSlot + 1, current_time_slot + 1)]
+        for pos in positions:
+            entry = self.Slots[pos]
+            if entry is not None and entry[0] <= current_time_slot:
+                if entry[1]:
+                    buckets.append(entry[1])
+                self.Slots[pos] = None
+
+        self.LastSlot = current_time_slot
+        if self.Overflow:
+            for expire_slot in [slot for slot in self.Overflow if slot <= current_time_slot]:
+                buckets.append(self.Overflow.pop(expire_slot))
+            # 进入一圈范围内的溢出登记移回时间轮
+            for expire_slot in [slot for slot in self.Overflow if slot <= current_time_slot + self.W]:
+                for key, count in self.Overflow.pop(expire_slot).items():
+                    self.schedule(expire_slot, key, count)
+        return buckets
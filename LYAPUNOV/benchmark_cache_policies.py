@@ -0,0 +1,161 @@
+"""
+缓存策略基准测试 - 在记录的访问序列上回放各缓存策略，对比命中率、命中收入和每次操作耗时
+"""
+
+import contextlib
+import io
+import random
+import time
+import numpy as np
+try:
+    from .constants import Constants
+    from .task_manager import TaskManager
+    from .mec import MEC
+    from .simulator import Simulator
+    from .cache_policies import CACHE_POLICIES
+    from .arrival_source import ArrivalTrace
+    from .trace_recorder import TraceRecorder, load_trace
+except ImportError:
+    from constants import Constants
+    from task_manager import TaskManager
+    from mec import MEC
+    from simulator import Simulator
+    from cache_policies import CACHE_POLICIES
+    from arrival_source import ArrivalTrace
+    from trace_recorder import TraceRecorder, load_trace
+
+
+def record_access_stream(num_slots, seed=0, shift_every=None):
+    """
+    按仿真器的到达过程生成访问序列，返回 (每时隙到达的任务类型列表, 生成任务类型的TaskManager)
+    shift_every不为None时每隔shift_every个时隙把各任务类型的到达概率循环平移K/2个类型，模拟流行度变化
+    """
+    random.seed(seed)
+    task_manager = TaskManager()
+    K = Constants.K()
+    stream = []
+    for t in range(num_slots):
+        if shift_every is not None and t > 0 and t % shift_every == 0:
+            pks = [task_manager.TaskTypes[i].PK for i in range(1, K + 1)]
+            for i in range(1, K + 1):
+                task_manager.set_task_type_pk(i, pks[(i - 1 + K // 2) % K])
+        stream.append(task_manager.generate_task_batch(t).TaskType.tolist())
+    return stream, task_manager
+
+
+def stream_from_arrival_trace(trace):
+    """把已录制的到达序列（ArrivalTrace）转换为访问序列，返回 (每时隙到达的任务类型列表, 使用该序列任务类型表的TaskManager)"""
+    stream = [trace.TaskType[trace.Offsets[t]:trace.Offsets[t + 1]].tolist() for t in range(trace.NumSlots)]
+    return stream, TaskManager(arrival_source=trace)
+
+
+def stream_from_trace(directory, task_manager, num_slots=None):
+    """
+    从仿真事件轨迹（TraceRecorder）的到达记录读取访问序列，返回每时隙到达的任务类型列表
+    轨迹只记录各类型每个时隙的到达数，时隙内按任务类型排列；任务类型表不在轨迹中，需传入记录轨迹时仿真器的TaskManager。
+    num_slots为None时取轨迹中最后一个有到达的时隙
+    """
+    chunks = load_trace(directory)
+    if chunks:
+        events = np.concatenate(chunks)
+        arrivals = events[events['event'] == TraceRecorder.ARRIVAL]
+    else:
+        arrivals = np.zeros(0, dtype=[('slot', '<i8'), ('task_type', '<i4'), ('count', '<i8')])
+    if num_slots is None:
+        num_slots = int(arrivals['slot'].max()) + 1 if len(arrivals) > 0 else 0
+    arrivals = arrivals[arrivals['slot'] < num_slots]
+    order = np.lexsort((arrivals['task_type'], arrivals['slot']))
+    slots = np.repeat(arrivals['slot'][order], arrivals['count'][order])
+    task_types = np.repeat(arrivals['task_type'][order].astype(np.int64), arrivals['count'][order])
+    offsets = np.searchsorted(slots, np.arange(num_slots + 1))
+    return [task_types[offsets[t]:offsets[t + 1]].tolist() for t in range(num_slots)]
+
+
+def replay_access_stream(strategy, stream, task_manager, admission=False):
+    """
+    在独立的MEC缓存上回放访问序列（不运行调度和计算）
+    每个时隙先记录全部到达，再逐个检查到达的任务类型是否命中，未命中的类型视为计算完成后加入缓存。
+    admission为True时在策略前启用TinyLFU准入过滤。
+    返回 {命中率, 命中收入(WHIT*优先级), 每次访问的平均耗时(ns)}
+    """
+    mec = MEC()
+    mec.set_admission_filter(admission)
+    mec.set_cache_strategy(strategy, task_manager)
+    hits, accesses, value = 0, 0, 0.0
+    start = time.perf_counter_ns()
+    for time_slot, task_types in enumerate(stream):
+        mec.update_time_slot(time_slot)
+        mec.record_arrivals(np.bincount(np.asarray(task_types, dtype=np.int64), minlength=Constants.K() + 1))
+        for task_type in task_types:
+            mec.record_task_access(task_type)
+        for task_type in task_types:
+            tt = task_manager.TaskTypes[task_type]
+            if mec.is_cache_hit(task_type):
+                hits += 1
+                value += Constants.WHIT * tt.Priority
+            else:
+                mec.add_to_cache(task_type, tt.MetaK, task_manager)
+        accesses += len(task_types)
+    elapsed = time.perf_counter_ns() - start
+    return {'hit_rate': hits / accesses if accesses > 0 else 0.0, 'value': value,
+            'ns_per_op': elapsed / accesses if accesses > 0 else 0.0}
+
+
+def run_benchmark(strategies=None, num_slots=500, seed=0, shift_every=None, admission=False, arrival_trace=None):
+    """
+    在同一访问序列上回放各注册的缓存策略，返回 {策略编号: 回放结果}
+    arrival_trace不为None时回放该已录制的到达序列（忽略num_slots、seed和shift_every），否则按到达过程生成访问序列
+    """
+    if strategies is None:
+        strategies = sorted(CACHE_POLICIES)
+    if arrival_trace is not None:
+        stream, task_manager = stream_from_arrival_trace(arrival_trace)
+    else:
+        stream, task_manager = record_access_stream(num_slots, seed, shift_every)
+    return {strategy: replay_access_stream(strategy, stream, task_manager, admission) for strategy in strategies}
+
+
+def compare_simulation(strategies=(Constants.Knapsack, Constants.GDSF), time_slots=300, seed=0):
+    """
+    用李雅普诺夫调度运行完整仿真，对比各缓存策略的累计收益、命中率和仿真耗时
+    返回 {策略编号: {收益, 命中率, 仿真耗时(s)}}
+    """
+    results = {}
+    for strategy in strategies:
+        random.seed(seed)
+        np.random.seed(seed)
+        sim = Simulator(time_slots)
+        sim.set_schedule_strategy(Constants.LyapunovSchedule, Constants.VV_DEFAULT)
+        sim.set_cache_strategy(strategy)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.run_simulation()
+        elapsed = time.perf_counter() - start
+        stats = sim.get_statistics()
+        hit_rate = stats.CacheHitCount / stats.TotalCacheAccess if stats.TotalCacheAccess > 0 else 0.0
+        results[strategy] = {'revenue': stats.TotalRevenue, 'hit_rate': hit_rate, 'seconds': elapsed}
+    return results
+
+
+def print_benchmark(results):
+    """打印基准测试结果表"""
+    print(f'{"策略":>16} | {"命中率":>8} {"命中收入":>10} {"ns/次":>10}')
+    for strategy, r in results.items():
+        name = CACHE_POLICIES[strategy].__name__
+        print(f'{name:>16} | {r["hit_rate"]:>8.2%} {r["value"]:>10.1f} {r["ns_per_op"]:>10.0f}')
+
+
+if __name__ == '__main__':
+    print(f'=== 缓存策略回放基准测试 (K={Constants.K()}, N={Constants.N()}, 缓存={Constants.total_cache_size()} Mbit) ===')
+    print_benchmark(run_benchmark())
+    print('\n=== 流行度每100个时隙变化一次 ===')
+    print_benchmark(run_benchmark(shift_every=100))
+    print('\n=== 启用TinyLFU准入过滤 ===')
+    print_benchmark(run_benchmark(admission=True))
+    print('\n=== 启用TinyLFU准入过滤，流行度每100个时隙变化一次 ===')
+    print_benchmark(run_benchmark(shift_every=100, admission=True))
+    print('\n=== 完整仿真（李雅普诺夫调度）===')
+    print(f'{"策略":>16} | {"累计收益":>10} {"命中率":>8} {"耗时(s)":>8}')
+    for strategy, r in compare_simulation().items():
+        name = CACHE_POLICIES[strategy].__name__
+        print(f'{name:>16} | {r["revenue"]:>10.1f} {r["hit_rate"]:>8.2%} {r["seconds"]:>8.2f}')
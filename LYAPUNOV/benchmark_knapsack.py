@@ -0,0 +1,71 @@
+"""
+背包求解器基准测试 - 近似求解（FPTAS）相对精确求解的最优性差距和耗时
+"""
+
+import random
+import time
+try:
+    from .constants import Constants
+    from .knapsack import solve_knapsack, solve_knapsack_fptas
+except ImportError:
+    from constants import Constants
+    from knapsack import solve_knapsack, solve_knapsack_fptas
+
+
+def random_items(num_items, rng, weight_scale=1):
+    """随机生成缓存候选物品：价值 = 访问频率 * 优先级，重量 = 元数据量 * weight_scale"""
+    values = [rng.random() * rng.randint(Constants.MIN_PRIORITY, Constants.MAX_PRIORITY) for _ in range(num_items)]
+    weights = [rng.randint(Constants.MIN_METAK, Constants.MAX_METAK) * weight_scale for _ in range(num_items)]
+    return values, weights
+
+
+def gap_report(item_counts=(10, 20, 40), capacity=None, epsilon=None, instances=20, seed=0):
+    """
+    在小规模实例上比较近似求解与精确求解（capacity默认为当前总缓存容量的一半，epsilon默认为Constants.KNAPSACK_EPSILON）
+    返回结果列表，每项为 {物品数, 平均/最大最优性差距, 两种求解的平均耗时(ms)}
+    """
+    if capacity is None:
+        capacity = Constants.total_cache_size() // 2
+    if epsilon is None:
+        epsilon = Constants.KNAPSACK_EPSILON
+    rng = random.Random(seed)
+    results = []
+    for num_items in item_counts:
+        gaps, exact_ms, approx_ms = [], 0.0, 0.0
+        for _ in range(instances):
+            values, weights = random_items(num_items, rng)
+            start = time.perf_counter()
+            exact = sum(values[i] for i in solve_knapsack(values, weights, capacity))
+            exact_ms += (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            approx = sum(values[i] for i in solve_knapsack_fptas(values, weights, capacity, epsilon))
+            approx_ms += (time.perf_counter() - start) * 1000
+            gaps.append((exact - approx) / exact if exact > 0 else 0.0)
+        results.append({'n': num_items, 'mean_gap': sum(gaps) / len(gaps), 'max_gap': max(gaps),
+                        'exact_ms': exact_ms / instances, 'approx_ms': approx_ms / instances})
+    return results
+
+
+def capacity_scaling(num_items=40, weight_scales=(1, 100, 10000), epsilon=None, seed=0):
+    """容量和重量同比放大时近似求解的耗时(ms)（精确求解的代价随容量线性增长，只在小容量下运行；epsilon默认为Constants.KNAPSACK_EPSILON）"""
+    if epsilon is None:
+        epsilon = Constants.KNAPSACK_EPSILON
+    rng = random.Random(seed)
+    results = []
+    for weight_scale in weight_scales:
+        values, weights = random_items(num_items, rng, weight_scale)
+        capacity = Constants.total_cache_size() * weight_scale
+        start = time.perf_counter()
+        solve_knapsack_fptas(values, weights, capacity, epsilon)
+        results.append({'capacity': capacity, 'approx_ms': (time.perf_counter() - start) * 1000})
+    return results
+
+
+if __name__ == '__main__':
+    print(f'=== 背包近似求解最优性差距 (epsilon={Constants.KNAPSACK_EPSILON}) ===')
+    print(f'{"物品数":>6} | {"平均差距":>8} {"最大差距":>8} | {"精确(ms)":>9} {"近似(ms)":>9}')
+    for r in gap_report():
+        print(f'{r["n"]:>6} | {r["mean_gap"]:>8.3%} {r["max_gap"]:>8.3%} | {r["exact_ms"]:>9.3f} {r["approx_ms"]:>9.3f}')
+    print('\n=== 近似求解耗时随容量变化 ===')
+    for r in capacity_scaling():
+        print(f'容量 {r["capacity"]:>12} Mbit: {r["approx_ms"]:.3f} ms')
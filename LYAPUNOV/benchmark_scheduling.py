@@ -0,0 +1,81 @@
+"""
+调度匹配算法基准测试 - 对比贪心匹配与匈牙利算法的决策耗时和漂移加惩罚
+"""
+
+import time
+import numpy as np
+try:
+    from .constants import Constants
+    from .scheduler import Scheduler
+    from .lookup_tables import LookupTables
+except ImportError:
+    from constants import Constants
+    from scheduler import Scheduler
+    from lookup_tables import LookupTables
+
+
+def random_instance(num_tasks, num_nodes, rng):
+    """随机生成一个李雅普诺夫调度实例（候选任务参数向量和空闲节点频率向量）"""
+    best_mkrs = rng.integers(Constants.MIN_MKR, Constants.MAX_MKR + 1, num_tasks)
+    cks = rng.integers(Constants.MIN_CK, Constants.MAX_CK + 1, num_tasks)
+    slack = rng.integers(1, Constants.MAX_SKR + 1, num_tasks)
+    min_required_freqs = cks * best_mkrs / (slack * Constants.Tslot) / 1e6
+    priorities = rng.integers(Constants.MIN_PRIORITY, Constants.MAX_PRIORITY + 1, num_tasks)
+    queue_lengths = rng.integers(0, 2000, num_tasks)
+    node_freqs = rng.integers(Constants.FMIN, Constants.FMAX + 1, num_nodes)
+    return best_mkrs, cks, min_required_freqs, priorities, queue_lengths, node_freqs
+
+
+def run_matching(scheduler, instance):
+    """构造权重矩阵并求解匹配，返回 (决策耗时(ms), 漂移加惩罚, 匹配数)"""
+    best_mkrs, cks, min_required_freqs, priorities, queue_lengths, node_freqs = instance
+    start = time.perf_counter()
+    wkr, required_slots, energy_cost = LookupTables.compute_terms(best_mkrs, cks, node_freqs)
+    infeasible = node_freqs[None, :] < min_required_freqs[:, None]
+    weight_matrix = scheduler.lyapunov_weight_matrix(wkr, required_slots, energy_cost, priorities, queue_lengths, infeasible)
+    pairs = scheduler.match_pairs(weight_matrix, maximize=False)
+    elapsed = (time.perf_counter() - start) * 1000
+    objective = sum(weight_matrix[i, j] for i, j in pairs)
+    return elapsed, objective, len(pairs)
+
+
+def run_benchmark(task_counts=(10, 50, 100, 200, 400), node_counts=(10, 50, 100, 200), repeats=5, seed=0):
+    """
+    在不同的候选任务数T和空闲节点数V下对比两种匹配算法
+    返回结果列表，每项为 {T, V, 贪心/匈牙利的平均耗时、平均漂移加惩罚和匹配数}
+    """
+    greedy = Scheduler(Constants.LyapunovSchedule, Constants.VV_DEFAULT, Constants.GreedyMatching)
+    hungarian = Scheduler(Constants.LyapunovSchedule, Constants.VV_DEFAULT, Constants.HungarianMatching)
+    rng = np.random.default_rng(seed)
+
+    results = []
+    for num_tasks in task_counts:
+        for num_nodes in node_counts:
+            stats = {'greedy': np.zeros(3), 'hungarian': np.zeros(3)}
+            for _ in range(repeats):
+                instance = random_instance(num_tasks, num_nodes, rng)
+                stats['greedy'] += run_matching(greedy, instance)
+                stats['hungarian'] += run_matching(hungarian, instance)
+            result = {'T': num_tasks, 'V': num_nodes}
+            for name, values in stats.items():
+                elapsed, objective, matched = values / repeats
+                result[f'{name}_ms'] = elapsed
+                result[f'{name}_objective'] = objective
+                result[f'{name}_matched'] = matched
+            results.append(result)
+    return results
+
+
+def print_benchmark(results):
+    """打印基准测试结果表"""
+    print(f'{"T":>5} {"V":>5} | {"贪心(ms)":>10} {"匈牙利(ms)":>10} | {"贪心目标值":>14} {"匈牙利目标值":>14} {"改进":>8}')
+    for r in results:
+        gap = r['greedy_objective'] - r['hungarian_objective']
+        ratio = gap / abs(r['greedy_objective']) * 100 if r['greedy_objective'] != 0 else 0.0
+        print(f'{r["T"]:>5} {r["V"]:>5} | {r["greedy_ms"]:>10.3f} {r["hungarian_ms"]:>10.3f} | '
+              f'{r["greedy_objective"]:>14.2f} {r["hungarian_objective"]:>14.2f} {ratio:>7.2f}%')
+
+
+if __name__ == '__main__':
+    print('=== 调度匹配算法基准测试（漂移加惩罚越小越好） ===')
+    print_benchmark(run_benchmark())
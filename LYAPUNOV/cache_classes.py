@@ -2,6 +2,10 @@
 缓存相关的类定义
 """
 
+import heapq
+from array import array
+import numpy as np
+
 
 class CacheEntry:
     """CacheEntry 缓存条目"""
@@ -22,4 +26,160 @@ class AccessRecord:
         """构造函数"""
         self.TaskType = task_type          # 任务类型
         self.LastAccessTime = last_access_time  # 最后访问时隙
-        self.AccessTimes = []              # 最近访问时隙列表（用于LRU）
+
+
+class AccessHistory:
+    """
+    AccessHistory 各任务类型最近window个时隙内的访问次数（滑动窗口）
+    (K+1)×window 的计数矩阵按 时隙 mod window 循环使用各列：时隙推进时把过期列从窗口计数中减去并清零（NumPy整列操作），
+    记录一次访问只需对预分配数组原地加一（单个元素读写走Python数组，不分配新的列表）
+    """
+
+    def __init__(self, num_types, window):
+        """构造函数，num_types为任务类型数K（索引0不使用）"""
+        self.Window = window
+        self._counts = array('q', bytes(8 * (num_types + 1) * window))  # 计数矩阵（按行连续存储）
+        self._window_counts = array('q', bytes(8 * (num_types + 1)))
+        self.Counts = np.frombuffer(self._counts, dtype=np.int64).reshape(num_types + 1, window)  # 各类型在各时隙列中的访问次数（同一内存的视图）
+        self.WindowCounts = np.frombuffer(self._window_counts, dtype=np.int64)  # 各类型在窗口内的访问次数（同一内存的视图）
+        self.CurrentSlot = 0  # 当前时隙
+        self.Column = 0       # 当前时隙对应的列
+
+    def advance(self, time_slot):
+        """推进到time_slot，清除移出窗口的时隙列（时隙回退时清空全部记录）"""
+        if time_slot == self.CurrentSlot:
+            return
+        if time_slot < self.CurrentSlot or time_slot - self.CurrentSlot >= self.Window:
+            self.Counts[:] = 0
+            self.WindowCounts[:] = 0
+        else:
+            columns = np.arange(self.CurrentSlot + 1, time_slot + 1) % self.Window
+            self.WindowCounts -= self.Counts[:, columns].sum(axis=1)
+            self.Counts[:, columns] = 0
+        self.CurrentSlot = time_slot
+        self.Column = time_slot % self.Window
+
+    def record(self, task_type):
+        """记录当前时隙的一次访问"""
+        self._counts[task_type * self.Window + self.Column] += 1
+        self._window_counts[task_type] += 1
+
+    def window_count(self, task_type):
+        """窗口内的访问次数"""
+        return self._window_counts[task_type]
+
+    def access_times(self, task_type):
+        """窗口内各次访问的时隙列表（从早到晚，同一时隙多次访问时重复）"""
+        times = []
+        first = max(self.CurrentSlot - self.Window + 1, 0)
+        for time_slot in range(first, self.CurrentSlot + 1):
+            times.extend([time_slot] * int(self.Counts[task_type, time_slot % self.Window]))
+        return times
+
+
+class EvictionHeap:
+    """
+    EvictionHeap 按 (键, 插入序号) 选出最小缓存项的惰性删除小顶堆
+    键变化或缓存项移除时只更新当前登记，堆中的旧元素在取堆顶时丢弃；
+    插入序号与缓存插入顺序一致，因此键相同时选择最早插入缓存的项
+    """
+
+    def __init__(self):
+        """构造函数"""
+        self.Heap = []     # 小顶堆，元素为 (键, 插入序号, 任务类型)
+        self.Current = {}  # 任务类型 -> 当前的 (键, 插入序号)
+
+    def __len__(self):
+        return len(self.Current)
+
+    def __contains__(self, task_type):
+        return task_type in self.Current
+
+    def add(self, task_type, key, seq):
+        """登记一个缓存项"""
+        self.Current[task_type] = (key, seq)
+        heapq.heappush(self.Heap, (key, seq, task_type))
+        if len(self.Heap) > 2 * len(self.Current) + 32:
+            self._compact()
+
+    def update(self, task_type, key):
+        """更新已登记缓存项的键（未登记或键未变化时忽略）"""
+        current = self.Current.get(task_type)
+        if current is not None and current[0] != key:
+            self.add(task_type, key, current[1])
+
+    def remove(self, task_type):
+        """移除缓存项的登记"""
+        self.Current.pop(task_type, None)
+
+    def peek(self):
+        """返回 (键, 插入序号) 最小的任务类型，没有登记时返回None"""
+        heap = self.Heap
+        while heap and self.Current.get(heap[0][2]) != heap[0][:2]:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def key(self, task_type):
+        """已登记缓存项的键"""
+        return self.Current[task_type][0]
+
+    def _compact(self):
+        """丢弃堆中的过期元素"""
+        self.Heap = [(key, seq, task_type) for task_type, (key, seq) in self.Current.items()]
+        heapq.heapify(self.Heap)
+
+
+class FrequencySketch:
+    """
+    FrequencySketch 计数最小草图（count-min sketch），估计任务类型的近期访问次数
+    depth行、每行width个饱和计数器，任务类型的64位混合哈希按位切分为各行的计数器下标，估计值取各行计数器的最小值；
+    记录次数达到sample_size时所有计数器减半（老化），内存与任务类型数无关
+    """
+
+    _MASK64 = (1 << 64) - 1
+
+    def __init__(self, width, depth, sample_size, max_count, seed=0):
+        """构造函数，width向上取整为2的幂，depth * log2(width) 不超过64"""
+        bits = max(int(width - 1).bit_length(), 1)
+        if depth * bits > 64:
+            raise ValueError('depth * log2(width) 不能超过64')
+        self.Width = 1 << bits
+        self.Depth = depth
+        self.SampleSize = sample_size
+        self.MaxCount = max_count
+        self.Seed = seed & self._MASK64
+        self.Table = bytearray(depth * self.Width)  # 计数器表（按行连续存储，单个计数器读写走Python字节数组）
+        self.Counters = np.frombuffer(self.Table, dtype=np.uint8).reshape(depth, self.Width)  # 同一内存的NumPy视图（用于整体减半）
+        self.Slices = [(row * bits, row * self.Width) for row in range(depth)]  # 各行 (哈希右移位数, 行偏移)
+        self.Additions = 0   # 上次减半以来的记录次数
+        self.ResetCount = 0  # 减半次数
+
+    def _hash(self, key):
+        """64位混合哈希"""
+        h = (key * 0x9E3779B97F4A7C15 + self.Seed) & self._MASK64
+        h ^= h >> 31
+        return (h * 0xD6E8FEB86659FD93) & self._MASK64
+
+    def increment(self, key):
+        """记录一次访问"""
+        h = self._hash(key)
+        table, mask, max_count = self.Table, self.Width - 1, self.MaxCount
+        for shift, offset in self.Slices:
+            index = ((h >> shift) & mask) + offset
+            if table[index] < max_count:
+                table[index] += 1
+        self.Additions += 1
+        if self.Additions >= self.SampleSize:
+            self.reset()
+
+    def estimate(self, key):
+        """估计近期访问次数（不低于上次老化后的实际值，超过计数器上限时为上限）"""
+        h = self._hash(key)
+        table, mask = self.Table, self.Width - 1
+        return min(table[((h >> shift) & mask) + offset] for shift, offset in self.Slices)
+
+    def reset(self):
+        """所有计数器减半（老化）"""
+        np.right_shift(self.Counters, 1, out=self.Counters)
+        self.Additions //= 2
+        self.ResetCount += 1
@@ -0,0 +1,408 @@
+"""
+缓存替换策略（可插拔接口与注册表）
+"""
+
+from collections import OrderedDict
+try:
+    from .constants import Constants
+    from .cache_classes import EvictionHeap, FrequencySketch
+    from .knapsack import solve_knapsack_fptas, IncrementalKnapsack
+except ImportError:
+    from constants import Constants
+    from cache_classes import EvictionHeap, FrequencySketch
+    from knapsack import solve_knapsack_fptas, IncrementalKnapsack
+
+
+class CachePolicy:
+    """
+    CachePolicy 缓存替换策略接口
+    缓存内容（Cache、UsedCacheSize、访问统计）由MEC维护，策略只维护自己选择替换对象所需的状态。
+    MEC在任务访问、缓存命中、加入和移出缓存项时调用对应的钩子；缓存空间不足时先调用admit，
+    再依次移出evict给出的替换对象，最后空间足够才加入新任务。
+    钩子的cache参数为调用方MEC。
+    """
+
+    def on_access(self, cache, task_type):
+        """任务生成（访问）时调用，访问记录已更新"""
+
+    def on_hit(self, cache, task_type, entry):
+        """缓存命中时调用，entry的命中次数已更新"""
+
+    def on_insert(self, cache, task_type, entry, task_manager):
+        """缓存项加入缓存后调用（task_manager可能为None）"""
+
+    def on_remove(self, cache, task_type):
+        """缓存项移出缓存后调用"""
+
+    def admit(self, cache, task_type, meta_size, task_manager):
+        """缓存空间不足时是否允许新任务替换缓存项"""
+        return True
+
+    def evict(self, cache, task_type, meta_size, task_manager):
+        """
+        生成器，依次给出需要移出的缓存项（MEC移出一项后才取下一项）
+        停止时缓存空间仍不足则新任务不加入缓存，已移出的缓存项不恢复
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _evict_until_fit(cache, meta_size, next_victim):
+        """按next_victim()给出的顺序移出缓存项，直到新任务可以放入缓存或next_victim返回None"""
+        capacity = Constants.total_cache_size()
+        while cache.UsedCacheSize + meta_size > capacity:
+            victim = next_victim()
+            if victim is None:
+                return
+            yield victim
+
+
+class FIFOPolicy(CachePolicy):
+    """FIFO缓存替换策略：移出最早插入的缓存项"""
+
+    def __init__(self):
+        """构造函数"""
+        self.InsertOrder = OrderedDict()  # 缓存插入顺序，key为任务类型
+
+    def on_insert(self, cache, task_type, entry, task_manager):
+        self.InsertOrder[task_type] = None
+
+    def on_remove(self, cache, task_type):
+        self.InsertOrder.pop(task_type, None)
+
+    def evict(self, cache, task_type, meta_size, task_manager):
+        order = self.InsertOrder
+        return self._evict_until_fit(cache, meta_size, lambda: next(iter(order), None))
+
+
+class HeapPolicy(CachePolicy):
+    """按 (键, 插入顺序) 最小选择替换对象的策略基类，子类通过_key给出缓存项加入时的键"""
+
+    def __init__(self):
+        """构造函数"""
+        self.Heap = EvictionHeap()  # 候选替换对象
+        self.InsertSeq = 0          # 缓存插入序号（键相同时移出最早插入的缓存项）
+
+    def _key(self, cache, task_type, entry, task_manager):
+        raise NotImplementedError
+
+    def on_insert(self, cache, task_type, entry, task_manager):
+        key = self._key(cache, task_type, entry, task_manager)
+        self.InsertSeq += 1
+        if key is not None:
+            self.Heap.add(task_type, key, self.InsertSeq)
+
+    def on_remove(self, cache, task_type):
+        self.Heap.remove(task_type)
+
+    def evict(self, cache, task_type, meta_size, task_manager):
+        return self._evict_until_fit(cache, meta_size, self.Heap.peek)
+
+
+class LFUPolicy(HeapPolicy):
+    """LFU (Least Frequently Used) 缓存替换策略：移出命中次数最少的缓存项"""
+
+    def _key(self, cache, task_type, entry, task_manager):
+        return entry.HitCount
+
+    def on_hit(self, cache, task_type, entry):
+        self.Heap.update(task_type, entry.HitCount)
+
+
+class LRUPolicy(HeapPolicy):
+    """LRU (Least Recently Used) 缓存替换策略：移出最后访问时隙最早的缓存项"""
+
+    def _key(self, cache, task_type, entry, task_manager):
+        return cache.AccessRecords[task_type].LastAccessTime
+
+    def on_access(self, cache, task_type):
+        self.Heap.update(task_type, cache.AccessRecords[task_type].LastAccessTime)
+
+
+class PriorityPolicy(HeapPolicy):
+    """基于优先级的缓存替换策略：只移出优先级低于新任务的缓存项，从优先级最低的开始"""
+
+    def _key(self, cache, task_type, entry, task_manager):
+        if task_manager is None or task_type not in task_manager.TaskTypes:
+            return None
+        return task_manager.TaskTypes[task_type].Priority
+
+    def evict(self, cache, task_type, meta_size, task_manager):
+        if task_type not in task_manager.TaskTypes:
+            return iter(())
+        new_priority = task_manager.TaskTypes[task_type].Priority
+        heap = self.Heap
+
+        def next_victim():
+            victim = heap.peek()
+            if victim is None or not new_priority > heap.key(victim):
+                return None
+            return victim
+
+        return self._evict_until_fit(cache, meta_size, next_victim)
+
+
+class KnapsackPolicy(CachePolicy):
+    """
+    基于01背包算法的缓存替换策略
+    候选物品为当前缓存中的任务和新任务（价值 = 流行度 * 优先级，重量 = 元数据量，流行度见MEC.popularity）：先用价值上界判断新任务能否被选中，
+    再求解背包（精确模式复用缓存内容未变时的前缀DP结果，近似模式使用FPTAS），新任务被选中时只移出未被选中的缓存项
+    """
+
+    def __init__(self, mode=Constants.ExactKnapsack, epsilon=Constants.KNAPSACK_EPSILON):
+        """构造函数"""
+        self.Solver = IncrementalKnapsack(Constants.KNAPSACK_REUSE_TOLERANCE)  # 增量求解器
+        self.Mode = mode        # 背包求解模式
+        self.Epsilon = epsilon  # 近似求解的精度参数
+
+    def set_mode(self, mode, epsilon):
+        """设置求解模式及近似精度"""
+        self.Mode = mode
+        self.Epsilon = epsilon
+
+    def evict(self, cache, task_type, meta_size, task_manager):
+        if task_type not in task_manager.TaskTypes:
+            return []
+
+        # 构建候选任务（当前缓存中的任务）
+        cached_types = []
+        values = []
+        weights = []
+        for cached_type in cache.Cache:
+            if cached_type in task_manager.TaskTypes:
+                tt = task_manager.TaskTypes[cached_type]
+                cached_types.append(cached_type)
+                values.append(cache.popularity(cached_type) * tt.Priority)
+                weights.append(tt.MetaK)
+
+        new_value = cache.popularity(task_type) * task_manager.TaskTypes[task_type].Priority
+        capacity = Constants.total_cache_size()
+
+        # 新任务的价值不足以替换任何缓存组合时无需求解
+        solver = self.Solver
+        if solver.cannot_improve(values, weights, capacity, new_value, meta_size):
+            solver.SkipCount += 1
+            return []
+
+        # 使用01背包算法选择最优组合（新任务的下标为len(cached_types)）
+        if self.Mode == Constants.ApproxKnapsack:
+            selected = solve_knapsack_fptas(values + [new_value], weights + [meta_size], capacity, self.Epsilon)
+        else:
+            selected = solver.solve_with_item(cached_types, values, weights, capacity, new_value, meta_size)
+        if len(cached_types) not in selected:
+            return []
+
+        # 只移出未被选中的缓存项，保留其余缓存项的统计信息
+        kept_types = {cached_types[i] for i in selected if i < len(cached_types)}
+        return [cached_type for cached_type in cached_types if cached_type not in kept_types]
+
+
+class GDSFPolicy(HeapPolicy):
+    """
+    GDSF (GreedyDual-Size-Frequency) 缓存替换策略：移出 H = Clock + 优先级 * 访问次数 / 元数据量 最小的缓存项
+    访问次数为命中次数+1；移出缓存项时膨胀时钟Clock增大到该项的H，使长期未命中的缓存项逐渐被新加入的缓存项超过。
+    按单位元数据量的价值替换，代价为 O(log 缓存项数)
+    """
+
+    def __init__(self):
+        """构造函数"""
+        super().__init__()
+        self.Clock = 0.0     # 膨胀时钟
+        self.Weights = {}    # 缓存项 -> 优先级 / 元数据量
+
+    def _key(self, cache, task_type, entry, task_manager):
+        if task_manager is not None and task_type in task_manager.TaskTypes:
+            priority = task_manager.TaskTypes[task_type].Priority
+        else:
+            priority = Constants.MIN_PRIORITY
+        self.Weights[task_type] = priority / entry.MetaSize
+        return self.Clock + self.Weights[task_type] * (entry.HitCount + 1)
+
+    def on_hit(self, cache, task_type, entry):
+        weight = self.Weights.get(task_type)
+        if weight is not None:
+            self.Heap.update(task_type, self.Clock + weight * (entry.HitCount + 1))
+
+    def on_remove(self, cache, task_type):
+        # 时钟只随实际移出的缓存项增大（准入过滤拒绝替换时不变）
+        if task_type in self.Heap:
+            self.Clock = max(self.Clock, self.Heap.key(task_type))
+        super().on_remove(cache, task_type)
+        self.Weights.pop(task_type, None)
+
+
+class _SizedList:
+    """按最近使用排序的任务类型列表（最早使用的在前），同时统计列表中元数据量之和 (Mbit)"""
+
+    def __init__(self):
+        """构造函数"""
+        self.Items = OrderedDict()  # 任务类型 -> 元数据量
+        self.Size = 0               # 元数据量之和
+
+    def __len__(self):
+        return len(self.Items)
+
+    def __contains__(self, task_type):
+        return task_type in self.Items
+
+    def push(self, task_type, size):
+        """加入到最近使用端"""
+        self.pop(task_type)
+        self.Items[task_type] = size
+        self.Size += size
+
+    def pop(self, task_type):
+        """移除任务类型，返回其元数据量（不在列表中时返回None）"""
+        size = self.Items.pop(task_type, None)
+        if size is not None:
+            self.Size -= size
+        return size
+
+    def touch(self, task_type):
+        """移动到最近使用端"""
+        self.Items.move_to_end(task_type)
+
+    def lru(self):
+        """最早使用的任务类型（列表为空时返回None）"""
+        return next(iter(self.Items), None)
+
+
+class ARCPolicy(CachePolicy):
+    """
+    ARC (Adaptive Replacement Cache) 缓存替换策略
+    T1为加入后未再命中的缓存项，T2为命中过或从幽灵列表重新加入的缓存项；B1/B2为最近从T1/T2移出的任务类型（幽灵列表，只记录元数据量）。
+    访问B1中的任务类型说明T1偏小，访问B2中的说明T2偏小，据此在线调整T1的目标大小Target，调整量按该类型的元数据量和两个幽灵列表的大小之比计算；
+    替换时T1超过Target则移出T1最久未用的缓存项，否则移出T2的。所有大小按Mbit计，以适应不同的元数据量。
+    """
+
+    def __init__(self):
+        """构造函数"""
+        self.T1 = _SizedList()  # 只加入过一次的缓存项
+        self.T2 = _SizedList()  # 命中过的缓存项
+        self.B1 = _SizedList()  # 从T1移出的幽灵项
+        self.B2 = _SizedList()  # 从T2移出的幽灵项
+        self.Target = 0.0       # T1的目标大小 (Mbit)
+        self.Promoted = {}      # 访问时位于幽灵列表、等待重新加入缓存的任务类型 -> 'B1' 或 'B2'
+
+    def on_access(self, cache, task_type):
+        capacity = Constants.total_cache_size()
+        if task_type in self.B1:
+            delta = max(self.B2.Size / self.B1.Size, 1.0) * self.B1.Items[task_type]
+            self.Target = min(capacity, self.Target + delta)
+            self.B1.pop(task_type)
+            self.Promoted[task_type] = 'B1'
+        elif task_type in self.B2:
+            delta = max(self.B1.Size / self.B2.Size, 1.0) * self.B2.Items[task_type]
+            self.Target = max(0.0, self.Target - delta)
+            self.B2.pop(task_type)
+            self.Promoted[task_type] = 'B2'
+
+    def on_hit(self, cache, task_type, entry):
+        if task_type in self.T1:
+            self.T2.push(task_type, self.T1.pop(task_type))
+        elif task_type in self.T2:
+            self.T2.touch(task_type)
+
+    def on_insert(self, cache, task_type, entry, task_manager):
+        if self.Promoted.pop(task_type, None) is not None:
+            self.T2.push(task_type, entry.MetaSize)
+        else:
+            self.T1.push(task_type, entry.MetaSize)
+        self._trim_ghosts()
+
+    def on_remove(self, cache, task_type):
+        size = self.T1.pop(task_type)
+        if size is not None:
+            self.B1.push(task_type, size)
+        else:
+            size = self.T2.pop(task_type)
+            if size is not None:
+                self.B2.push(task_type, size)
+        self._trim_ghosts()
+
+    def evict(self, cache, task_type, meta_size, task_manager):
+        from_b2 = self.Promoted.get(task_type) == 'B2'
+
+        def next_victim():
+            t1_over_target = self.T1.Size > self.Target or (from_b2 and self.T1.Size >= self.Target)
+            if len(self.T1) > 0 and (t1_over_target or len(self.T2) == 0):
+                return self.T1.lru()
+            return self.T2.lru()
+
+        return self._evict_until_fit(cache, meta_size, next_victim)
+
+    def _trim_ghosts(self):
+        """限制幽灵列表大小：T1+B1不超过缓存容量，四个列表之和不超过两倍缓存容量"""
+        capacity = Constants.total_cache_size()
+        while len(self.B1) > 0 and self.T1.Size + self.B1.Size > capacity:
+            self.B1.pop(self.B1.lru())
+        while self.T1.Size + self.T2.Size + self.B1.Size + self.B2.Size > 2 * capacity:
+            ghosts = self.B2 if len(self.B2) > 0 else self.B1
+            if len(ghosts) == 0:
+                break
+            ghosts.pop(ghosts.lru())
+
+
+class TinyLFUAdmission(CachePolicy):
+    """
+    TinyLFU 准入过滤：包装任意缓存策略，用频率草图记录每次任务访问；
+    缓存空间不足时，只有新任务的估计访问频率高于被包装策略给出的第一个替换对象时才执行替换，
+    避免只访问一次的任务类型挤出高频缓存项。其余钩子转发给被包装的策略。
+    """
+
+    def __init__(self, policy, sketch=None):
+        """构造函数，sketch默认按Constants中的草图参数创建"""
+        self.Policy = policy  # 被包装的缓存策略
+        if sketch is None:
+            sketch = FrequencySketch(Constants.SKETCH_WIDTH, Constants.SKETCH_DEPTH,
+                                     Constants.SKETCH_SAMPLE_SIZE, Constants.SKETCH_MAX_COUNT)
+        self.Sketch = sketch
+        self.RejectCount = 0  # 被拒绝准入的次数
+
+    def on_access(self, cache, task_type):
+        self.Sketch.increment(task_type)
+        self.Policy.on_access(cache, task_type)
+
+    def on_hit(self, cache, task_type, entry):
+        self.Policy.on_hit(cache, task_type, entry)
+
+    def on_insert(self, cache, task_type, entry, task_manager):
+        self.Policy.on_insert(cache, task_type, entry, task_manager)
+
+    def on_remove(self, cache, task_type):
+        self.Policy.on_remove(cache, task_type)
+
+    def admit(self, cache, task_type, meta_size, task_manager):
+        return self.Policy.admit(cache, task_type, meta_size, task_manager)
+
+    def evict(self, cache, task_type, meta_size, task_manager):
+        victims = iter(self.Policy.evict(cache, task_type, meta_size, task_manager))
+        first = next(victims, None)
+        if first is None:
+            return
+        if self.Sketch.estimate(task_type) <= self.Sketch.estimate(first):
+            self.RejectCount += 1
+            return
+        yield first
+        yield from victims
+
+
+# 缓存策略注册表：Constants中的策略编号 -> 策略类（无参构造）
+CACHE_POLICIES = {
+    Constants.FIFO: FIFOPolicy,
+    Constants.LFU: LFUPolicy,
+    Constants.LRU: LRUPolicy,
+    Constants.Priority: PriorityPolicy,
+    Constants.Knapsack: KnapsackPolicy,
+    Constants.ARC: ARCPolicy,
+    Constants.GDSF: GDSFPolicy,
+}
+
+
+def register_cache_policy(strategy, policy_class):
+    """注册缓存策略，之后可通过 MEC.set_cache_strategy(strategy) 使用"""
+    CACHE_POLICIES[strategy] = policy_class
+
+
+def create_cache_policy(strategy):
+    """按策略编号创建缓存策略实例（未注册的编号使用FIFO）"""
+    return CACHE_POLICIES.get(strategy, FIFOPolicy)()
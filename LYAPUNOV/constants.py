@@ -52,12 +52,45 @@ class Constants:
     LRU = 3       # 最近最少使用
     Priority = 4  # 基于优先级
     Knapsack = 5  # 基于01背包算法
+    ARC = 6       # 自适应替换缓存（Adaptive Replacement Cache，按元数据量平衡最近访问和访问频率）
+    GDSF = 7      # GreedyDual-Size-Frequency（按 优先级*命中次数/元数据量 + 膨胀时钟 替换）
+    
+    ACCESS_WINDOW = 40  # 访问记录的滑动窗口长度（时隙）
+    
+    # 任务类型流行度估计（缓存策略和候选任务价值使用）
+    CumulativePopularity = 1    # 累计访问频率：访问次数 / 总任务数（默认）
+    DecayedPopularity = 2       # 指数衰减计数的占比，按半衰期遗忘过去的热点
+    POPULARITY_HALF_LIFE = 50   # 衰减计数的半衰期（时隙）
+    
+    # 背包缓存策略参数
+    KNAPSACK_REUSE_TOLERANCE = 0.0  # 复用上一次背包求解结果允许的价值相对变化（0表示只在价值完全相同时复用）
+    ExactKnapsack = 1         # 精确求解（按容量动态规划，默认）
+    ApproxKnapsack = 2        # 近似求解（利润缩放FPTAS，代价与容量无关，适用于大容量缓存）
+    KNAPSACK_EPSILON = 0.1    # 近似求解的精度参数epsilon，结果价值不低于最优值的(1-epsilon)倍
+    
+    # 缓存准入过滤参数（TinyLFU频率草图）
+    SKETCH_WIDTH = 512          # 每行计数器数（与任务类型数K无关）
+    SKETCH_DEPTH = 4            # 行数（每行一个哈希函数）
+    SKETCH_SAMPLE_SIZE = 5120   # 记录次数达到该值时所有计数器减半，使频率估计跟随流行度变化
+    SKETCH_MAX_COUNT = 15       # 计数器上限（相当于4位计数器）
+    
+    # 仿真事件轨迹记录参数
+    TRACE_BUFFER_RECORDS = 65536      # 内存缓冲区的记录数，满时整块写入文件
+    TRACE_CHUNK_RECORDS = 4194304     # 每个分块文件的记录数（约132MB）
     
     GreedySchedule = 1     # 贪心调度（原有简单策略）
     ShortTermSchedule = 2  # 短期调度算法（调度算法2）[KM匹配策略]
     LyapunovSchedule = 3   # 李雅普诺夫调度算法（调度算法3，KM匹配）
     NoCacheSchedule = 4    # 无缓存调度算法（只用KM匹配，不考虑缓存）
     
+    # 任务-节点匹配算法枚举（短期调度和李雅普诺夫调度使用）
+    GreedyMatching = 1     # 贪心匹配：按权重排序逐对匹配（默认）
+    HungarianMatching = 2  # 匈牙利算法：求总权重最优的最大匹配
+    
+    # 仿真推进模式枚举
+    SlotStepping = 1  # 逐时隙推进（默认）
+    EventDriven = 2   # 事件驱动推进：跳过没有事件的时隙，统计结果与逐时隙推进一致
+    
     # 可变的全局参数（用于实验配置）
     _TOTAL_CACHE_SIZE_DEFAULT = 1000    # 总缓存大小 (Mbit)
     _K_DEFAULT = 40                     # 任务类型总数
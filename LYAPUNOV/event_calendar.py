@@ -0,0 +1,41 @@
+"""
+事件日历类（用于事件驱动仿真模式）
+"""
+
+import heapq
+
+
+class EventCalendar:
+    """EventCalendar 按时隙排序的事件优先队列（节点计算完成、任务过期）"""
+
+    NODE_COMPLETION = 1  # 虚拟节点计算完成事件
+    TASK_EXPIRY = 2      # 积压任务过期事件
+
+    def __init__(self):
+        """构造函数"""
+        self.Heap = []        # 小顶堆，元素为 (时隙, 事件类型)
+        self.Pending = set()  # 堆中已有的 (时隙, 事件类型)，用于去重
+
+    def __len__(self):
+        return len(self.Heap)
+
+    def push(self, time_slot, kind):
+        """登记一个在time_slot时隙发生的事件（同一时隙同类事件只登记一次）"""
+        key = (int(time_slot), kind)
+        if key in self.Pending:
+            return
+        self.Pending.add(key)
+        heapq.heappush(self.Heap, key)
+
+    def push_expiries(self, expiry_slots):
+        """批量登记任务过期事件"""
+        for time_slot in set(expiry_slots):
+            self.push(time_slot, self.TASK_EXPIRY)
+
+    def next_event_slot(self, current_time_slot):
+        """丢弃不晚于current_time_slot的事件，返回下一个事件的时隙（没有则返回None）"""
+        while self.Heap and self.Heap[0][0] <= current_time_slot:
+            self.Pending.discard(heapq.heappop(self.Heap))
+        if self.Heap:
+            return self.Heap[0][0]
+        return None
@@ -0,0 +1,192 @@
+"""
+01背包求解器（缓存替换使用）
+"""
+
+import numpy as np
+
+
+def _fill_rows(values, weights, capacity, dp):
+    """
+    按物品顺序就地更新一维DP数组dp（长度capacity+1），返回各物品的决策位图
+    决策位图第i行第w位表示容量为w时取物品i严格更优
+    """
+    decisions = np.zeros((len(values), (capacity + 8) // 8), dtype=np.uint8)
+    take_mask = np.zeros(capacity + 1, dtype=bool)
+
+    for i in range(len(values)):
+        weight = weights[i]
+        if weight > capacity:
+            continue
+        # 容量w >= weight时：取该物品的价值为 dp[w-weight] + value
+        take_value = dp[:capacity + 1 - weight] + values[i]
+        better = take_value > dp[weight:]
+        if not better.any():
+            continue
+        take_mask[:weight] = False
+        take_mask[weight:] = better
+        decisions[i] = np.packbits(take_mask)
+        np.maximum(dp[weight:], take_value, out=dp[weight:])
+    return decisions
+
+
+def _backtrack(decisions, weights, capacity):
+    """按决策位图回溯选中物品的下标（下标从大到小）"""
+    selected = []
+    w = capacity
+    for i in range(len(weights) - 1, -1, -1):
+        if (decisions[i, w >> 3] >> (7 - (w & 7))) & 1:
+            selected.append(i)
+            w -= weights[i]
+    return selected
+
+
+def solve_knapsack(values, weights, capacity):
+    """
+    01背包动态规划求解，返回选中物品的下标列表（按回溯顺序，即下标从大到小）
+
+    使用一维滚动数组：dp[w] 表示已处理物品在容量为w时的最大价值，每个物品用一次向量化比较更新；
+    每个物品的选择决策（取该物品严格更优）压缩为按位存储的位图，用于回溯。
+    内存为 O(容量 + 物品数*容量/8)，与逐格填写 (n+1)*(容量+1) 表的结果一致。
+    容量和重量按整数处理。
+    """
+    int_capacity = int(capacity)
+    if len(values) == 0 or int_capacity < 0:
+        return []
+    int_weights = [int(weight) for weight in weights]
+
+    dp = np.zeros(int_capacity + 1, dtype=np.float64)
+    decisions = _fill_rows(values, int_weights, int_capacity, dp)
+    return _backtrack(decisions, int_weights, int_capacity)
+
+
+def solve_knapsack_fptas(values, weights, capacity, epsilon):
+    """
+    01背包的近似求解（利润缩放FPTAS），返回选中物品的下标列表（下标从大到小）
+    价值按 epsilon*最大价值/物品数 缩放取整后按利润做动态规划（min_weight[p] 为达到缩放利润p的最小重量），
+    结果价值不低于最优值的 (1-epsilon) 倍；代价为 O(物品数^2/epsilon)，与容量无关。
+    最后按价值密度降序把剩余物品装入剩余容量。
+    """
+    int_capacity = int(capacity)
+    int_weights = [int(weight) for weight in weights]
+    eligible = [i for i in range(len(values)) if int_weights[i] <= int_capacity and values[i] > 0]
+    if len(eligible) == 0:
+        return []
+
+    scale = epsilon * max(values[i] for i in eligible) / len(eligible)
+    profits = [int(values[i] // scale) for i in eligible]
+    total_profit = sum(profits)
+
+    min_weight = np.full(total_profit + 1, np.inf)
+    min_weight[0] = 0
+    decisions = np.zeros((len(eligible), (total_profit + 8) // 8), dtype=np.uint8)
+    take_mask = np.zeros(total_profit + 1, dtype=bool)
+    for k, i in enumerate(eligible):
+        profit = profits[k]
+        if profit == 0:
+            continue
+        take_weight = min_weight[:total_profit + 1 - profit] + int_weights[i]
+        better = take_weight < min_weight[profit:]
+        if not better.any():
+            continue
+        take_mask[:profit] = False
+        take_mask[profit:] = better
+        decisions[k] = np.packbits(take_mask)
+        np.minimum(min_weight[profit:], take_weight, out=min_weight[profit:])
+
+    # 回溯容量内缩放利润最大的组合
+    p = int(np.flatnonzero(min_weight <= int_capacity).max())
+    selected = set()
+    for k in range(len(eligible) - 1, -1, -1):
+        if (decisions[k, p >> 3] >> (7 - (p & 7))) & 1:
+            selected.add(eligible[k])
+            p -= profits[k]
+
+    # 按价值密度把剩余物品装入剩余容量
+    remaining = int_capacity - sum(int_weights[i] for i in selected)
+    for i in sorted(eligible, key=lambda i: values[i] / max(int_weights[i], 1), reverse=True):
+        if i not in selected and int_weights[i] <= remaining:
+            selected.add(i)
+            remaining -= int_weights[i]
+    return sorted(selected, reverse=True)
+
+
+class IncrementalKnapsack:
+    """
+    IncrementalKnapsack 增量01背包求解器
+    缓存替换时的物品为 当前缓存中的物品 + 一个新物品。求解器保存前缀物品（缓存中的物品）的DP数组和决策位图，
+    前缀物品、重量和容量不变且价值变化不超过容差时直接复用，只需为新物品更新一行。
+    容差为0时复用的结果与完整求解一致。
+    """
+
+    def __init__(self, tolerance=0.0):
+        """构造函数，tolerance为复用前缀DP结果允许的价值相对变化"""
+        self.Tolerance = tolerance
+        self.PrefixKeys = None       # 前缀物品标识（有序）
+        self.PrefixValues = None     # 求解前缀时使用的价值
+        self.PrefixWeights = None    # 前缀物品整数重量
+        self.Capacity = None         # 整数容量
+        self.PrefixDP = None         # 处理完前缀物品后的DP数组
+        self.PrefixDecisions = None  # 前缀物品的决策位图
+        self.SolveCount = 0          # 完整求解次数
+        self.ReuseCount = 0          # 复用前缀结果的次数
+        self.SkipCount = 0           # 由价值上界直接判定不选新物品的次数
+
+    def cannot_improve(self, values, weights, capacity, new_value, new_weight):
+        """
+        判断新物品是否不可能被选中（不求解背包）
+        前缀物品全部装入背包，新物品要装入至少需要移出 need = 前缀总重量 + 新物品重量 - 容量 的重量，
+        移出物品的价值不低于 need * 前缀物品的最小价值密度；新物品价值不超过该下界时一定不会被选中
+        """
+        int_capacity = int(capacity)
+        int_weights = np.array([int(weight) for weight in weights], dtype=np.int64)
+        if int(new_weight) > int_capacity:
+            return True
+        need = int(int_weights.sum()) + int(new_weight) - int_capacity
+        if need <= 0 or len(int_weights) == 0 or int_weights.min() <= 0:
+            return False
+        values = np.asarray(values, dtype=np.float64)
+        min_loss = need * float((values / int_weights).min())
+        margin = 1e-9 * (float(values.sum()) + abs(new_value) + 1.0)  # 预留浮点累加误差
+        return new_value < min_loss - margin
+
+    def solve_with_item(self, keys, values, weights, capacity, new_value, new_weight):
+        """
+        求解 前缀物品 + 新物品 的01背包，返回选中物品的下标列表（新物品的下标为len(keys)，顺序同solve_knapsack）
+        keys为前缀物品的标识，用于判断能否复用上一次的前缀结果
+        """
+        int_capacity = int(capacity)
+        if int_capacity < 0:
+            return []
+        keys = tuple(keys)
+        values = np.asarray(values, dtype=np.float64)
+        int_weights = [int(weight) for weight in weights]
+
+        if self._can_reuse(keys, values, int_weights, int_capacity):
+            self.ReuseCount += 1
+        else:
+            self.SolveCount += 1
+            dp = np.zeros(int_capacity + 1, dtype=np.float64)
+            self.PrefixDecisions = _fill_rows(values, int_weights, int_capacity, dp)
+            self.PrefixDP = dp
+            self.PrefixKeys = keys
+            self.PrefixValues = values
+            self.PrefixWeights = int_weights
+            self.Capacity = int_capacity
+
+        dp = self.PrefixDP.copy()
+        new_row = _fill_rows([new_value], [int(new_weight)], int_capacity, dp)
+        decisions = np.vstack([self.PrefixDecisions, new_row])
+        return _backtrack(decisions, self.PrefixWeights + [int(new_weight)], int_capacity)
+
+    def _can_reuse(self, keys, values, int_weights, int_capacity):
+        """上一次的前缀结果是否可以复用"""
+        if self.PrefixKeys != keys or self.Capacity != int_capacity or self.PrefixWeights != int_weights:
+            return False
+        if self.Tolerance <= 0:
+            return bool(np.array_equal(self.PrefixValues, values))
+        drift = np.abs(values - self.PrefixValues)
+        return bool((drift <= self.Tolerance * np.abs(self.PrefixValues)).all())
+
+    def invalidate(self):
+        """丢弃保存的前缀结果"""
+        self.PrefixKeys = None
@@ -1,117 +1,240 @@
 """
 日志工具类
 用于向log.txt文件追加打印日志信息
+日志记录先放入内存缓冲区，由后台写入线程成块追加到文件；消息在级别开启时才格式化（支持%格式参数和可调用对象）
 """
 
-import os
+import atexit
+import threading
+import time
 from datetime import datetime
 
+
+class LogWriter:
+    """
+    LogWriter 日志后台写入器
+    记录追加到内存缓冲区，后台线程每隔flush_interval秒或缓冲区达到flush_size条时把全部记录一次性写入文件；
+    写入线程在第一条记录到达时才启动，程序退出时写出剩余记录
+    """
+
+    def __init__(self, log_file, flush_size=4096, flush_interval=0.5):
+        """构造函数"""
+        self.LogFile = log_file
+        self.FlushSize = flush_size          # 缓冲区达到该记录数时立即唤醒写入线程
+        self.FlushInterval = flush_interval  # 写入线程的最长等待时间 (s)
+        self.Buffer = []                     # 待写入的记录 (时间戳, 级别名, 消息)
+        self.Lock = threading.Lock()         # 保护缓冲区
+        self.WriteLock = threading.Lock()    # 保证文件写入顺序
+        self.Wakeup = threading.Event()
+        self.Thread = None
+        atexit.register(self.flush)
+
+    def append(self, record):
+        """追加一条记录"""
+        with self.Lock:
+            self.Buffer.append(record)
+            pending = len(self.Buffer)
+            if self.Thread is None:
+                self.Thread = threading.Thread(target=self._run, name='LogWriter', daemon=True)
+                self.Thread.start()
+        if pending >= self.FlushSize:
+            self.Wakeup.set()
+
+    def _run(self):
+        """后台写入循环"""
+        while True:
+            self.Wakeup.wait(self.FlushInterval)
+            self.Wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """把缓冲区中的全部记录写入文件"""
+        with self.WriteLock:
+            with self.Lock:
+                records, self.Buffer = self.Buffer, []
+            if not records:
+                return
+            text = ''.join(f"[{self._format_time(timestamp)}] [{level}] {message}\n" for timestamp, level, message in records)
+            try:
+                with open(self.LogFile, 'a', encoding='utf-8') as f:
+                    f.write(text)
+            except Exception as e:
+                print(f"写入日志文件时出错: {e}")
+
+    def truncate(self):
+        """丢弃缓冲区中的记录并清空日志文件"""
+        with self.WriteLock:
+            with self.Lock:
+                self.Buffer = []
+            with open(self.LogFile, 'w', encoding='utf-8') as f:
+                f.write("")
+
+    @staticmethod
+    def _format_time(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
 class Logger:
-    """Logger 日志记录工具类"""
-    
-    def __init__(self, log_file="./LYAPUNOV/log.txt", enable_log=True):
+    """
+    Logger 日志记录工具类
+    全局日志实例logger按模块名创建子日志（get_logger），子日志共享全局开关和写入器，可单独设置级别；
+    消息可以是带%格式参数的字符串或返回字符串的可调用对象，级别未开启时不做任何格式化
+    """
+
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+
+    def __init__(self, log_file="./LYAPUNOV/log.txt", enable_log=True, name=None, parent=None):
         """
         构造函数
-        
+
         参数:
         log_file: 日志文件名，默认为"log.txt"
         enable_log: 是否启用日志记录，默认为True
+        name: 子日志的模块名（全局日志为None）
+        parent: 子日志所属的全局日志
         """
-        self.log_file = log_file
-        self.Enable_Log = enable_log
-        
+        self.Name = name
+        self.Root = self if parent is None else parent
+        self.Level = None if parent is not None else Logger.DEBUG  # 子日志为None时使用全局日志的级别
+        if parent is None:
+            self.log_file = log_file
+            self.Enable_Log = enable_log
+            self.Writer = LogWriter(log_file)
+            self.Children = {}  # 模块名 -> 子日志
+
     def set_enable_log(self, enable):
         """
-        设置是否启用日志记录
-        
+        设置是否启用日志记录（全局开关，对所有子日志生效）
+
         参数:
         enable: True表示启用，False表示禁用
         """
-        self.Enable_Log = enable
-    
-    def log(self, message, level="INFO"):
+        self.Root.Enable_Log = enable
+
+    def get_child(self, name):
+        """获取（不存在时创建）模块名为name的子日志"""
+        root = self.Root
+        if name not in root.Children:
+            root.Children[name] = Logger(name=name, parent=root)
+        return root.Children[name]
+
+    def set_level(self, level, module=None):
+        """设置日志级别；指定module时只设置该模块的子日志（level为None时恢复使用全局级别）"""
+        if module is not None:
+            self.get_child(module).Level = level
+        else:
+            self.Level = level
+
+    def is_enabled_for(self, level):
+        """该级别的日志是否会被记录（可在热点循环前调用一次，避免逐条检查）"""
+        root = self.Root
+        if not root.Enable_Log:
+            return False
+        threshold = self.Level if self.Level is not None else root.Level
+        return level >= threshold
+
+    def log(self, message, level="INFO", *args):
         """
         记录日志信息
-        
+
         参数:
-        message: 要记录的消息
+        message: 要记录的消息（带%格式参数的字符串，或返回字符串的可调用对象）
         level: 日志级别，如INFO, DEBUG, WARNING, ERROR
+        args: 消息的%格式参数
         """
         # 如果日志记录被禁用，直接返回
-        if not self.Enable_Log:
+        if not self.is_enabled_for(getattr(Logger, level, Logger.INFO)):
             return
-            
+        self._emit(level, message, args)
+
+    def _emit(self, level, message, args):
+        """格式化消息并放入写入缓冲区"""
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_entry = f"[{timestamp}] [{level}] {message}\n"
-            
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_entry)
+            if callable(message):
+                message = message()
+            elif args:
+                message = message % args
         except Exception as e:
-            print(f"写入日志文件时出错: {e}")
-    
-    def info(self, message):
+            message = f"格式化日志消息时出错: {e}"
+        self.Root.Writer.append((time.time(), level, message))
+
+    def info(self, message, *args):
         """记录INFO级别日志"""
-        self.log(message, "INFO")
-    
-    def debug(self, message):
+        if self.is_enabled_for(Logger.INFO):
+            self._emit("INFO", message, args)
+
+    def debug(self, message, *args):
         """记录DEBUG级别日志"""
-        self.log(message, "DEBUG")
-    
-    def warning(self, message):
+        if self.is_enabled_for(Logger.DEBUG):
+            self._emit("DEBUG", message, args)
+
+    def warning(self, message, *args):
         """记录WARNING级别日志"""
-        self.log(message, "WARNING")
-    
-    def error(self, message):
+        if self.is_enabled_for(Logger.WARNING):
+            self._emit("WARNING", message, args)
+
+    def error(self, message, *args):
         """记录ERROR级别日志"""
-        self.log(message, "ERROR")
-    
+        if self.is_enabled_for(Logger.ERROR):
+            self._emit("ERROR", message, args)
+
     def separator(self, char="=", length=50):
         """添加分隔线"""
         # 如果日志记录被禁用，直接返回
-        if not self.Enable_Log:
+        if not self.is_enabled_for(Logger.INFO):
             return
-        separator_line = char * length
-        self.log(separator_line, "")
-    
+        self._emit("", char * length, ())
+
+    def flush(self):
+        """立即把缓冲区中的日志写入文件"""
+        self.Root.Writer.flush()
+
     def clear_log(self):
         """清空日志文件"""
         # 如果日志记录被禁用，直接返回
-        if not self.Enable_Log:
+        if not self.Root.Enable_Log:
             return
         try:
-            with open(self.log_file, 'w', encoding='utf-8') as f:
-                f.write("")
+            self.Root.Writer.truncate()
             self.info("日志文件已清空")
         except Exception as e:
             print(f"清空日志文件时出错: {e}")
-    
+
     def log_revenue_details(self, time_slot, cache_income, compute_income, cache_cost, compute_cost, total_profit):
         """
         记录收益详细信息
-        
+
         参数:
         time_slot: 当前时隙
         cache_income: 缓存收入
-        compute_income: 计算收入  
+        compute_income: 计算收入
         cache_cost: 缓存成本
         compute_cost: 计算成本
         total_profit: 总利润
         """
         # 如果日志记录被禁用，直接返回
-        if not self.Enable_Log:
+        if not self.is_enabled_for(Logger.INFO):
             return
-            
+
         self.separator("-", 60)
-        self.info(f"时隙 {time_slot} 收益详情:")
-        self.info(f"  缓存收入: {cache_income:.6f}")
-        self.info(f"  计算收入: {compute_income:.6f}")
-        self.info(f"  总收入: {cache_income + compute_income:.6f}")
-        self.info(f"  缓存成本: {cache_cost:.6f}")
-        self.info(f"  计算成本: {compute_cost:.6f}")
-        self.info(f"  总成本: {cache_cost + compute_cost:.6f}")
-        self.info(f"  净利润: {total_profit:.6f}")
+        self.info("时隙 %s 收益详情:", time_slot)
+        self.info("  缓存收入: %.6f", cache_income)
+        self.info("  计算收入: %.6f", compute_income)
+        self.info("  总收入: %.6f", cache_income + compute_income)
+        self.info("  缓存成本: %.6f", cache_cost)
+        self.info("  计算成本: %.6f", compute_cost)
+        self.info("  总成本: %.6f", cache_cost + compute_cost)
+        self.info("  净利润: %.6f", total_profit)
         self.separator("-", 60)
 
+
 # 创建全局日志实例（默认禁用日志以提高性能，可手动启用）
 logger = Logger(enable_log=False)
+
+
+def get_logger(name):
+    """获取模块名为name的子日志（共享全局日志的开关和写入器，可通过logger.set_level(级别, name)单独设置级别）"""
+    return logger.get_child(name)
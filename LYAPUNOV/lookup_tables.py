@@ -0,0 +1,86 @@
+"""
+预计算查找表类
+"""
+
+import numpy as np
+try:
+    from .constants import Constants
+except ImportError:
+    from constants import Constants
+
+
+class LookupTables:
+    """
+    LookupTables 调度相关量的预计算查找表
+    MKR取值范围、各类型Ck和各节点频率都是固定的离散集合，仿真开始时按 (任务类型, MKR, 节点) 一次性计算
+    占用时隙数、bkr、wkr和能耗成本，调度、李雅普诺夫更新和收益计算直接查表，保证各模块结果一致。
+    表按任务类型的Ck计算，节点频率变化后需要重建。
+    """
+
+    def __init__(self, task_types, node_frequencies):
+        """构造函数，task_types为任务类型映射 (dict)，node_frequencies为各节点的计算频率（下标 = 节点ID - 1）"""
+        self.K = max(task_types) if task_types else 0
+        self.MKRValues = np.arange(Constants.MIN_MKR, Constants.MAX_MKR + 1, dtype=np.int64)
+        self.Ck = np.zeros(self.K + 1, dtype=np.int64)  # 各类型计算复杂度（索引0不使用）
+        for task_type, tt in task_types.items():
+            self.Ck[task_type] = tt.Ck
+        self.NodeFrequency = np.array(node_frequencies, dtype=np.int64)
+
+        self.Wkr, self.Slots, self.Energy = self.compute_terms(
+            self.MKRValues[None, :], self.Ck[:, None], self.NodeFrequency)
+        self.Bkr = self.Wkr[:, :, None] - self.Slots  # 调度（非缓存命中）带来的时隙增益 (类型, MKR, 节点)
+
+        # 积压队列中没有可行任务时李雅普诺夫更新使用的平均MKR对应的wkr
+        self.DefaultWkr, _, _ = self.compute_terms((Constants.MIN_MKR + Constants.MAX_MKR) / 2, self.Ck, self.NodeFrequency[:0])
+
+    @staticmethod
+    def compute_terms(mkrs, cks, node_frequencies):
+        """
+        按公式计算 (wkr, 占用时隙数, 能耗成本)，mkrs与cks可广播，结果在最后一维追加节点维
+        wkr = ceil(MKR*Ck/FM/Tslot)，占用时隙数 = ceil(MKR*Ck/f/Tslot)，能耗成本 = AFIE*(f/1000)^3*NMT*占用时隙数
+        """
+        work = np.asarray(mkrs * cks)
+        wkr = np.ceil((work / Constants.FM) / Constants.Tslot).astype(np.int64)
+        slots = np.ceil((work[..., None] / node_frequencies) / Constants.Tslot).astype(np.int64)
+        # 单位时隙的能耗只与节点频率有关，按节点逐个计算
+        slot_energy = np.array([Constants.AFIE * ((freq / 1000.0) ** 3) * Constants.NMT
+                                for freq in np.asarray(node_frequencies).tolist()], dtype=np.float64)
+        energy = slot_energy * slots
+        return wkr, slots, energy
+
+    def covers(self, task_types, mkrs):
+        """给定的任务类型和MKR是否都在表的范围内"""
+        task_types = np.asarray(task_types)
+        mkrs = np.asarray(mkrs)
+        if task_types.size == 0:
+            return True
+        return bool(task_types.min() >= 1 and task_types.max() <= self.K
+                    and mkrs.min() >= Constants.MIN_MKR and mkrs.max() <= Constants.MAX_MKR)
+
+    def _mkr_index(self, mkrs):
+        """MKR对应的表下标（越界的MKR截断到边界，用于被屏蔽的无效候选）"""
+        return np.clip(np.asarray(mkrs) - Constants.MIN_MKR, 0, len(self.MKRValues) - 1)
+
+    def wkr(self, task_types, mkrs):
+        """查询wkr"""
+        return self.Wkr[task_types, self._mkr_index(mkrs)]
+
+    def slots(self, task_type, mkr, node_index):
+        """查询单个任务在节点上的占用时隙数"""
+        return int(self.Slots[task_type, self._mkr_index(mkr), node_index])
+
+    def energy(self, task_type, mkr, node_index):
+        """查询单个任务在节点上的能耗成本"""
+        return float(self.Energy[task_type, self._mkr_index(mkr), node_index])
+
+    def gather(self, task_types, mkrs, node_indices):
+        """
+        按 (候选任务, 空闲节点) 取出 (wkr向量, 占用时隙数矩阵, 能耗成本矩阵)
+        task_types和mkrs为等长向量，node_indices为节点的0基下标向量
+        """
+        rows = np.asarray(task_types)[:, None]
+        mkr_index = self._mkr_index(mkrs)
+        cols = mkr_index[:, None]
+        return (self.Wkr[task_types, mkr_index],
+                self.Slots[rows, cols, node_indices[None, :]],
+                self.Energy[rows, cols, node_indices[None, :]])
@@ -3,42 +3,57 @@
 """
 
 import math
+import numpy as np
 try:
     from .constants import Constants
 except ImportError:
     from constants import Constants
 # 导入日志工具
 try:
-    from .logger import logger
+    from .logger import get_logger
 except ImportError:
-    from logger import logger
+    from logger import get_logger
+
+logger = get_logger('lyapunov_classes')
 
 
 class LyapunovQueue:
-    """LyapunovQueue 李雅普诺夫队列"""
+    """LyapunovQueue 李雅普诺夫队列，队列长度存放在LyapunovManager的队列向量中"""
     
-    def __init__(self, task_type):
-        """构造函数"""
+    def __init__(self, task_type, lengths=None):
+        """构造函数，lengths为所属管理器的队列长度向量（下标为任务类型），缺省时使用独立存储"""
         self.TaskType = task_type        # 任务类型
-        self.QueueLength = 0            # 队列长度
+        if lengths is None:
+            lengths = np.zeros(task_type + 1, dtype=np.int64)
+        self.Lengths = lengths          # 队列长度向量
         self.PreviousLength = 0         # 前一时隙的队列长度
 
+    @property
+    def QueueLength(self):
+        """队列长度"""
+        return int(self.Lengths[self.TaskType])
+
+    @QueueLength.setter
+    def QueueLength(self, value):
+        self.Lengths[self.TaskType] = value
+
 
 class LyapunovManager:
     """LyapunovManager 李雅普诺夫队列管理器"""
     
     def __init__(self):
         """构造函数"""
-        self.Queues = {}  # 每个任务类型对应一个队列 (dict)
+        K = Constants.K()
+        self.QueueLengths = np.zeros(K + 1, dtype=np.int64)  # 各类型队列长度向量（索引0不使用）
+        self.Queues = {}  # 每个任务类型对应一个队列 (dict)，读写作用于QueueLengths
         
         # 为每个任务类型初始化队列
-        K = Constants.K()
         for i in range(1, K + 1):
-            self.Queues[i] = LyapunovQueue(i)
+            self.Queues[i] = LyapunovQueue(i, self.QueueLengths)
     
     def update_queue(self, task_type, bk, dropped_count, ak, task_manager, scheduled_mkr=None, current_time_slot=None):
         """
-        更新队列
+        更新单个类型的队列
         Qk(t+1) = max{Qk(t) - bk(t) - 当前类型丢弃的任务数量*wkr, 0} + ak(t)*wkr
         
         参数:
@@ -60,7 +75,11 @@ class LyapunovManager:
                 # 从积压队列中选择所需计算频率最小的任务
                 mkr_to_use = self._find_best_mkr_for_type(task_type, task_manager)
             
-            wkr = self._calculate_wkr(mkr_to_use, tt.Ck)
+            tables = task_manager.LookupTables
+            if tables is not None and float(mkr_to_use).is_integer() and tables.covers(task_type, mkr_to_use):
+                wkr = int(tables.wkr(task_type, int(mkr_to_use)))
+            else:
+                wkr = self._calculate_wkr(mkr_to_use, tt.Ck)
 
             new_length = max(q.QueueLength - bk - dropped_count * wkr, 0) + ak * wkr
             
@@ -68,7 +87,39 @@ class LyapunovManager:
             
             # 记录李雅普诺夫队列更新日志
             if current_time_slot is not None:
-                logger.debug(f"时隙{current_time_slot}，更新李雅普诺夫队列，类型={task_type}，队列长度: {new_length:.2f}")
+                logger.debug("时隙%s，更新李雅普诺夫队列，类型=%s，队列长度: %.2f", current_time_slot, task_type, new_length)
+
+    def update_queues(self, bk, dropped_counts, ak, task_manager, scheduled_mkr, current_time_slot=None):
+        """
+        一次性更新所有类型的队列，参数均为下标为任务类型的向量（长度K+1）
+        Qk(t+1) = max{Qk(t) - bk(t) - 当前类型丢弃的任务数量*wkr, 0} + ak(t)*wkr
+
+        参数:
+        bk: 各类型本时隙完成的任务数
+        dropped_counts: 各类型本时隙丢弃的任务数
+        ak: 各类型本时隙新到达的任务数
+        scheduled_mkr: 各类型实际调度的任务的mkr值，0表示本时隙未调度该类型
+        current_time_slot: 当前时隙（用于日志记录）
+        """
+        # 未调度的类型从积压队列中选择所需计算频率最小的任务，没有可行任务时使用平均值
+        best_mkr, best_freq = task_manager.get_best_candidates()
+        has_mkr = (scheduled_mkr > 0) | ~np.isinf(best_freq)
+        mkr_to_use = np.where(scheduled_mkr > 0, scheduled_mkr, np.where(has_mkr, best_mkr, 0))
+
+        tables = task_manager.LookupTables
+        types = np.arange(len(mkr_to_use))
+        if tables is not None and len(tables.Ck) == len(mkr_to_use) and tables.covers(types[has_mkr], mkr_to_use[has_mkr]):
+            wkr = np.where(has_mkr, tables.wkr(types, mkr_to_use), tables.DefaultWkr)
+        else:
+            mkr_to_use = np.where(has_mkr, mkr_to_use, (Constants.MIN_MKR + Constants.MAX_MKR) / 2)
+            wkr = np.ceil((mkr_to_use * task_manager.TypeCk / Constants.FM) / Constants.Tslot).astype(np.int64)
+
+        lengths = np.maximum(self.QueueLengths - bk - dropped_counts * wkr, 0) + ak * wkr
+        self.QueueLengths[1:] = lengths[1:]
+
+        # 记录李雅普诺夫队列更新日志
+        if current_time_slot is not None:
+            logger.debug(lambda: f"时隙{current_time_slot}，更新李雅普诺夫队列，队列长度: {self.get_all_queue_lengths()}")
     
     def get_queue_length(self, task_type):
         """获取指定任务类型的队列长度"""
@@ -80,47 +131,25 @@ class LyapunovManager:
     
     def get_all_queue_lengths(self):
         """获取所有队列的长度"""
-        K = Constants.K()
-        lengths = [0] * (K + 1)  # 索引0不使用，从1开始
-        for task_type in self.Queues:
-            q = self.Queues[task_type]
-            if 1 <= task_type <= K:
-                lengths[task_type] = q.QueueLength
-        return lengths[1:]  # 返回从索引1开始的部分
+        return self.QueueLengths[1:].tolist()  # 返回从索引1开始的部分
 
     def calculate_drift(self):
         """计算李雅普诺夫漂移"""
-        drift = 0
-        for task_type in self.Queues:
-            q = self.Queues[task_type]
-            drift += 0.5 * (q.QueueLength ** 2)
-        return drift
+        return 0.5 * float(np.sum(self.QueueLengths ** 2))
     
     def _find_best_mkr_for_type(self, task_type, task_manager):
         """
         从指定类型的积压队列中选择所需计算频率最小的任务的mkr值
         这与李雅普诺夫调度算法中的选择逻辑一致
         """
-        all_tasks_of_type = task_manager.get_backlog_tasks(task_type)
-        if not all_tasks_of_type:
+        if task_manager.get_backlog_count(task_type) == 0:
             # 如果没有积压任务，使用平均值
             return (Constants.MIN_MKR + Constants.MAX_MKR) / 2
         
-        best_task = None
-        min_required_freq = float('inf')
-        
-        for current_task in all_tasks_of_type:
-            deadline_slots = current_task.SKR - current_task.Age
-            if deadline_slots <= 0:
-                continue
-            required_freq = (current_task.Ck * current_task.MKR) / (deadline_slots * Constants.Tslot) / 1e6
-            
-            if required_freq < min_required_freq:
-                min_required_freq = required_freq
-                best_task = current_task
+        best_mkr, _ = task_manager.get_best_candidate(task_type)
         
-        if best_task is not None:
-            return best_task.MKR
+        if best_mkr is not None:
+            return best_mkr
         else:
             # 如果所有任务都过期，使用平均值
             return (Constants.MIN_MKR + Constants.MAX_MKR) / 2
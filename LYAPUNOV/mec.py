@@ -4,17 +4,28 @@ MEC多接入边缘计算节点类
 
 import random
 import math
+import numpy as np
 
 try:
     from .constants import Constants
-    from .virtual_node import VirtualNode
-    from .cache_classes import CacheEntry, AccessRecord
-    from .task_classes import TaskValue
+    from .virtual_node import VirtualNodePool
+    from .cache_classes import CacheEntry, AccessRecord, AccessHistory
+    from .cache_policies import create_cache_policy, KnapsackPolicy, TinyLFUAdmission
+    from .popularity import PopularityEstimator
+    from .trace_recorder import TraceRecorder
+    from .knapsack import solve_knapsack
+    from .logger import get_logger
 except ImportError:
     from constants import Constants
-    from virtual_node import VirtualNode
-    from cache_classes import CacheEntry, AccessRecord
-    from task_classes import TaskValue
+    from virtual_node import VirtualNodePool
+    from cache_classes import CacheEntry, AccessRecord, AccessHistory
+    from cache_policies import create_cache_policy, KnapsackPolicy, TinyLFUAdmission
+    from popularity import PopularityEstimator
+    from trace_recorder import TraceRecorder
+    from knapsack import solve_knapsack
+    from logger import get_logger
+
+logger = get_logger('mec')
 
 
 class MEC:
@@ -22,29 +33,39 @@ class MEC:
     
     def __init__(self):
         """构造函数"""
-        self.VirtualNodes = []              # 虚拟节点列表 (list)
+        self.VirtualNodes = None            # 虚拟节点池 (VirtualNodePool，可按下标取VirtualNode风格视图)
         self.Cache = {}                     # 缓存映射，key为任务类型 (dict)
+        self.CachedMask = np.zeros(Constants.K() + 1, dtype=bool)  # 各任务类型是否在缓存中（与Cache同步，索引0不使用）
+        self.Trace = None                   # 事件轨迹记录器（TraceRecorder，None表示不记录）
         self.UsedCacheSize = 0              # 已使用缓存大小 (Mbit)
 
         self.AccessCount = {}               # 每种任务类型的访问次数 (dict)
         self.AccessFrequency = {}           # 每种任务类型的访问频率 (dict)
         self.TotalTasksGenerated = 0        # 总生成任务数
+        self.Popularity = PopularityEstimator(Constants.K(), Constants.POPULARITY_HALF_LIFE)  # 指数衰减的流行度估计
+        self.PopularityMode = Constants.CumulativePopularity  # 缓存策略和候选任务价值使用的流行度
 
         self.AccessRecords = {}             # 访问记录（用于LRU） (dict)
-        self.CacheInsertOrder = []          # 缓存插入顺序（用于FIFO） (list)
+        self.AccessHistory = AccessHistory(Constants.K(), Constants.ACCESS_WINDOW)  # 最近ACCESS_WINDOW个时隙内的访问次数
         self.CurrentTimeSlot = 0            # 当前时隙
 
+        self.ComputingCount = np.zeros(Constants.K() + 1, dtype=np.int64)  # 每种任务类型正在计算的节点数（索引0不使用）
+
         self.CacheStrategy = Constants.Knapsack  # 缓存更新策略
+        self.CachePolicy = None             # 缓存替换策略实例（CachePolicy，由set_cache_strategy创建）
+        self.AdmissionFilter = False        # 是否在缓存替换策略前启用TinyLFU准入过滤
         self.CacheEnabled = True            # 是否启用缓存功能
+        self.LookupTables = None            # 预计算查找表（由Simulator在仿真开始时构建）
+        self.KnapsackMode = Constants.ExactKnapsack         # 背包求解模式
+        self.KnapsackEpsilon = Constants.KNAPSACK_EPSILON   # 近似求解的精度参数
 
         self.Revenue = 0                    # 收益 (收入-代价)
         self.Income = 0                     # 收入
         self.Cost = 0                       # 代价
         
         # 初始化虚拟节点
-        for i in range(Constants.V):
-            frequency = random.randint(Constants.FMIN, Constants.FMAX)  # 随机计算频率
-            self.VirtualNodes.append(VirtualNode(i + 1, frequency))
+        frequencies = [random.randint(Constants.FMIN, Constants.FMAX) for _ in range(Constants.V)]  # 随机计算频率
+        self.VirtualNodes = VirtualNodePool(frequencies)
         
         # 初始化访问计数和频率
         K = Constants.K()
@@ -53,6 +74,8 @@ class MEC:
             self.AccessFrequency[i] = 0.0
             self.AccessRecords[i] = AccessRecord(i, 0)
         
+        self.set_cache_strategy(self.CacheStrategy)
+        
     def record_task_access(self, task_type):
         """记录任务访问（当生成任务时调用）"""
         self.AccessCount[task_type] = self.AccessCount[task_type] + 1
@@ -65,88 +88,152 @@ class MEC:
         # 更新访问记录（用于LRU）
         record = self.AccessRecords[task_type]
         record.LastAccessTime = self.CurrentTimeSlot
-        record.AccessTimes.append(self.CurrentTimeSlot)
+        self.AccessHistory.record(task_type)
+        self.CachePolicy.on_access(self, task_type)
+        
+    def record_arrivals(self, arrival_counts):
+        """记录本时隙各任务类型的到达数（长度为K+1的数组），一次向量运算更新衰减流行度"""
+        self.Popularity.update(arrival_counts, self.CurrentTimeSlot)
         
-        # 保留最近40个时隙的访问记录
-        LRU_WINDOW = 40
-        if len(record.AccessTimes) > LRU_WINDOW:
-            record.AccessTimes = record.AccessTimes[-LRU_WINDOW:]
+    def popularity(self, task_type):
+        """按PopularityMode返回任务类型的流行度（累计访问频率或衰减计数占比）"""
+        if self.PopularityMode == Constants.DecayedPopularity:
+            return self.Popularity.frequency(task_type)
+        return self.AccessFrequency[task_type]
         
     def is_cache_hit(self, task_type):
-        """检查任务类型是否缓存命中"""
-        # 如果缓存被禁用，总是返回false
+        """检查任务类型是否缓存命中，命中时记录一次命中（只检查是否在缓存中请用is_cached）"""
+        if self.is_cached(task_type):
+            self.record_cache_hit(task_type)
+            return True
+        return False
+        
+    def is_cached(self, task_type):
+        """检查任务类型是否在缓存中（不记录命中，缓存被禁用时总是返回False）"""
+        return self.CacheEnabled and bool(self.CachedMask[task_type])
+        
+    def get_cached_mask(self):
+        """返回长度为K+1的布尔数组，标记各任务类型是否在缓存中（索引0不使用，缓存被禁用时全为False）"""
         if not self.CacheEnabled:
-            return False
+            return np.zeros_like(self.CachedMask)
+        return self.CachedMask
         
-        if task_type in self.Cache:
-            entry = self.Cache[task_type]
-            entry.HitCount += 1
-            entry.LastAccessed = self.CurrentTimeSlot
-            return True
-        else:
-            return False
+    def record_cache_hit(self, task_type):
+        """记录一次缓存命中（更新命中次数、最后访问时隙并通知缓存策略）"""
+        entry = self.Cache[task_type]
+        entry.HitCount += 1
+        entry.LastAccessed = self.CurrentTimeSlot
+        self.CachePolicy.on_hit(self, task_type, entry)
         
     def is_task_type_computing(self, task_type):
         """检查指定任务类型是否正在计算中"""
-        for node in self.VirtualNodes:
-            if not node.IsIdle and node.CurrentTaskType == task_type:
-                return True
-        return False
+        if 0 < task_type < len(self.ComputingCount):
+            return bool(self.ComputingCount[task_type] > 0)
+        pool = self.VirtualNodes
+        return bool(np.any(~pool.IsIdle & (pool.CurrentTaskType == task_type)))
+        
+    def get_computing_mask(self):
+        """返回长度为K+1的布尔数组，标记各任务类型是否正在计算中（索引0不使用）"""
+        return self.ComputingCount > 0
         
     def get_idle_nodes(self):
-        """获取空闲的虚拟节点"""
-        idle_nodes = []
-        for node in self.VirtualNodes:
-            if node.IsIdle:
-                idle_nodes.append(node)
-        return idle_nodes
+        """获取空闲的虚拟节点（VirtualNode风格视图列表）"""
+        return [self.VirtualNodes[i] for i in self.VirtualNodes.idle_indices().tolist()]
         
     def schedule_task(self, task_type, node_id, mkr, ck):
         """将任务调度到指定虚拟节点"""
-        if node_id < 1 or node_id > Constants.V:
+        if node_id < 1 or node_id > len(self.VirtualNodes):
             return False
         
-        node = self.VirtualNodes[node_id - 1]  # 转换为0基索引
-        if not node.IsIdle:
+        pool = self.VirtualNodes
+        index = node_id - 1  # 转换为0基索引
+        if not pool.IsIdle[index]:
             return False
         
         # 计算需要的时隙数
-        required_slots = self._calculate_required_slots(mkr, ck, node.ComputeFrequency)
+        required_slots, _ = self._scheduling_cost(task_type, mkr, ck, index)
         
         # 调度任务
-        node.IsIdle = False
-        node.CurrentTaskType = task_type
-        node.RemainingSlots = required_slots
+        pool.assign(index, task_type, required_slots)
+        if 0 < task_type < len(self.ComputingCount):
+            self.ComputingCount[task_type] += 1
         
         return True
         
     def update_nodes(self):
         """
         更新所有虚拟节点状态（每个时隙调用）
-        返回一个dict, key=taskType, value=count
+        返回一个dict, key=taskType, value=count（按节点ID顺序插入）
         """
         completed_task_types_map = {}
         
-        for node in self.VirtualNodes:
-            if not node.IsIdle:
-                node.RemainingSlots -= 1
-                if node.RemainingSlots <= 0:
-                    # 任务计算完成
-                    task_type = node.CurrentTaskType
-                    if task_type in completed_task_types_map:
-                        completed_task_types_map[task_type] += 1
-                    else:
-                        completed_task_types_map[task_type] = 1
-
-                    node.IsIdle = True
-                    node.CurrentTaskType = -1
-                    node.RemainingSlots = 0
+        completed_types = self.VirtualNodes.tick()
+        if len(completed_types) > 0:
+            in_range = completed_types[(completed_types > 0) & (completed_types < len(self.ComputingCount))]
+            self.ComputingCount -= np.bincount(in_range, minlength=len(self.ComputingCount))
+        
+        for task_type in completed_types.tolist():
+            if task_type in completed_task_types_map:
+                completed_task_types_map[task_type] += 1
+            else:
+                completed_task_types_map[task_type] = 1
         
         return completed_task_types_map
         
-    def set_cache_strategy(self, strategy):
-        """设置缓存策略"""
+    def advance_nodes(self, slots):
+        """
+        将忙碌节点的剩余时隙数一次性减少slots（事件驱动模式跳过时隙时调用）
+        调用方保证这些时隙内没有节点完成计算
+        """
+        self.VirtualNodes.advance(slots)
+        
+    def set_cache_strategy(self, strategy, task_manager=None):
+        """
+        设置缓存策略（按cache_policies中的注册表创建策略实例）
+        缓存非空时按插入顺序把现有缓存项登记到新策略，Priority策略需要task_manager才能登记现有缓存项
+        """
         self.CacheStrategy = strategy
+        self.CachePolicy = create_cache_policy(strategy)
+        if self.AdmissionFilter:
+            self.CachePolicy = TinyLFUAdmission(self.CachePolicy)
+        self._configure_knapsack_policy()
+        for task_type, entry in self.Cache.items():
+            self.CachePolicy.on_insert(self, task_type, entry, task_manager)
+        
+    def set_knapsack_mode(self, mode, epsilon=None):
+        """设置背包缓存策略的求解模式（Constants.ExactKnapsack 或 Constants.ApproxKnapsack）及近似精度"""
+        self.KnapsackMode = mode
+        if epsilon is not None:
+            self.KnapsackEpsilon = epsilon
+        self._configure_knapsack_policy()
+        
+    def _configure_knapsack_policy(self):
+        """把背包求解模式同步到当前的背包缓存策略"""
+        policy = self.CachePolicy
+        if isinstance(policy, TinyLFUAdmission):
+            policy = policy.Policy
+        if isinstance(policy, KnapsackPolicy):
+            policy.set_mode(self.KnapsackMode, self.KnapsackEpsilon)
+        
+    def set_admission_filter(self, enabled):
+        """
+        设置是否启用TinyLFU准入过滤：缓存空间不足时，只有新任务的近期访问频率估计高于替换对象才执行替换
+        切换时保留当前缓存策略的状态，启用后才开始记录访问频率
+        """
+        self.AdmissionFilter = enabled
+        if enabled and not isinstance(self.CachePolicy, TinyLFUAdmission):
+            self.CachePolicy = TinyLFUAdmission(self.CachePolicy)
+        elif not enabled and isinstance(self.CachePolicy, TinyLFUAdmission):
+            self.CachePolicy = self.CachePolicy.Policy
+        
+    def set_popularity_mode(self, mode, half_life=None):
+        """
+        设置流行度估计方式（Constants.CumulativePopularity 或 Constants.DecayedPopularity）
+        指定half_life时按新的半衰期重新开始衰减计数
+        """
+        self.PopularityMode = mode
+        if half_life is not None:
+            self.Popularity = PopularityEstimator(Constants.K(), half_life)
         
     def set_cache_enabled(self, enabled):
         """设置是否启用缓存"""
@@ -155,6 +242,7 @@ class MEC:
     def update_time_slot(self, time_slot):
         """更新当前时隙"""
         self.CurrentTimeSlot = time_slot
+        self.AccessHistory.advance(time_slot)
         
     def update_revenue(self, task_manager, scheduled_tasks, completed_tasks, cache_hit_tasks):
         """
@@ -170,12 +258,6 @@ class MEC:
         completed_tasks: dict[taskType] -> backlogCount
         cache_hit_tasks: dict[taskType] -> {backlogCount, metaK}
         """
-        # 导入日志工具
-        try:
-            from .logger import logger
-        except ImportError:
-            from logger import logger
-
         # 分类统计各项收入和成本
         cache_income = 0      # 缓存命中收入
         compute_income = 0    # 计算完成收入
@@ -203,9 +285,7 @@ class MEC:
         # --- 3. 计算新调度任务的能耗成本 ---
         for task_type, task_info in scheduled_tasks.items():
             node = task_info['node']
-            frequency_ghz = node.ComputeFrequency / 1000.0
-            required_slots = self._calculate_required_slots(task_info['mkr'], task_info['ck'], node.ComputeFrequency)
-            cost = Constants.AFIE * (frequency_ghz ** 3) * Constants.NMT * required_slots
+            _, cost = self._scheduling_cost(task_type, task_info['mkr'], task_info['ck'], node.Index)
             compute_cost += cost
 
         # --- 4. 计算总收入、成本和利润 ---
@@ -234,11 +314,7 @@ class MEC:
         
     def get_node_utilization(self):
         """获取节点利用率"""
-        busy_nodes = 0
-        for node in self.VirtualNodes:
-            if not node.IsIdle:
-                busy_nodes += 1
-        return busy_nodes / len(self.VirtualNodes)
+        return self.VirtualNodes.busy_count() / len(self.VirtualNodes)
         
     # 从MECCache.m移入的方法----------------------------------------
     def add_to_cache(self, task_type, meta_size, task_manager):
@@ -250,206 +326,49 @@ class MEC:
         # 检查缓存空间是否足够
         if self.UsedCacheSize + meta_size <= Constants.total_cache_size():
             # 直接添加到缓存
-            entry = CacheEntry(task_type, meta_size, self.CurrentTimeSlot, self.CurrentTimeSlot)
-            self.Cache[task_type] = entry
-            self.UsedCacheSize += meta_size
-            self.CacheInsertOrder.append(task_type)
+            self._insert_entry(task_type, meta_size, task_manager)
             return True
         
         # 缓存空间不足，使用缓存替换策略
         return self.apply_cache_replacement_strategy(task_type, meta_size, task_manager)
         
-    def apply_cache_replacement_strategy(self, new_task_type, new_meta_size, task_manager):
-        """应用缓存替换策略"""
-        if self.CacheStrategy == Constants.FIFO:
-            return self.apply_fifo(new_task_type, new_meta_size)
-        elif self.CacheStrategy == Constants.LFU:
-            return self.apply_lfu(new_task_type, new_meta_size, task_manager)
-        elif self.CacheStrategy == Constants.LRU:
-            return self.apply_lru(new_task_type, new_meta_size, task_manager)
-        elif self.CacheStrategy == Constants.Priority:
-            return self.apply_priority(new_task_type, new_meta_size, task_manager)
-        elif self.CacheStrategy == Constants.Knapsack:
-            return self.apply_knapsack(new_task_type, new_meta_size, task_manager)
-        else:
-            return self.apply_fifo(new_task_type, new_meta_size)
-        
-    def apply_fifo(self, new_task_type, new_meta_size):
-        """FIFO缓存替换策略"""
-        while len(self.CacheInsertOrder) > 0:
-            oldest_task_type = self.CacheInsertOrder.pop(0)
-            
-            if oldest_task_type in self.Cache:
-                entry = self.Cache[oldest_task_type]
-                self.UsedCacheSize -= entry.MetaSize
-                del self.Cache[oldest_task_type]
-                
-                # 检查空间是否足够
-                if self.UsedCacheSize + new_meta_size <= Constants.total_cache_size():
-                    entry = CacheEntry(new_task_type, new_meta_size, self.CurrentTimeSlot, self.CurrentTimeSlot)
-                    self.Cache[new_task_type] = entry
-                    self.UsedCacheSize += new_meta_size
-                    self.CacheInsertOrder.append(new_task_type)
-                    return True
-        return False
+    def _insert_entry(self, task_type, meta_size, task_manager):
+        """加入缓存项并通知缓存策略"""
+        entry = CacheEntry(task_type, meta_size, self.CurrentTimeSlot, self.CurrentTimeSlot)
+        self.Cache[task_type] = entry
+        self.CachedMask[task_type] = True
+        self.UsedCacheSize += meta_size
+        if self.Trace is not None:
+            self.Trace.record(self.CurrentTimeSlot, TraceRecorder.CACHE_INSERT, task_type, value=meta_size)
+        self.CachePolicy.on_insert(self, task_type, entry, task_manager)
+        return entry
+        
+    def _remove_entry(self, task_type):
+        """移出缓存项并通知缓存策略"""
+        entry = self.Cache.pop(task_type)
+        self.CachedMask[task_type] = False
+        self.UsedCacheSize -= entry.MetaSize
+        if self.Trace is not None:
+            self.Trace.record(self.CurrentTimeSlot, TraceRecorder.CACHE_EVICT, task_type, value=entry.MetaSize)
+        self.CachePolicy.on_remove(self, task_type)
+        return entry
         
-    def apply_lfu(self, new_task_type, new_meta_size, task_manager):
-        """LFU (Least Frequently Used) 缓存替换策略"""
-        # 找到命中次数最少的任务类型
-        min_hit_count = float('inf')
-        least_used_task_type = -1
-        
-        for task_type, entry in self.Cache.items():
-            if entry.HitCount < min_hit_count:
-                min_hit_count = entry.HitCount
-                least_used_task_type = task_type
-        
-        if least_used_task_type != -1:
-            entry = self.Cache[least_used_task_type]
-            self.UsedCacheSize -= entry.MetaSize
-            del self.Cache[least_used_task_type]
-            
-            # 递归尝试添加新任务
-            return self.add_to_cache(new_task_type, new_meta_size, task_manager)
-        else:
-            return False
-        
-    def apply_lru(self, new_task_type, new_meta_size, task_manager):
-        """LRU (Least Recently Used) 缓存替换策略（基于最近40个时隙）"""
-        # 计算每个缓存任务类型在最近40个时隙的访问频率
-        least_recent_access_time = float('inf')
-        least_recent_task_type = -1
-        
-        for task_type in self.Cache:
-            record = self.AccessRecords[task_type]
-            
-            if record.LastAccessTime < least_recent_access_time:
-                least_recent_access_time = record.LastAccessTime
-                least_recent_task_type = task_type
-        
-        if least_recent_task_type != -1:
-            entry = self.Cache[least_recent_task_type]
-            self.UsedCacheSize -= entry.MetaSize
-            del self.Cache[least_recent_task_type]
-            
-            # 从插入顺序中移除
-            if least_recent_task_type in self.CacheInsertOrder:
-                self.CacheInsertOrder.remove(least_recent_task_type)
-            
-            # 递归尝试添加新任务
-            return self.add_to_cache(new_task_type, new_meta_size, task_manager)
-        else:
-            return False
-        
-    def apply_priority(self, new_task_type, new_meta_size, task_manager):
-        """基于优先级的缓存替换策略"""
-        # 找到优先级最低的任务类型
-        min_priority = float('inf')
-        lowest_priority_task_type = -1
-        
-        for task_type in self.Cache:
-            if task_type in task_manager.TaskTypes:
-                tt = task_manager.TaskTypes[task_type]
-                if tt.Priority < min_priority:
-                    min_priority = tt.Priority
-                    lowest_priority_task_type = task_type
-        
-        # 检查新任务的优先级是否更高
-        if new_task_type in task_manager.TaskTypes:
-            new_tt = task_manager.TaskTypes[new_task_type]
-            if new_tt.Priority > min_priority and lowest_priority_task_type != -1:
-                entry = self.Cache[lowest_priority_task_type]
-                self.UsedCacheSize -= entry.MetaSize
-                del self.Cache[lowest_priority_task_type]
-                
-                # 递归尝试添加新任务
-                return self.add_to_cache(new_task_type, new_meta_size, task_manager)
-            else:
-                return False
-        else:
+    def apply_cache_replacement_strategy(self, new_task_type, new_meta_size, task_manager):
+        """应用缓存替换策略：策略允许替换时依次移出策略给出的缓存项，空间足够后加入新任务"""
+        policy = self.CachePolicy
+        if not policy.admit(self, new_task_type, new_meta_size, task_manager):
             return False
-        
-    def apply_knapsack(self, new_task_type, new_meta_size, task_manager):
-        """基于01背包算法的缓存替换策略"""
-        # 构建候选任务列表（包括当前缓存中的任务和新任务）
-        candidates = []
-        
-        # 添加当前缓存中的任务
-        for task_type in self.Cache:
-            if task_type in task_manager.TaskTypes:
-                tt = task_manager.TaskTypes[task_type]
-                value = self.AccessFrequency[task_type] * tt.Priority
-                candidates.append(TaskValue(task_type, value, tt.MetaK))
-        
-        # 添加新任务
-        if new_task_type in task_manager.TaskTypes:
-            new_tt = task_manager.TaskTypes[new_task_type]
-            new_value = self.AccessFrequency[new_task_type] * new_tt.Priority
-            candidates.append(TaskValue(new_task_type, new_value, new_meta_size))
-        
-        # 使用01背包算法选择最优组合
-        selected_tasks = self.solve_knapsack(candidates, Constants.total_cache_size())
-        
-        # 检查新任务是否被选中
-        new_task_selected = False
-        for task in selected_tasks:
-            if task.TaskType == new_task_type:
-                new_task_selected = True
-                break
-        
-        if new_task_selected:
-            # 清空当前缓存
-            self.Cache = {}
-            self.CacheInsertOrder = []
-            self.UsedCacheSize = 0
-            
-            # 添加选中的任务到缓存
-            for task in selected_tasks:
-                entry = CacheEntry(task.TaskType, task.Weight, self.CurrentTimeSlot, self.CurrentTimeSlot)
-                self.Cache[task.TaskType] = entry
-                self.UsedCacheSize += task.Weight
-                self.CacheInsertOrder.append(task.TaskType)
-            
-            return True
-        else:
+        for victim in policy.evict(self, new_task_type, new_meta_size, task_manager):
+            self._remove_entry(victim)
+        if self.UsedCacheSize + new_meta_size > Constants.total_cache_size():
             return False
+        self._insert_entry(new_task_type, new_meta_size, task_manager)
+        return True
         
     def solve_knapsack(self, items, capacity):
-        """01背包算法求解"""
-        n = len(items)
-        if n == 0:
-            return []
-        
-        # 将容量转换为整数以便动态规划
-        int_capacity = int(capacity)
-        
-        # dp[i][w] 表示前i个物品在容量为w时的最大价值
-        dp = [[0 for _ in range(int_capacity + 1)] for _ in range(n + 1)]
-        
-        # 填充动态规划表
-        for i in range(1, n + 1):
-            for w in range(int_capacity + 1):
-                item = items[i - 1]
-                item_weight = int(item.Weight)
-                
-                if item_weight <= w:
-                    # 可以选择当前物品
-                    take_value = dp[i - 1][w - item_weight] + item.Value
-                    not_take_value = dp[i - 1][w]
-                    dp[i][w] = max(take_value, not_take_value)
-                else:
-                    # 不能选择当前物品
-                    dp[i][w] = dp[i - 1][w]
-        
-        # 回溯找出选中的物品
-        selected_tasks = []
-        w = int_capacity
-        for i in range(n, 0, -1):
-            if dp[i][w] != dp[i - 1][w]:
-                selected_tasks.append(items[i - 1])
-                w -= int(items[i - 1].Weight)
-        
-        return selected_tasks
+        """01背包算法求解（一维动态规划，见knapsack.solve_knapsack）"""
+        selected = solve_knapsack([item.Value for item in items], [item.Weight for item in items], capacity)
+        return [items[i] for i in selected]
         
     def get_cache_total_value(self, task_manager):
         """
@@ -471,6 +390,19 @@ class MEC:
         """计算wkr(t) - 虚拟节点以最小计算频率计算任务所占用的时隙数量"""
         return math.ceil((mkr * ck / Constants.FM) / Constants.Tslot)
     
+    def _scheduling_cost(self, task_type, mkr, ck, index):
+        """
+        任务在下标为index的节点上计算的 (占用时隙数, 能耗成本)
+        优先读取查找表，没有查找表或参数不在表中时按公式计算
+        """
+        tables = self.LookupTables
+        if tables is not None and tables.covers(task_type, mkr) and tables.Ck[task_type] == ck:
+            return tables.slots(task_type, mkr, index), tables.energy(task_type, mkr, index)
+        freq = int(self.VirtualNodes.ComputeFrequency[index])
+        required_slots = self._calculate_required_slots(mkr, ck, freq)
+        frequency_ghz = freq / 1000.0
+        return required_slots, Constants.AFIE * (frequency_ghz ** 3) * Constants.NMT * required_slots
+
     @staticmethod
     def _calculate_required_slots(mkr,ck,freq):
         """计算所需时隙数量"""
@@ -25,9 +25,11 @@ setup_chinese_font()
 try:
     from .constants import Constants
     from .simulator import Simulator
+    from .arrival_source import ArrivalTrace
 except ImportError:
     from constants import Constants
     from simulator import Simulator
+    from arrival_source import ArrivalTrace
 
 
 def plot2_timeseries_comparison():
@@ -91,6 +93,10 @@ def plot_scheduling_algorithms_comparison():
         print(f'\n--- 第 {run + 1}/{num_runs} 次实验 ---')
         logger.info(f'第 {run + 1}/{num_runs} 次实验 ---')
         # 运行仿真实验
+        # 每次实验只生成一次到达序列，所有算法回放同一序列（与各自消耗随机数的多少无关）
+        run_seed = 18 + run
+        arrival_trace = ArrivalTrace.generate(total_time_slots, run_seed)
+
         for alg_idx, algorithm in enumerate(scheduling_algorithms):
             alg_name = algorithm_names[alg_idx]
             # 只在李雅普诺夫调度+背包缓存时开启日志记录
@@ -103,12 +109,11 @@ def plot_scheduling_algorithms_comparison():
             logger.info(f'  测试调度算法: {alg_name} ({alg_idx+1}/{num_algorithms})...')
             # 不同的实验运行使用不同的随机种子
             # 但在同一次运行中，所有算法面对相同的环境和任务
-            run_seed = 18 + run
             random.seed(run_seed)
             np.random.seed(run_seed)
             
             # 创建仿真器
-            sim = Simulator(total_time_slots)
+            sim = Simulator(total_time_slots, arrival_trace)
             
             # 设置调度策略
             sim.set_schedule_strategy(algorithm, Constants.VV_DEFAULT)
@@ -282,6 +287,10 @@ def plot_cache_algorithms_comparison():
     for run in range(num_runs):
         print(f'\n--- 第 {run + 1}/{num_runs} 次实验 ---')
         # 运行仿真实验
+        # 每次实验只生成一次到达序列，所有算法回放同一序列（与各自消耗随机数的多少无关）
+        run_seed = 12 + run
+        arrival_trace = ArrivalTrace.generate(total_time_slots, run_seed)
+
         for cache_idx, cache_alg in enumerate(cache_algorithms):
             cache_name = cache_names[cache_idx]
             
@@ -289,12 +298,11 @@ def plot_cache_algorithms_comparison():
             
             # 不同的实验运行使用不同的随机种子
             # 但在同一次运行中，所有算法面对相同的环境和任务
-            run_seed = 12 + run
             random.seed(run_seed)
             np.random.seed(run_seed)
             
             # 创建仿真器
-            sim = Simulator(total_time_slots)
+            sim = Simulator(total_time_slots, arrival_trace)
             
             # 设置调度策略为李雅普诺夫调度，VV=1
             sim.set_schedule_strategy(Constants.LyapunovSchedule, vv_parameter)
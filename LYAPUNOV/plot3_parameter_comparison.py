@@ -23,9 +23,11 @@ setup_chinese_font()
 try:
     from .constants import Constants
     from .simulator import Simulator
+    from .arrival_source import ArrivalTrace
 except ImportError:
     from constants import Constants
     from simulator import Simulator
+    from arrival_source import ArrivalTrace
 
 
 def plot3_parameter_comparison():
@@ -94,17 +96,20 @@ def plot_different_k_comparison():
             
             print(f'  正在测试K={current_k} ({k_idx+1}/{num_k})...')
             
+            # 每次实验只生成一次到达序列，所有算法回放同一序列（与各自消耗随机数的多少无关）
+            run_seed = 12 + run
+            arrival_trace = ArrivalTrace.generate(total_time_slots, run_seed)
+
             for alg_idx, algorithm in enumerate(scheduling_algorithms):
                 alg_name = algorithm_names[alg_idx]
                                
                 # 不同的实验运行使用不同的随机种子
                 # 但在同一次运行中，所有算法和参数面对相同的环境和任务
-                run_seed = 12 + run
                 random.seed(run_seed)
                 np.random.seed(run_seed)
                 
                 # 创建仿真器
-                sim = Simulator(total_time_slots)
+                sim = Simulator(total_time_slots, arrival_trace)
                 
                 # 设置调度策略
                 sim.set_schedule_strategy(algorithm, Constants.VV_DEFAULT)
@@ -301,6 +306,10 @@ def plot_different_n_comparison():
             
             print(f'  正在测试N={current_n} ({n_idx+1}/{num_n})...')
             
+            # 每次实验只生成一次到达序列，所有算法回放同一序列（与各自消耗随机数的多少无关）
+            run_seed = 42 + run
+            arrival_trace = ArrivalTrace.generate(total_time_slots, run_seed)
+
             for alg_idx, algorithm in enumerate(scheduling_algorithms):
                 alg_name = algorithm_names[alg_idx]
                 
@@ -308,12 +317,11 @@ def plot_different_n_comparison():
 
                 # 不同的实验运行使用不同的随机种子
                 # 但在同一次运行中，所有算法和参数面对相同的环境和任务
-                run_seed = 42 + run
                 random.seed(run_seed)
                 np.random.seed(run_seed)
                 
                 # 创建仿真器
-                sim = Simulator(total_time_slots)
+                sim = Simulator(total_time_slots, arrival_trace)
                 
                 # 设置调度策略
                 sim.set_schedule_strategy(algorithm, Constants.VV_DEFAULT)
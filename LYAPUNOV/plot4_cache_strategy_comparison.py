@@ -7,7 +7,7 @@ plot4_cache_strategy_comparison.py - 缓存策略性能对比柱状图
 
 纵坐标包括：MEC时间平均收益、任务积压队列平均长度、MEC缓存任务类型总价值、
 缓存命中率、缓存命中任务总优先级
-图例为：调度算法使用LyapunovSchedule + 五种不同的缓存更新算法
+图例为：调度算法使用LyapunovSchedule + 七种不同的缓存更新算法
 """
 
 import numpy as np
@@ -26,9 +26,11 @@ setup_chinese_font()
 try:
     from .constants import Constants
     from .simulator import Simulator
+    from .arrival_source import ArrivalTrace
 except ImportError:
     from constants import Constants
     from simulator import Simulator
+    from arrival_source import ArrivalTrace
 
 
 def plot4_cache_strategy_comparison():
@@ -51,7 +53,7 @@ def plot_cache_strategies_vs_k():
     横坐标取不同的任务类型 k= [40,50,60,70,80], 单时隙的产生任务数量 N=20
     纵坐标分别为（所有时隙的） MEC的时间平均收益（总收入/总时隙）、任务积压队列的平均长度（所有任务类型的总积压长度/总时隙）、MEC缓存的任务类型总价值，
     所有时隙的缓存命中率、所有时隙的所有任务缓存命中任务总优先级
-    图例为：调度算法使用LyapunovSchedule + 五种不同的缓存更新算法（FIFO、LRU、LFU、Priority、Knapsack）"""
+    图例为：调度算法使用LyapunovSchedule + 七种不同的缓存更新算法（FIFO、LRU、LFU、Priority、Knapsack、ARC、GDSF）"""
     
     # 导入必要的库
     import random
@@ -71,7 +73,9 @@ def plot_cache_strategies_vs_k():
         Constants.LRU,
         Constants.LFU,
         Constants.Priority,
-        Constants.Knapsack
+        Constants.Knapsack,
+        Constants.ARC,
+        Constants.GDSF
     ]
     
     cache_names = [
@@ -79,7 +83,9 @@ def plot_cache_strategies_vs_k():
         'LRU缓存',
         'LFU缓存',
         'Priority缓存',
-        'Knapsack缓存'
+        'Knapsack缓存',
+        'ARC缓存',
+        'GDSF缓存'
     ]
     
     num_k = len(k_values)
@@ -102,6 +108,10 @@ def plot_cache_strategies_vs_k():
             
             print(f'  正在测试K={current_k} ({k_idx+1}/{num_k})...')
             
+            # 每次实验只生成一次到达序列，所有算法回放同一序列（与各自消耗随机数的多少无关）
+            run_seed = 42 + run
+            arrival_trace = ArrivalTrace.generate(total_time_slots, run_seed)
+
             for cache_idx, cache_alg in enumerate(cache_algorithms):
                 cache_name = cache_names[cache_idx]
                 
@@ -109,12 +119,11 @@ def plot_cache_strategies_vs_k():
                 
                 # 不同的实验运行使用不同的随机种子
                 # 但在同一次运行中，所有算法和参数面对相同的环境和任务
-                run_seed = 42 + run
                 random.seed(run_seed)
                 np.random.seed(run_seed)
                 
                 # 创建仿真器
-                sim = Simulator(total_time_slots)
+                sim = Simulator(total_time_slots, arrival_trace)
                 
                 # 设置调度策略为李雅普诺夫调度
                 sim.set_schedule_strategy(Constants.LyapunovSchedule, Constants.VV_DEFAULT)
@@ -163,10 +172,10 @@ def plot_cache_strategies_vs_k():
     # 绘制第一组柱状图：MEC时间平均收益
     plt.figure(figsize=(8, 7))  # 设置为正方形
     x = np.arange(len(k_values))
-    width = 0.14  # 调整柱子宽度，增加间距
+    width = 0.84 / num_cache_algs  # 按缓存算法数量调整柱子宽度，增加间距
     
     # 定义缓存算法颜色方案（参考截图样式）
-    cache_colors = ['#1f77b4', '#ff7f0e', '#ffbb78', '#9467bd', '#c5b0d5']
+    cache_colors = ['#1f77b4', '#ff7f0e', '#ffbb78', '#9467bd', '#c5b0d5', '#2ca02c', '#98df8a']
     
     for i in range(num_cache_algs):
         plt.bar(x + i * width, results_revenue[i, :], width, 
@@ -175,7 +184,7 @@ def plot_cache_strategies_vs_k():
     plt.xlabel('任务类型数量 K', fontsize=22)
     plt.ylabel('MEC时间平均收益', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, k_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, k_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -201,7 +210,7 @@ def plot_cache_strategies_vs_k():
     plt.xlabel('任务类型数量 K', fontsize=22)
     plt.ylabel('任务积压队列的平均长度', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, k_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, k_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -227,7 +236,7 @@ def plot_cache_strategies_vs_k():
     plt.xlabel('任务类型数量 K', fontsize=22)
     plt.ylabel('MEC缓存的任务类型总价值', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, k_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, k_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -253,7 +262,7 @@ def plot_cache_strategies_vs_k():
     plt.xlabel('任务类型数量 K', fontsize=22)
     plt.ylabel('缓存命中率 (%)', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, k_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, k_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -279,7 +288,7 @@ def plot_cache_strategies_vs_k():
     plt.xlabel('任务类型数量 K', fontsize=22)
     plt.ylabel('缓存命中任务总优先级', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, k_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, k_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -317,7 +326,7 @@ def plot_cache_strategies_vs_n():
     横坐标取单时隙产生的不同任务数量 N= [10, 15, 20, 25, 30], 任务类型数量 K固定为 50
     纵坐标分别为（所有时隙的） MEC的时间平均收益（总收入/总时隙）、任务积压队列的平均长度（所有任务类型的总积压长度/总时隙）、MEC缓存的任务类型总价值，
     所有时隙的缓存命中率、所有时隙的所有任务缓存命中任务总优先级
-    图例为：调度算法使用LyapunovSchedule + 五种不同的缓存更新算法（FIFO、LRU、LFU、Priority、Knapsack）"""
+    图例为：调度算法使用LyapunovSchedule + 七种不同的缓存更新算法（FIFO、LRU、LFU、Priority、Knapsack、ARC、GDSF）"""
     
     # 导入必要的库
     import random
@@ -337,7 +346,9 @@ def plot_cache_strategies_vs_n():
         Constants.LRU,
         Constants.LFU,
         Constants.Priority,
-        Constants.Knapsack
+        Constants.Knapsack,
+        Constants.ARC,
+        Constants.GDSF
     ]
     
     cache_names = [
@@ -345,7 +356,9 @@ def plot_cache_strategies_vs_n():
         'LRU缓存',
         'LFU缓存',
         'Priority缓存',
-        'Knapsack缓存'
+        'Knapsack缓存',
+        'ARC缓存',
+        'GDSF缓存'
     ]
     
     num_n = len(n_values)
@@ -368,17 +381,20 @@ def plot_cache_strategies_vs_n():
             
             print(f'  正在测试N={current_n} ({n_idx+1}/{num_n})...')
             
+            # 每次实验只生成一次到达序列，所有算法回放同一序列（与各自消耗随机数的多少无关）
+            run_seed = 42 + run
+            arrival_trace = ArrivalTrace.generate(total_time_slots, run_seed)
+
             for cache_idx, cache_alg in enumerate(cache_algorithms):
                 cache_name = cache_names[cache_idx]
                         
                 # 不同的实验运行使用不同的随机种子
                 # 但在同一次运行中，所有算法和参数面对相同的环境和任务
-                run_seed = 42 + run
                 random.seed(run_seed)
                 np.random.seed(run_seed)
                 
                 # 创建仿真器
-                sim = Simulator(total_time_slots)
+                sim = Simulator(total_time_slots, arrival_trace)
                 
                 # 设置调度策略为李雅普诺夫调度
                 sim.set_schedule_strategy(Constants.LyapunovSchedule, Constants.VV_DEFAULT)
@@ -427,10 +443,10 @@ def plot_cache_strategies_vs_n():
     # 绘制第二组柱状图：MEC时间平均收益
     plt.figure(figsize=(8, 7))  # 设置为正方形
     x = np.arange(len(n_values))
-    width = 0.14  # 调整柱子宽度，增加间距
+    width = 0.84 / num_cache_algs  # 按缓存算法数量调整柱子宽度，增加间距
     
     # 定义缓存算法颜色方案（与第一组保持一致）
-    cache_colors = ['#1f77b4', '#ff7f0e', '#ffbb78', '#9467bd', '#c5b0d5']
+    cache_colors = ['#1f77b4', '#ff7f0e', '#ffbb78', '#9467bd', '#c5b0d5', '#2ca02c', '#98df8a']
     
     for i in range(num_cache_algs):
         plt.bar(x + i * width, results_revenue[i, :], width, 
@@ -439,7 +455,7 @@ def plot_cache_strategies_vs_n():
     plt.xlabel('每时隙生成任务数量 N', fontsize=22)
     plt.ylabel('MEC时间平均收益', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, n_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, n_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -465,7 +481,7 @@ def plot_cache_strategies_vs_n():
     plt.xlabel('每时隙生成任务数量 N', fontsize=22)
     plt.ylabel('任务积压队列的平均长度', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, n_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, n_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -491,7 +507,7 @@ def plot_cache_strategies_vs_n():
     plt.xlabel('每时隙生成任务数量 N', fontsize=22)
     plt.ylabel('MEC缓存的任务类型总价值', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, n_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, n_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -517,7 +533,7 @@ def plot_cache_strategies_vs_n():
     plt.xlabel('每时隙生成任务数量 N', fontsize=22)
     plt.ylabel('缓存命中率 (%)', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, n_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, n_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=14)
     legend.get_frame().set_edgecolor('black')
@@ -543,7 +559,7 @@ def plot_cache_strategies_vs_n():
     plt.xlabel('每时隙生成任务数量 N', fontsize=22)
     plt.ylabel('缓存命中任务总优先级', fontsize=22)
     # 去除标题
-    plt.xticks(x + width * 2, n_values, fontsize=14)
+    plt.xticks(x + width * (num_cache_algs - 1) / 2, n_values, fontsize=14)
     plt.yticks(fontsize=14)
     legend = plt.legend(loc='best', fontsize=16)
     legend.get_frame().set_edgecolor('black')
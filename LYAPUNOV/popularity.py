@@ -0,0 +1,35 @@
+"""
+任务类型流行度估计（指数衰减计数）
+"""
+
+import numpy as np
+
+
+class PopularityEstimator:
+    """
+    PopularityEstimator 按半衰期指数衰减的各任务类型到达计数
+    每个时隙用一次向量运算更新：计数先按经过的时隙数衰减，再加上本时隙的到达数；
+    流行度为各类型衰减计数占总和的比例，与累计访问频率（访问次数/总任务数）同量纲，但会逐渐遗忘过去的热点
+    """
+
+    def __init__(self, num_types, half_life):
+        """构造函数，num_types为任务类型数K（索引0不使用），half_life为半衰期（时隙）"""
+        self.HalfLife = half_life
+        self.Decay = 0.5 ** (1.0 / half_life)                   # 每个时隙的衰减系数
+        self.Counts = np.zeros(num_types + 1, dtype=np.float64)  # 衰减后的到达计数
+        self.Frequencies = np.zeros(num_types + 1, dtype=np.float64)  # 流行度（衰减计数的占比）
+        self.LastSlot = None  # 上一次更新的时隙
+
+    def update(self, arrival_counts, time_slot):
+        """记录time_slot时隙各类型的到达数（长度为K+1的数组），跳过的时隙按经过的时隙数衰减"""
+        if self.LastSlot is not None and time_slot > self.LastSlot:
+            self.Counts *= self.Decay ** (time_slot - self.LastSlot)
+        self.Counts += arrival_counts
+        self.LastSlot = time_slot
+        total = self.Counts.sum()
+        if total > 0:
+            np.divide(self.Counts, total, out=self.Frequencies)
+
+    def frequency(self, task_type):
+        """任务类型的流行度"""
+        return float(self.Frequencies[task_type])
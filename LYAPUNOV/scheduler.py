@@ -8,23 +8,30 @@ from scipy.optimize import linear_sum_assignment
 try:
     from .constants import Constants
     from .task_classes import SchedulingResult, TaskValue2
+    from .lookup_tables import LookupTables
 except ImportError:
     from constants import Constants
     from task_classes import SchedulingResult, TaskValue2
+    from lookup_tables import LookupTables
 # 导入日志工具
 try:
-    from .logger import logger
+    from .logger import get_logger
 except ImportError:
-    from logger import logger
+    from logger import get_logger
+
+logger = get_logger('scheduler')
 
 class Scheduler:
     """Scheduler 调度器"""
     
-    def __init__(self, algorithm, vv=None):
+    def __init__(self, algorithm, vv=None, matching_mode=None):
         if vv is None:
             vv = Constants.VV_DEFAULT
+        if matching_mode is None:
+            matching_mode = Constants.GreedyMatching
         self.Algorithm = algorithm
         self.LyapunovVV = vv
+        self.MatchingMode = matching_mode  # 任务-节点匹配算法
         self.CurrentTimeSlot = 0  # 当前时隙，用于日志记录
     
     def update_time_slot(self, time_slot):
@@ -65,25 +72,13 @@ class Scheduler:
         for i in range(num_tasks):
             task_info = candidate_tasks[i]
 
-            # 使用与李雅普诺夫算法相同的严格任务选择逻辑
-            all_tasks_of_type = task_manager.get_backlog_tasks(task_info.TaskType)
-            best_task_for_type = None
-            min_required_freq = float('inf')
-
-            for current_task in all_tasks_of_type:
-                deadline_slots = current_task.SKR - current_task.Age
-                if deadline_slots <= 0:
-                    continue
-                required_freq = (current_task.Ck * current_task.MKR) / (deadline_slots * Constants.Tslot) / 1e6
-                
-                if required_freq < min_required_freq:
-                    min_required_freq = required_freq
-                    best_task_for_type = current_task
+            # 使用与李雅普诺夫算法相同的严格任务选择逻辑（所需计算频率最小的任务）
+            best_mkr, min_required_freq = task_manager.get_best_candidate(task_info.TaskType)
 
-            if best_task_for_type is None:
+            if best_mkr is None:
                 task_details[i] = None
                 continue
-            task_details[i] = best_task_for_type
+            task_details[i] = (best_mkr, min_required_freq)
 
         # 过滤掉无效任务
         valid_tasks = []
@@ -105,7 +100,7 @@ class Scheduler:
         scheduled_task_types = set()
 
         for i in range(num_to_schedule):
-            task_info, real_task, original_idx = valid_tasks[i]
+            task_info, (best_mkr, required_freq), original_idx = valid_tasks[i]
             node = idle_nodes[i]
             
             # 跳过已调度过的任务类型
@@ -113,20 +108,16 @@ class Scheduler:
                 continue
 
             # 验证节点能否满足任务的最低频率要求
-            deadline_slots = real_task.SKR - real_task.Age
-            if deadline_slots <= 0:
-                continue
-            required_freq = (real_task.Ck * real_task.MKR) / (deadline_slots * Constants.Tslot) / 1e6
-            
             if node.ComputeFrequency < required_freq:
                 continue  # 如果节点频率不足，跳过
 
             # 调度任务
-            if mec.schedule_task(task_info.TaskType, node.ID, real_task.MKR, real_task.Ck):
+            ck = task_manager.TaskTypes[task_info.TaskType].Ck
+            if mec.schedule_task(task_info.TaskType, node.ID, best_mkr, ck):
                 res = SchedulingResult()
                 res.TaskType = task_info.TaskType
                 res.NodeID = node.ID
-                res.MKR = real_task.MKR
+                res.MKR = best_mkr
                 res.CompletedTasks = 1
                 results.append(res)
                 
@@ -147,152 +138,152 @@ class Scheduler:
         num_tasks = len(candidate_tasks)
         num_nodes = len(idle_nodes)
         
-        weight_matrix = np.full((num_tasks, num_nodes), np.inf)
-        task_details = [None] * num_tasks
+        # 选择所需计算频率最小的具体任务，构造候选任务和空闲节点的参数向量
+        task_types, best_mkrs, cks, min_required_freqs = self._candidate_vectors(candidate_tasks, task_manager)
+        priorities = np.array([task_info.Priority for task_info in candidate_tasks], dtype=np.int64)
+        node_freqs = np.array([node.ComputeFrequency for node in idle_nodes], dtype=np.int64)
+        queue_lengths = lyapunov_manager.QueueLengths[task_types]
 
-        for i in range(num_tasks):
-            task_info = candidate_tasks[i]
+        # 节点频率不足或没有可行任务（最小所需频率为inf）的组合不可调度
+        infeasible = node_freqs[None, :] < min_required_freqs[:, None]
+        wkr, required_slots, energy_cost = self._scheduling_terms(task_manager, task_types, best_mkrs, cks, idle_nodes, node_freqs)
+        weight_matrix = self.lyapunov_weight_matrix(wkr, required_slots, energy_cost, priorities, queue_lengths, infeasible)
+        logger.debug("时隙%s匹配时 - 权重矩阵规模: %sx%s", self.CurrentTimeSlot, num_tasks, num_nodes)
 
-            # -- 开始执行严格的TODO逻辑 --
-            all_tasks_of_type = task_manager.get_backlog_tasks(task_info.TaskType)
-            best_task_for_type = None
-            min_required_freq = float('inf')
+        # 按匹配模式求解，最小化漂移加惩罚
+        for i, j in self.match_pairs(weight_matrix, maximize=False):
+            task_info = candidate_tasks[i]
+            node = idle_nodes[j]
+            best_mkr = int(best_mkrs[i])
+            ck = task_manager.TaskTypes[task_info.TaskType].Ck
 
-            for current_task in all_tasks_of_type:
-                deadline_slots = current_task.SKR - current_task.Age
-                if deadline_slots <= 0:
-                    continue
-                required_freq = (current_task.Ck * current_task.MKR) / (deadline_slots * Constants.Tslot) / 1e6
-                
-                if required_freq < min_required_freq:
-                    min_required_freq = required_freq
-                    best_task_for_type = current_task
-            # -- 严格TODO逻辑结束 --
+            if mec.schedule_task(task_info.TaskType, node.ID, best_mkr, ck):
+                res = SchedulingResult()
+                res.TaskType = task_info.TaskType
+                res.NodeID = node.ID
+                res.MKR = best_mkr
+                res.CompletedTasks = 1
+                res.Bkr = int(wkr[i] - required_slots[i, j])
+                results.append(res)
+        
+        return results
 
-            if best_task_for_type is None:
-                task_details[i] = None
-                continue
-            task_details[i] = best_task_for_type
-            
-            queue_length = lyapunov_manager.get_queue_length(task_info.TaskType)
-            
-            for j in range(num_nodes):
-                node = idle_nodes[j]
-                
-                if node.ComputeFrequency < min_required_freq:
-                    weight_matrix[i, j] = np.inf
-                    continue
-                
-                required_slots = task_manager.calculate_scheduling_slots(best_task_for_type.MKR, best_task_for_type.Ck,node.ComputeFrequency)
-                frequency_ghz = node.ComputeFrequency / 1000.0
-                energy_cost = Constants.AFIE * (frequency_ghz ** 3) * Constants.NMT * required_slots
-                logger.debug(f"时隙{self.CurrentTimeSlot}匹配时 - energy_cost: {energy_cost:.6f}")
-                
-                bkr_value = task_manager.calculate_bkr(best_task_for_type.MKR, best_task_for_type.Ck,node.ComputeFrequency,False)
-                
-                revenue = Constants.WCOM * task_info.Priority - energy_cost
-                logger.debug(f"时隙{self.CurrentTimeSlot}匹配时 - revenue: {revenue:.6f}")
-                    
-                weight_matrix[i, j] = -queue_length * bkr_value - self.LyapunovVV * revenue
-                logger.debug(f"时隙{self.CurrentTimeSlot}匹配时 - weight_matrix: {weight_matrix[i, j]:.6f}, Lyapunov队列长度：{queue_length:.2f}, 漂移项：{queue_length * bkr_value:.6f}, 收益项：{self.LyapunovVV * revenue:.6f}")
+    def lyapunov_weight_matrix(self, wkr, required_slots, energy_cost, priorities, queue_lengths, infeasible):
+        """
+        李雅普诺夫调度的 (候选任务, 空闲节点) 权重矩阵（漂移加惩罚，越小越好）
+        权重 = -Qk*bkr - VV*(WCOM*优先级 - 能耗成本)，其中bkr = wkr - 占用时隙数，infeasible为True的组合为inf
+        """
+        bkr_value = wkr[:, None] - required_slots
+        revenue = Constants.WCOM * priorities[:, None] - energy_cost
+        weight_matrix = -queue_lengths[:, None] * bkr_value - self.LyapunovVV * revenue
+        weight_matrix[infeasible] = np.inf
+        return weight_matrix
 
-        # 将无效任务的权重设为无穷大
-        for i in range(num_tasks):
-            if task_details[i] is None:
-                weight_matrix[i, :] = np.inf
+    def match_pairs(self, weight_matrix, maximize):
+        """
+        按匹配模式求解任务-节点匹配，返回 [(任务下标, 节点下标)]
+        maximize为True时最大化总权重（不可行组合为-inf），否则最小化（不可行组合为inf）
+        """
+        if self.MatchingMode == Constants.HungarianMatching:
+            matching = self.hungarian_algorithm(-weight_matrix if maximize else weight_matrix)
+            return [(i, j) for i, j in enumerate(matching) if j >= 0]
 
-        # 使用贪心匹配算法（因为scipy的匈牙利算法要求有限权重）
+        # 贪心匹配：按权重排序逐对匹配，每个任务和节点最多匹配一次
+        num_tasks, num_nodes = weight_matrix.shape
         assigned_tasks = [False] * num_tasks
         assigned_nodes = [False] * num_nodes
-        
-        # 获取所有有效的(任务,节点)对，按权重排序
-        valid_pairs = []
-        for i in range(num_tasks):
-            for j in range(num_nodes):
-                if weight_matrix[i, j] < np.inf:
-                    valid_pairs.append((weight_matrix[i, j], i, j))
-        
-        valid_pairs.sort()  # 按权重升序排序
-        
         num_to_schedule = min(num_tasks, num_nodes)
-        count_scheduled = 0
-        
-        for weight, i, j in valid_pairs:
-            if count_scheduled >= num_to_schedule:
+        pairs = []
+        for i, j in self._sorted_pairs(weight_matrix, descending=maximize):
+            if len(pairs) >= num_to_schedule:
                 break
-                
             if not assigned_tasks[i] and not assigned_nodes[j]:
-                task_info = candidate_tasks[i]
-                node = idle_nodes[j]
-                real_task = task_details[i]
-
-                if mec.schedule_task(task_info.TaskType, node.ID, real_task.MKR, real_task.Ck):
-                    res = SchedulingResult()
-                    res.TaskType = task_info.TaskType
-                    res.NodeID = node.ID
-                    res.MKR = real_task.MKR
-                    res.CompletedTasks = 1
-                    res.Bkr = task_manager.calculate_bkr(real_task.MKR, real_task.Ck,node.ComputeFrequency,False)
-                    results.append(res)
-                    
-                    assigned_tasks[i] = True
-                    assigned_nodes[j] = True
-                    count_scheduled += 1
-        
-        return results
+                pairs.append((i, j))
+                assigned_tasks[i] = True
+                assigned_nodes[j] = True
+        return pairs
         
+    @staticmethod
+    def _candidate_vectors(candidate_tasks, task_manager):
+        """
+        候选任务的参数向量 (任务类型, 最优MKR, 计算复杂度, 最小所需计算频率)
+        没有可行任务的候选MKR为0、最小所需计算频率为inf
+        """
+        task_types = np.array([task_info.TaskType for task_info in candidate_tasks], dtype=np.int64)
+        all_mkrs, all_freqs = task_manager.get_best_candidates()
+        min_required_freqs = all_freqs[task_types]
+        best_mkrs = np.where(np.isinf(min_required_freqs), 0, all_mkrs[task_types])
+        cks = task_manager.TypeCk[task_types]
+        return task_types, best_mkrs, cks, min_required_freqs
+
+    @staticmethod
+    def _scheduling_terms(task_manager, task_types, best_mkrs, cks, idle_nodes, node_freqs):
+        """
+        候选任务的wkr向量，以及 (候选任务, 空闲节点) 的占用时隙数矩阵和能耗成本矩阵
+        优先读取仿真开始时构建的查找表，没有查找表或MKR超出表的范围时按公式计算
+        """
+        tables = task_manager.LookupTables
+        valid = best_mkrs > 0
+        if tables is not None and tables.covers(task_types[valid], best_mkrs[valid]):
+            node_indices = np.array([node.Index for node in idle_nodes], dtype=np.int64)
+            return tables.gather(task_types, best_mkrs, node_indices)
+        return LookupTables.compute_terms(best_mkrs, cks, node_freqs)
+
+    @staticmethod
+    def _sorted_pairs(weight_matrix, descending):
+        """
+        有限权重的 (任务下标, 节点下标) 对，按 (权重, 任务下标, 节点下标) 排序
+        与对 (权重, i, j) 元组列表排序的结果一致
+        """
+        rows, cols = np.nonzero(np.isfinite(weight_matrix))
+        order = np.lexsort((cols, rows, weight_matrix[rows, cols]))
+        if descending:
+            order = order[::-1]
+        return list(zip(rows[order].tolist(), cols[order].tolist()))
+
     def get_candidate_tasks(self, mec, task_manager):
-        """获取候选调度任务（排除缓存命中和正在计算的任务类型）"""
+        """获取候选调度任务（排除缓存命中和正在计算的任务类型，只检查缓存不记录命中）"""
         candidate_tasks = []
         
-        for task_type in task_manager.BacklogQueue:
-            backlog_count = task_manager.get_backlog_count(task_type)
-            
-            if (backlog_count > 0 and 
-                not mec.is_cache_hit(task_type) and 
-                not mec.is_task_type_computing(task_type)):
-                # 该任务类型在积压队列中且未缓存命中且未在计算
-                tt = task_manager.TaskTypes[task_type]
-                access_freq = mec.AccessFrequency[task_type]
-                candidate_tasks.append(TaskValue2(task_type, tt.Priority, access_freq, backlog_count, 0))
+        # 该任务类型在积压队列中且未缓存命中且未在计算（一次向量运算筛选）
+        backlog_counts = task_manager.get_backlog_counts()
+        eligible = (backlog_counts > 0) & ~mec.get_cached_mask() & ~mec.get_computing_mask()
+        for task_type in np.flatnonzero(eligible).tolist():
+            tt = task_manager.TaskTypes[task_type]
+            access_freq = mec.popularity(task_type)
+            candidate_tasks.append(TaskValue2(task_type, tt.Priority, access_freq, int(backlog_counts[task_type]), 0))
         
         return candidate_tasks
         
 
     def hungarian_algorithm(self, cost_matrix):
         """
-        匈牙利算法实现（简化版本）
-        使用scipy.optimize.linear_sum_assignment来替代复杂的匈牙利算法实现
+        匈牙利算法（scipy.optimize.linear_sum_assignment）
+        不可行组合（inf）替换为有限的大M：大M超过任意两个匹配的有限权重和之差，
+        因此求解结果先保证可行匹配数最多，再使总代价最小；匹配到大M的行视为无匹配
         """
         m, n = cost_matrix.shape
         if m == 0 or n == 0:
             return []
         
-        # 处理非方形矩阵
-        if m < n:
-            # 添加虚拟行
-            cost_matrix = np.vstack([cost_matrix, np.full((n - m, n), np.inf)])
-        elif m > n:
-            # 添加虚拟列
-            cost_matrix = np.hstack([cost_matrix, np.full((m, m - n), np.inf)])
+        feasible = np.isfinite(cost_matrix)
+        if not feasible.any():
+            return [-1] * m
+        big_m = 2.0 * min(m, n) * (np.abs(cost_matrix[feasible]).max() + 1.0)
         
         try:
-            # 使用scipy的匈牙利算法求解分配问题
-            row_indices, col_indices = linear_sum_assignment(cost_matrix)
-            
-            # 转换为匹配格式
-            matching = [-1] * m
-            for i, j in zip(row_indices, col_indices):
-                if i < m and j < n and cost_matrix[i, j] < np.inf:
-                    matching[i] = j
-                else:
-                    matching[i] = -1  # 无匹配
-            
-            return matching[:m]  # 只返回原始任务数量的匹配
-        except:
-            # 如果scipy不可用，使用简单的贪心匹配
-            print('scipy不可用，使用简单贪心匹配')
-            return self.greedy_matching(cost_matrix[:m, :n])
+            # 使用scipy的匈牙利算法求解分配问题（支持非方形矩阵）
+            row_indices, col_indices = linear_sum_assignment(np.where(feasible, cost_matrix, big_m))
+        except ValueError:
+            print('匈牙利算法求解失败，使用简单贪心匹配')
+            return self.greedy_matching(cost_matrix)
+        
+        # 转换为匹配格式
+        matching = [-1] * m
+        for i, j in zip(row_indices, col_indices):
+            if feasible[i, j]:
+                matching[i] = int(j)
+        return matching
         
     def greedy_matching(self, cost_matrix):
         """简单的贪心匹配算法（作为备选方案）"""
@@ -331,88 +322,31 @@ class Scheduler:
         num_tasks = len(candidate_tasks)
         num_nodes = len(idle_nodes)
         
-        weight_matrix = np.full((num_tasks, num_nodes), -np.inf)
-        task_details = [None] * num_tasks
+        # 选择所需计算频率最小的具体任务，构造候选任务和空闲节点的参数向量
+        task_types, best_mkrs, cks, min_required_freqs = self._candidate_vectors(candidate_tasks, task_manager)
+        priorities = np.array([task_info.Priority for task_info in candidate_tasks], dtype=np.int64)
+        node_freqs = np.array([node.ComputeFrequency for node in idle_nodes], dtype=np.int64)
 
-        for i in range(num_tasks):
-            task_info = candidate_tasks[i]
-            
-            # -- 开始执行严格的TODO逻辑 --
-            all_tasks_of_type = task_manager.get_backlog_tasks(task_info.TaskType)
-            best_task_for_type = None
-            min_required_freq = float('inf')
-
-            for current_task in all_tasks_of_type:
-                deadline_slots = current_task.SKR - current_task.Age
-                if deadline_slots <= 0:
-                    continue
-                required_freq = (current_task.Ck * current_task.MKR) / (deadline_slots * Constants.Tslot) / 1e6
-                
-                if required_freq < min_required_freq:
-                    min_required_freq = required_freq
-                    best_task_for_type = current_task
-            # -- 严格TODO逻辑结束 --
-
-            if best_task_for_type is None:
-                task_details[i] = None
-                continue
-            task_details[i] = best_task_for_type
+        _, _, energy_cost = self._scheduling_terms(task_manager, task_types, best_mkrs, cks, idle_nodes, node_freqs)
+        weight_matrix = Constants.WCOM * priorities[:, None] - energy_cost
 
-            for j in range(num_nodes):
-                node = idle_nodes[j]
-                
-                # 检查节点是否满足最低频率要求
-                if node.ComputeFrequency < min_required_freq:
-                    weight_matrix[i, j] = -np.inf
-                    continue
-                
-                required_slots = task_manager.calculate_scheduling_slots(best_task_for_type.MKR, best_task_for_type.Ck,node.ComputeFrequency)
-                frequency_ghz = node.ComputeFrequency / 1000.0
-                energy_cost = Constants.AFIE * (frequency_ghz ** 3) * Constants.NMT * required_slots
-                
-                weight_matrix[i, j] = Constants.WCOM * task_info.Priority - energy_cost
+        # 节点频率不足或没有可行任务的组合权重设为负无穷
+        weight_matrix[node_freqs[None, :] < min_required_freqs[:, None]] = -np.inf
         
-        # 将无效任务的权重设为负无穷
-        for i in range(num_tasks):
-            if task_details[i] is None:
-                weight_matrix[i, :] = -np.inf
-        
-        # 使用贪心匹配算法（按权重降序）
-        assigned_tasks = [False] * num_tasks
-        assigned_nodes = [False] * num_nodes
-        
-        # 获取所有有效的(任务,节点)对，按权重降序排序
-        valid_pairs = []
-        for i in range(num_tasks):
-            for j in range(num_nodes):
-                if weight_matrix[i, j] > -np.inf:
-                    valid_pairs.append((weight_matrix[i, j], i, j))
-        
-        valid_pairs.sort(reverse=True)  # 按权重降序排序
-        
-        num_to_schedule = min(num_tasks, num_nodes)
-        count_scheduled = 0
-        
-        for weight, i, j in valid_pairs:
-            if count_scheduled >= num_to_schedule:
-                break
-                
-            if not assigned_tasks[i] and not assigned_nodes[j]:
-                task_info = candidate_tasks[i]
-                node = idle_nodes[j]
-                real_task = task_details[i]
-
-                if mec.schedule_task(task_info.TaskType, node.ID, real_task.MKR, real_task.Ck):
-                    res = SchedulingResult()
-                    res.TaskType = task_info.TaskType
-                    res.NodeID = node.ID
-                    res.MKR = real_task.MKR
-                    res.CompletedTasks = 1
-                    results.append(res)
-                    
-                    assigned_tasks[i] = True
-                    assigned_nodes[j] = True
-                    count_scheduled += 1
+        # 按匹配模式求解，最大化短期收益
+        for i, j in self.match_pairs(weight_matrix, maximize=True):
+            task_info = candidate_tasks[i]
+            node = idle_nodes[j]
+            best_mkr = int(best_mkrs[i])
+            ck = task_manager.TaskTypes[task_info.TaskType].Ck
+
+            if mec.schedule_task(task_info.TaskType, node.ID, best_mkr, ck):
+                res = SchedulingResult()
+                res.TaskType = task_info.TaskType
+                res.NodeID = node.ID
+                res.MKR = best_mkr
+                res.CompletedTasks = 1
+                results.append(res)
         
         return results
         
@@ -2,6 +2,8 @@
 仿真器类
 """
 
+import numpy as np
+
 # 处理导入问题
 try:
     from .constants import Constants
@@ -10,6 +12,9 @@ try:
     from .lyapunov_classes import LyapunovManager
     from .scheduler import Scheduler
     from .stats_classes import SimulationStats
+    from .event_calendar import EventCalendar
+    from .lookup_tables import LookupTables
+    from .trace_recorder import TraceRecorder
 except ImportError:
     from constants import Constants
     from mec import MEC
@@ -17,57 +22,180 @@ except ImportError:
     from lyapunov_classes import LyapunovManager
     from scheduler import Scheduler
     from stats_classes import SimulationStats
+    from event_calendar import EventCalendar
+    from lookup_tables import LookupTables
+    from trace_recorder import TraceRecorder
 
 # 导入日志工具
 try:
-     from .logger import logger
+     from .logger import get_logger
 except ImportError:
-     from logger import logger
+     from logger import get_logger
+
+logger = get_logger('simulator')
        
 
 class Simulator:
     """Simulator 仿真器"""
     
-    def __init__(self, total_time_slots=1000):
-        """构造函数"""
+    def __init__(self, total_time_slots=1000, arrival_source=None):
+        """构造函数，arrival_source为共享的任务到达来源（如ArrivalTrace），None表示随机生成任务"""
         self.MEC = MEC()
-        self.TaskManager = TaskManager()
+        self.TaskManager = TaskManager(arrival_source)
         self.LyapunovManager = LyapunovManager()
         self.Scheduler = Scheduler(Constants.GreedySchedule, Constants.VV_DEFAULT)  # 默认使用贪心调度
         self.CurrentTimeSlot = 0
         self.TotalTimeSlots = total_time_slots
         self.Statistics = SimulationStats()
+        self.MatchingMode = Constants.GreedyMatching  # 任务-节点匹配算法
+        self.EngineMode = Constants.SlotStepping  # 仿真推进模式
+        self.EventCalendar = None                 # 事件日历（仅事件驱动模式使用）
+        self.ProcessedTimeSlots = 0               # 实际完整执行的时隙数
+        self.Trace = None                         # 事件轨迹记录器（TraceRecorder，None表示不记录）
+        
+        # 按任务类型和节点频率构建查找表，供调度、李雅普诺夫更新和收益计算共享
+        self.LookupTables = LookupTables(self.TaskManager.TaskTypes, self.MEC.VirtualNodes.ComputeFrequency)
+        self.TaskManager.LookupTables = self.LookupTables
+        self.MEC.LookupTables = self.LookupTables
         
     def set_cache_strategy(self, strategy):
         """设置缓存策略"""
-        self.MEC.set_cache_strategy(strategy)
+        self.MEC.set_cache_strategy(strategy, self.TaskManager)
+        
+    def set_admission_filter(self, enabled):
+        """设置是否在缓存替换策略前启用TinyLFU准入过滤"""
+        self.MEC.set_admission_filter(enabled)
+        
+    def set_popularity_mode(self, mode, half_life=None):
+        """设置缓存策略和候选任务价值使用的流行度估计方式（Constants.CumulativePopularity 或 Constants.DecayedPopularity）"""
+        self.MEC.set_popularity_mode(mode, half_life)
+        
+    def set_knapsack_mode(self, mode, epsilon=None):
+        """设置背包缓存策略的求解模式（Constants.ExactKnapsack 或 Constants.ApproxKnapsack）及近似精度"""
+        self.MEC.set_knapsack_mode(mode, epsilon)
         
     def set_schedule_strategy(self, algorithm, vv=None):
         """设置调度策略 和 李雅普诺夫漂移参数"""
         if vv is None:
             vv = Constants.VV_DEFAULT
-        self.Scheduler = Scheduler(algorithm, vv)
+        self.Scheduler = Scheduler(algorithm, vv, self.MatchingMode)
+        
+    def set_matching_mode(self, mode):
+        """设置任务-节点匹配算法（Constants.GreedyMatching 或 Constants.HungarianMatching）"""
+        self.MatchingMode = mode
+        self.Scheduler.MatchingMode = mode
+        
+    def set_trace(self, directory, buffer_records=None, chunk_records=None):
+        """把仿真事件轨迹记录到directory下的分块二进制文件（可用trace_recorder.load_trace读取），directory为None时停止记录"""
+        if self.Trace is not None:
+            self.Trace.close()
+        self.Trace = TraceRecorder(directory, buffer_records, chunk_records) if directory is not None else None
+        self.MEC.Trace = self.Trace
+        
+    def set_engine_mode(self, mode):
+        """设置仿真推进模式（Constants.SlotStepping 或 Constants.EventDriven）"""
+        self.EngineMode = mode
         
     def run_simulation(self):
         """运行仿真"""
         print(f'开始仿真，总时隙数: {self.TotalTimeSlots}')
         
-        for t in range(self.TotalTimeSlots):
+        try:
+            if self.EngineMode == Constants.EventDriven:
+                self.run_event_driven()
+            else:
+                for t in range(self.TotalTimeSlots):
+                    self.CurrentTimeSlot = t
+                    self.run_time_slot()
+                    
+                    # 每100个时隙输出一次进度
+                    if (t + 1) % 100 == 0:
+                        print(f'时隙进度: {t + 1}/{self.TotalTimeSlots}')
+        finally:
+            # 仿真结束（或出错）时写出剩余记录并关闭分块文件
+            if self.Trace is not None:
+                self.Trace.close()
+        self.print_statistics()
+        
+    def run_event_driven(self):
+        """
+        事件驱动推进：只完整执行可能发生状态变化或调度决策的时隙
+        事件包括任务到达、任务过期、节点计算完成，以及存在空闲节点和可调度积压任务
+        两个事件之间的时隙状态不变，直接累加统计量，结果与逐时隙推进一致
+        """
+        self.EventCalendar = EventCalendar()
+        self._seed_event_calendar()
+        
+        t = 0
+        while t < self.TotalTimeSlots:
             self.CurrentTimeSlot = t
             self.run_time_slot()
             
+            next_slot = self._next_active_slot(t)
+            if next_slot > t + 1:
+                self._skip_quiet_slots(t + 1, next_slot)
+            
             # 每100个时隙输出一次进度
-            if (t + 1) % 100 == 0:
-                print(f'时隙进度: {t + 1}/{self.TotalTimeSlots}')
+            for progress in range((t // 100 + 1) * 100, next_slot + 1, 100):
+                print(f'时隙进度: {progress}/{self.TotalTimeSlots}')
+            t = next_slot
         
-        self.print_statistics()
+    def _seed_event_calendar(self):
+        """根据当前节点和积压队列状态登记已知事件"""
+        pool = self.MEC.VirtualNodes
+        for remaining in pool.RemainingSlots[~pool.IsIdle].tolist():
+            self.EventCalendar.push(self.CurrentTimeSlot + remaining - 1, EventCalendar.NODE_COMPLETION)
+        for backlog in self.TaskManager.BacklogQueue.values():
+            self.EventCalendar.push_expiries(backlog.ExpireAt[:backlog.Size].tolist())
+        
+    def _has_pending_decision(self):
+        """下一时隙是否可能做出调度决策（存在空闲节点且存在未在计算的积压任务类型）"""
+        if not self.MEC.VirtualNodes.IsIdle.any():
+            return False
+        for task_type, backlog in self.TaskManager.BacklogQueue.items():
+            if len(backlog) > 0 and not self.MEC.is_task_type_computing(task_type):
+                return True
+        return False
+        
+    def _next_active_slot(self, current_time_slot):
+        """完整执行current_time_slot后，下一个需要完整执行的时隙"""
+        if self._has_pending_decision():
+            return current_time_slot + 1
+        
+        next_slot = self.TotalTimeSlots
+        for candidate in (self.TaskManager.next_arrival_slot(current_time_slot),
+                          self.EventCalendar.next_event_slot(current_time_slot)):
+            if candidate is not None:
+                next_slot = min(next_slot, candidate)
+        return max(next_slot, current_time_slot + 1)
+        
+    def _skip_quiet_slots(self, start_slot, end_slot):
+        """
+        跳过 [start_slot, end_slot) 内的时隙
+        这些时隙没有到达、过期、完成和调度，收益与队列不变，只需推进节点倒计时并累加统计
+        """
+        count = end_slot - start_slot
+        last_slot = end_slot - 1
+        
+        self.MEC.advance_nodes(count)
+        self.MEC.update_time_slot(last_slot)
+        self.Scheduler.update_time_slot(last_slot)
+        self.TaskManager.CurrentTimeSlot = last_slot
+        self.CurrentTimeSlot = last_slot
+        
+        self.Statistics.TotalRevenue = self.MEC.Revenue
+        self.Statistics.AverageRevenue = self.Statistics.TotalRevenue / (last_slot + 1)
+        self.Statistics.record_timeseries_data(start_slot + 1, self.MEC, self.TaskManager, repeat=count)
+        self.Statistics.update_backlog_stats(self.TaskManager, repeat=count)
         
     def run_time_slot(self):
         """运行单个时隙"""
      
+        self.ProcessedTimeSlots += 1
+        
         # 记录时隙开始
         logger.separator("=", 80)
-        logger.info(f"开始执行时隙 {self.CurrentTimeSlot}")
+        logger.info("开始执行时隙 %s", self.CurrentTimeSlot)
         
         # 更新MEC和Scheduler的当前时隙
         self.MEC.update_time_slot(self.CurrentTimeSlot)
@@ -79,66 +207,81 @@ class Simulator:
         cache_hit_tasks = {}
 
         # 1. 生成新任务并处理过期任务
-        new_tasks = self.TaskManager.generate_random_tasks(self.CurrentTimeSlot)
+        K = Constants.K()
+        new_tasks = self.TaskManager.generate_task_batch(self.CurrentTimeSlot)
+        arrival_counts = new_tasks.type_counts(K)
         self.Statistics.TotalTasksGenerated += len(new_tasks)
-        logger.info(f"生成新任务数量: {len(new_tasks)}")
+        logger.info("生成新任务数量: %s", len(new_tasks))
         
-        # 更新任务类型生成统计和访问统计
-        for task in new_tasks:
-            stat = self.Statistics.TaskTypeStats[task.TaskType]
-            stat.Generated += 1
-            # 记录任务访问（正确的访问统计方式）
-            self.MEC.record_task_access(task.TaskType)
+        # 更新任务类型生成统计
+        for task_type in arrival_counts.nonzero()[0].tolist():
+            stat = self.Statistics.TaskTypeStats[task_type]
+            stat.Generated += int(arrival_counts[task_type])
+        
+        # 记录任务访问（正确的访问统计方式）
+        self.MEC.record_arrivals(arrival_counts)
+        trace = self.Trace
+        if trace is not None:
+            trace.record_counts(self.CurrentTimeSlot, TraceRecorder.ARRIVAL, arrival_counts)
+        for task_type in new_tasks.TaskType.tolist():
+            self.MEC.record_task_access(task_type)
         
         # 移除过期任务
         expired_counts = self.TaskManager.remove_expired_tasks(self.CurrentTimeSlot)
         total_expired = sum(expired_counts.values())
         if total_expired > 0:
-            logger.info(f"移除过期任务数量: {total_expired}")
+            logger.info("移除过期任务数量: %s", total_expired)
         
         for task_type, count in expired_counts.items():
+            if trace is not None:
+                trace.record(self.CurrentTimeSlot, TraceRecorder.EXPIRY, task_type, count=count)
             self.Statistics.TotalTasksDropped += count
             stat = self.Statistics.TaskTypeStats[task_type]
             stat.Dropped += count
         
         # 2. 统一处理：先把所有新生成的任务都放到积压队列中
-        for task in new_tasks:
-            self.TaskManager.add_to_backlog(task)
-            self.Statistics.TotalCacheAccess += 1
+        self.TaskManager.add_batch_to_backlog(new_tasks)
+        self.Statistics.TotalCacheAccess += len(new_tasks)
+        if self.EventCalendar is not None:
+            # 任务在 Age > SKR 的时隙被移除
+            self.EventCalendar.push_expiries((new_tasks.CreateTime + new_tasks.SKR + 1).tolist())
         
-        # 3. 时隙开始检查：如果任务类型缓存命中，清空该类型积压队列
-        K = Constants.K()
-        for task_type in range(1, K + 1):
-            backlog_count = self.TaskManager.get_backlog_count(task_type)
-            if backlog_count > 0:
-                if self.MEC.is_cache_hit(task_type):
-                    # 缓存命中，该类型所有积压任务直接完成
-                    self.Statistics.CacheHitCount += backlog_count
-                    self.Statistics.TotalTasksCompleted += backlog_count
-                    stat = self.Statistics.TaskTypeStats[task_type]
-                    stat.CacheHits += backlog_count
-                    stat.Completed += backlog_count
-                    
-                    # 记录缓存命中任务的总优先级
-                    if task_type in self.TaskManager.TaskTypes:
-                        tt = self.TaskManager.TaskTypes[task_type]
-                        stat.CacheHitPrioritySum += (backlog_count * tt.Priority)
-                        
-                        # 记录用于收益计算
-                        hit_info = {
-                            'backlogCount': backlog_count,
-                            'metaK': tt.MetaK
-                        }
-                        cache_hit_tasks[task_type] = hit_info
-                    
-                    self.TaskManager.remove_tasks_from_backlog(task_type, backlog_count)
+        # 3. 时隙开始检查：如果任务类型缓存命中，清空该类型积压队列（每个命中的类型记录一次命中）
+        backlog_counts = self.TaskManager.get_backlog_counts()
+        for task_type in np.flatnonzero((backlog_counts > 0) & self.MEC.get_cached_mask()).tolist():
+            backlog_count = int(backlog_counts[task_type])
+            self.MEC.record_cache_hit(task_type)
+            if trace is not None:
+                trace.record(self.CurrentTimeSlot, TraceRecorder.CACHE_HIT, task_type, count=backlog_count)
+            # 缓存命中，该类型所有积压任务直接完成
+            self.Statistics.CacheHitCount += backlog_count
+            self.Statistics.TotalTasksCompleted += backlog_count
+            stat = self.Statistics.TaskTypeStats[task_type]
+            stat.CacheHits += backlog_count
+            stat.Completed += backlog_count
+            
+            # 记录缓存命中任务的总优先级
+            if task_type in self.TaskManager.TaskTypes:
+                tt = self.TaskManager.TaskTypes[task_type]
+                stat.CacheHitPrioritySum += (backlog_count * tt.Priority)
+                
+                # 记录用于收益计算
+                hit_info = {
+                    'backlogCount': backlog_count,
+                    'metaK': tt.MetaK
+                }
+                cache_hit_tasks[task_type] = hit_info
+            
+            self.TaskManager.remove_tasks_from_backlog(task_type, backlog_count)
         
         # 4. 调度积压队列中的任务
         scheduling_results = self.Scheduler.schedule_tasks(self.MEC, self.TaskManager, self.LyapunovManager)
         if len(scheduling_results) > 0:
-            logger.info(f"调度任务数量: {len(scheduling_results)}")
+            logger.info("调度任务数量: %s", len(scheduling_results))
         
         for res in scheduling_results:
+            if trace is not None:
+                trace.record(self.CurrentTimeSlot, TraceRecorder.SCHEDULE, res.TaskType, res.NodeID, res.MKR, res.Bkr)
             # 记录用于收益计算
             if res.TaskType in self.TaskManager.TaskTypes and res.NodeID > 0:
                 tt = self.TaskManager.TaskTypes[res.TaskType]
@@ -153,14 +296,21 @@ class Simulator:
                   
         # 5. 更新虚拟节点状态
         completed_task_types_map = self.MEC.update_nodes()
+        if self.EventCalendar is not None:
+            for res in scheduling_results:
+                node = self.MEC.VirtualNodes[res.NodeID - 1]
+                if not node.IsIdle:
+                    self.EventCalendar.push(self.CurrentTimeSlot + node.RemainingSlots, EventCalendar.NODE_COMPLETION)
         total_completed_types = len(completed_task_types_map)
         if total_completed_types > 0:
-            logger.info(f"完成计算的任务类型数: {total_completed_types}")
+            logger.info("完成计算的任务类型数: %s", total_completed_types)
 
         # 遍历所有类型积压队列，清空completedTaskTypes中存在的任务类型对应的积压队列
         # TotalTasksCompleted的统计应该等于对应的积压队列中的任务
         for task_type, _ in completed_task_types_map.items():
             backlog_count = self.TaskManager.get_backlog_count(task_type)
+            if trace is not None:
+                trace.record(self.CurrentTimeSlot, TraceRecorder.COMPLETION, task_type, count=backlog_count)
             
             if backlog_count > 0:
                 self.Statistics.TotalTasksCompleted += backlog_count
@@ -179,29 +329,22 @@ class Simulator:
                 self.MEC.add_to_cache(task_type, tt.MetaK, self.TaskManager)
         
         # 7. 更新李雅普诺夫队列
-        for task_type in range(1, K + 1):
-            # 计算bk(t) - 本时隙完成的该类型任务数
-            bk = 0
-            scheduled_mkr = None  # 实际调度的任务的mkr值
-            for res in scheduling_results:
-                if res.TaskType == task_type:
-                    bk += res.Bkr
-                    if scheduled_mkr is None:  # 只取第一个调度结果的mkr值
-                        scheduled_mkr = res.MKR
-            
-            # 计算ak(t) - 本时隙新到达的该类型任务数
-            ak = 0
-            for task in new_tasks:
-                if task.TaskType == task_type:
-                    ak += 1
-            
-            # 计算丢弃的任务数
-            dropped_count = 0
-            if task_type in expired_counts:
-                dropped_count = expired_counts[task_type]
-            
-            # 传递实际调度的任务的mkr值和当前时隙
-            self.LyapunovManager.update_queue(task_type, bk, dropped_count, ak, self.TaskManager, scheduled_mkr, self.CurrentTimeSlot)
+        # 一次遍历调度结果，得到各类型本时隙完成的任务数bk(t)和实际调度的任务的mkr值（只取第一个调度结果，0表示未调度）
+        service_counts = np.zeros(K + 1, dtype=np.int64)
+        scheduled_mkrs = np.zeros(K + 1, dtype=np.int64)
+        for res in scheduling_results:
+            service_counts[res.TaskType] += res.Bkr
+            if scheduled_mkrs[res.TaskType] == 0:
+                scheduled_mkrs[res.TaskType] = res.MKR
+
+        # 各类型本时隙丢弃的任务数
+        dropped_counts = np.zeros(K + 1, dtype=np.int64)
+        for task_type, dropped_count in expired_counts.items():
+            dropped_counts[task_type] = dropped_count
+
+        # ak(t)直接使用步骤1统计的各类型到达数
+        self.LyapunovManager.update_queues(service_counts, dropped_counts, arrival_counts, self.TaskManager,
+                                           scheduled_mkrs, self.CurrentTimeSlot)
         
         # 8. 更新收益
         self.MEC.update_revenue(self.TaskManager, scheduled_tasks, completed_tasks, cache_hit_tasks)
@@ -220,10 +363,9 @@ class Simulator:
         self.Statistics.update_backlog_stats(self.TaskManager)
         
         # 记录时隙结束信息
-        total_backlog = self.TaskManager.get_all_backlog_count()
-        logger.info(f"时隙 {self.CurrentTimeSlot} 执行完成")
-        logger.info(f"当前总积压任务数: {total_backlog}")
-        logger.info(f"累计总收益: {self.MEC.Revenue:.6f}")
+        logger.info("时隙 %s 执行完成", self.CurrentTimeSlot)
+        logger.info(lambda: f"当前总积压任务数: {self.TaskManager.get_all_backlog_count()}")
+        logger.info("累计总收益: %.6f", self.MEC.Revenue)
         logger.separator("=", 80)
         
     def print_statistics(self):
@@ -57,35 +57,38 @@ class SimulationStats:
         for i in range(1, K + 1):
             self.TaskTypeStats[i] = TaskTypeStat()
     
-    def record_timeseries_data(self, time_slot, mec, task_manager):
-        """记录时序数据用于绘图"""
-        self.timeseries_data['time_slots'].append(time_slot)
+    def record_timeseries_data(self, time_slot, mec, task_manager, repeat=1):
+        """
+        记录时序数据用于绘图
+        repeat > 1 时表示从time_slot开始连续repeat个状态不变的时隙（事件驱动模式跳过的时隙）
+        """
+        self.timeseries_data['time_slots'].extend(range(time_slot, time_slot + repeat))
         
         # 缓存命中率
         if self.TotalCacheAccess > 0:
             cache_hit_rate = self.CacheHitCount / self.TotalCacheAccess
         else:
             cache_hit_rate = 0
-        self.timeseries_data['cache_hit_rates'].append(cache_hit_rate)
+        self.timeseries_data['cache_hit_rates'].extend([cache_hit_rate] * repeat)
         
         # 任务完成率
         if self.TotalTasksGenerated > 0:
             completion_rate = self.TotalTasksCompleted / self.TotalTasksGenerated
         else:
             completion_rate = 0
-        self.timeseries_data['completion_rates'].append(completion_rate)
+        self.timeseries_data['completion_rates'].extend([completion_rate] * repeat)
         
         # 收益
-        self.timeseries_data['revenues'].append(mec.Revenue)
+        self.timeseries_data['revenues'].extend([mec.Revenue] * repeat)
         
         # 缓存利用率
-        self.timeseries_data['cache_utilizations'].append(mec.get_cache_utilization())
+        self.timeseries_data['cache_utilizations'].extend([mec.get_cache_utilization()] * repeat)
         
         # 节点利用率
-        self.timeseries_data['node_utilizations'].append(mec.get_node_utilization())
+        self.timeseries_data['node_utilizations'].extend([mec.get_node_utilization()] * repeat)
     
-    def update_backlog_stats(self, task_manager):
-        """更新积压队列长度统计"""
+    def update_backlog_stats(self, task_manager, repeat=1):
+        """更新积压队列长度统计（repeat含义同record_timeseries_data）"""
         # 计算当前时隙的总积压队列长度
         total_backlog = 0
         K = Constants.K()
@@ -93,8 +96,8 @@ class SimulationStats:
             total_backlog += task_manager.get_backlog_count(k)
         
         # 更新统计信息
-        self.TotalBacklogLength += total_backlog
-        self.BacklogSampleCount += 1
+        self.TotalBacklogLength += total_backlog * repeat
+        self.BacklogSampleCount += repeat
         
         # 计算平均积压队列长度
         if self.BacklogSampleCount > 0:
@@ -3,6 +3,7 @@
 """
 
 import random
+import numpy as np
 
 try:
     from .constants import Constants
@@ -25,6 +26,33 @@ class Task:
         self.CreateTime = create_time # 创建时隙
 
 
+class TaskBatch:
+    """TaskBatch 一个时隙内批量生成的任务（列式存储，各列为等长NumPy数组）"""
+    
+    def __init__(self, task_ids, task_types, mkrs, skrs, create_time):
+        self.ID = task_ids                                   # 任务ID列
+        self.TaskType = task_types                           # 任务类型列 (1~K)
+        self.MKR = mkrs                                      # 输入数据量列 (Mbit)
+        self.SKR = skrs                                      # 时延预警值列 (秒)
+        self.CreateTime = np.full(len(task_ids), create_time, dtype=np.int64)  # 创建时隙列
+    
+    def __len__(self):
+        return len(self.ID)
+    
+    def type_counts(self, K):
+        """各任务类型的到达数量，返回长度为K+1的数组（索引0不使用）"""
+        return np.bincount(self.TaskType, minlength=K + 1)
+    
+    def to_tasks(self, task_types):
+        """转换为Task对象列表，task_types为任务类型映射 (dict)"""
+        tasks = []
+        for i in range(len(self.ID)):
+            tt = task_types[int(self.TaskType[i])]
+            tasks.append(Task(int(self.ID[i]), tt.Type, tt.Priority, int(self.SKR[i]),
+                              int(self.MKR[i]), tt.Ck, tt.MetaK, int(self.CreateTime[i])))
+        return tasks
+
+
 class TaskType:
     """TaskType 表示任务类型的静态信息"""
     
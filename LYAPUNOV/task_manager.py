@@ -4,52 +4,84 @@
 
 # 导入日志工具
 try:
-    from .logger import logger
+    from .logger import get_logger
 except ImportError:
-    from logger import logger
+    from logger import get_logger
+
+logger = get_logger('task_manager')
 
 import random
 import math
+import numpy as np
 from datetime import datetime
 try:
     from .constants import Constants
-    from .task_classes import Task, TaskType
+    from .task_classes import Task, TaskType, TaskValue2, TaskBatch
+    from .backlog_classes import TypeBacklog, CandidateIndex, ExpiryWheel
 except ImportError:
     from constants import Constants
-    from task_classes import Task, TaskType, TaskValue2
+    from task_classes import Task, TaskType, TaskValue2, TaskBatch
+    from backlog_classes import TypeBacklog, CandidateIndex, ExpiryWheel
 
 
 class TaskManager:
     """TaskManager 管理所有任务类型和任务实例"""
 
-    def __init__(self):
-        """构造函数"""
+    def __init__(self, arrival_source=None):
+        """构造函数，arrival_source不为None时从该来源（如ArrivalTrace）读取任务类型表和到达任务，不再随机生成"""
         self.TaskTypes = {}      # 任务类型映射 (dict)
-        self.BacklogQueue = {}   # 积压队列，按任务类型分组 (dict)
+        self.BacklogQueue = {}   # 积压队列，按任务类型分组 (dict: 类型 -> TypeBacklog)
         self.nextTaskID = 1      # 下一个任务ID
+        self.CurrentTimeSlot = 0 # 最近一次过期检查的时隙（用于推导任务年龄）
+        self.ExpiryWheel = ExpiryWheel()  # 积压任务过期时间轮
+        self.BacklogGeneration = {}       # 各类型积压队列被整体清空的次数（时间轮登记的代数）
+        self.ArrivalCDF = None   # 任务类型到达概率的累积分布缓存（PK变化时失效）
+        self.ArrivalSource = arrival_source  # 任务到达来源（None表示按PK随机生成）
 
         # 初始化任务类型配置
         self.init_task_type_config()
 
+        # 各类型最优候选任务的增量索引（随任务到达、过期和移除维护，由所有调度算法和李雅普诺夫更新共享）
+        self.CandidateIndex = CandidateIndex(self.TaskTypes, Constants.K())
+
+        # 各类型计算复杂度向量（下标为任务类型，索引0不使用），供按类型的向量化计算使用
+        self.TypeCk = np.array([self.TaskTypes[i].Ck if i in self.TaskTypes else 0
+                                for i in range(Constants.K() + 1)], dtype=np.int64)
+
+        # 预计算查找表（由Simulator在仿真开始时构建，未构建时按公式计算）
+        self.LookupTables = None
+
+        # 批量生成任务使用的随机数生成器，种子取自random模块，保证random.seed可复现
+        self.Rng = np.random.default_rng(random.getrandbits(64))
+
     def init_task_type_config(self):
         """初始化任务类型配置（任务类型静态信息）"""
         K = Constants.K()
+        source_types = None
+        if self.ArrivalSource is not None:
+            source_types = self.ArrivalSource.task_types()
+            if len(source_types) != K:
+                raise ValueError(f'到达来源的任务类型数({len(source_types)})与K({K})不一致')
 
         for i in range(1, K + 1):
-            # 生成随机任务类型参数
-            priority = random.randint(Constants.MIN_PRIORITY, Constants.MAX_PRIORITY)
-            ck = random.randint(Constants.MIN_CK, Constants.MAX_CK)
-            meta_k = random.randint(Constants.MIN_METAK, Constants.MAX_METAK)
-            pk = random.random()  # 0~1之间的随机值
-
-            # 创建任务类型对象
-            task_type = TaskType(i, priority, ck, meta_k, pk)
+            if source_types is not None:
+                task_type = source_types[i - 1]
+            else:
+                # 生成随机任务类型参数
+                priority = random.randint(Constants.MIN_PRIORITY, Constants.MAX_PRIORITY)
+                ck = random.randint(Constants.MIN_CK, Constants.MAX_CK)
+                meta_k = random.randint(Constants.MIN_METAK, Constants.MAX_METAK)
+                pk = random.random()  # 0~1之间的随机值
+
+                # 创建任务类型对象
+                task_type = TaskType(i, priority, ck, meta_k, pk)
             self.TaskTypes[i] = task_type
 
             # 初始化积压队列
-            self.BacklogQueue[i] = []
+            self.BacklogQueue[i] = TypeBacklog(i)
             # 打印任务类型静态信息
-            logger.info(f'TaskTypes: 类型{self.TaskTypes[i].Type}, 优先级{self.TaskTypes[i].Priority}, 计算复杂度{self.TaskTypes[i].Ck}, 元数据量大小{self.TaskTypes[i].MetaK}, 产生概率{self.TaskTypes[i].PK}')
+            logger.info('TaskTypes: 类型%s, 优先级%s, 计算复杂度%s, 元数据量大小%s, 产生概率%s',
+                        task_type.Type, task_type.Priority, task_type.Ck, task_type.MetaK, task_type.PK)
 
     def generate_task(self, task_type, current_time_slot):
         """根据任务类型生成具体任务"""
@@ -64,94 +96,126 @@ class TaskManager:
         self.nextTaskID += 1
         return task
 
-    def generate_random_tasks(self, current_time):
+    def set_task_type_pk(self, task_type, pk):
+        """修改任务类型的产生概率，并使缓存的累积分布失效"""
+        self.TaskTypes[task_type].PK = pk
+        self.ArrivalCDF = None
+
+    def get_arrival_cdf(self):
         """
-        按概率生成每时隙的任务
+        获取按任务类型ID (1 to K) 排列的累积分布函数(CDF)
+        结果会被缓存，直到PK发生变化或K改变；所有概率为0时返回None
         """
-        tasks = []
-        num_tasks_to_generate = Constants.N()
         K = Constants.K()
-        
-        # 准备轮盘赌选择
-        # 确保概率是按任务类型ID (1 to K) 顺序排列
-        probabilities = []
-        for i in range(1, K + 1):
-            if i in self.TaskTypes:
-                tt = self.TaskTypes[i]
-                probabilities.append(tt.PK)
-            else:
-                probabilities.append(0)
-        
-        # 创建累积分布函数(CDF)
-        total_prob = sum(probabilities)
-        if total_prob > 0:
-            probabilities = [p / total_prob for p in probabilities]  # 归一化
-        
-        cdf = []
-        cumsum = 0
-        for prob in probabilities:
-            cumsum += prob
-            cdf.append(cumsum)
-        
-        for _ in range(num_tasks_to_generate):
-            # 生成一个 (0, 1] 之间的随机数
-            rand_val = random.random()
-            
-            # 轮盘赌选择, 找到第一个大于等于随机值的CDF索引
-            task_type_id = None
-            for i, cumulative_prob in enumerate(cdf):
-                if rand_val <= cumulative_prob:
-                    task_type_id = i + 1  # 任务类型从1开始
-                    break
-            
-            if task_type_id and task_type_id in self.TaskTypes:
-                selected_task_type = self.TaskTypes[task_type_id]
-                
-                # 随机生成mkr和skr
-                mkr = random.randint(Constants.MIN_MKR, Constants.MAX_MKR)
-                skr = random.randint(Constants.MIN_SKR, Constants.MAX_SKR)
-                
-                # 创建任务实例
-                task = Task(
-                    self.nextTaskID,
-                    task_type_id,  # 直接使用task_type_id
-                    selected_task_type.Priority,
-                    skr,
-                    mkr,
-                    selected_task_type.Ck,
-                    selected_task_type.MetaK,
-                    current_time
-                )
-                
-                tasks.append(task)
-                self.nextTaskID += 1
-        
-        return tasks
+        if self.ArrivalCDF is not None and len(self.ArrivalCDF) == K:
+            return self.ArrivalCDF
+
+        probabilities = np.array([self.TaskTypes[i].PK if i in self.TaskTypes else 0.0
+                                  for i in range(1, K + 1)], dtype=np.float64)
+        total_prob = probabilities.sum()
+        if total_prob <= 0:
+            return None
+
+        cdf = np.cumsum(probabilities / total_prob)
+        cdf[-1] = 1.0  # 消除累加误差，保证每个随机数都能落入某个类型
+        self.ArrivalCDF = cdf
+        return cdf
+
+    def generate_task_batch(self, current_time):
+        """
+        按概率批量生成每时隙的任务，返回TaskBatch
+        任务类型通过在缓存的CDF上二分查找一次性抽取，MKR和SKR整列生成；设置了到达来源时直接取来源中该时隙的任务
+        """
+        if self.ArrivalSource is not None:
+            return self.ArrivalSource.batch(self, current_time)
+        num_tasks_to_generate = Constants.N()
+        cdf = self.get_arrival_cdf()
+        if cdf is None or num_tasks_to_generate <= 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return TaskBatch(empty, empty, empty, empty, current_time)
+
+        # 轮盘赌选择, 找到第一个大于等于随机值的CDF索引（任务类型从1开始）
+        rand_vals = self.Rng.random(num_tasks_to_generate)
+        task_types = np.searchsorted(cdf, rand_vals, side='left').astype(np.int64) + 1
+
+        mkrs = self.Rng.integers(Constants.MIN_MKR, Constants.MAX_MKR + 1, num_tasks_to_generate, dtype=np.int64)
+        skrs = self.Rng.integers(Constants.MIN_SKR, Constants.MAX_SKR + 1, num_tasks_to_generate, dtype=np.int64)
+
+        task_ids = np.arange(self.nextTaskID, self.nextTaskID + num_tasks_to_generate, dtype=np.int64)
+        self.nextTaskID += num_tasks_to_generate
+
+        return TaskBatch(task_ids, task_types, mkrs, skrs, current_time)
+
+    def generate_random_tasks(self, current_time):
+        """
+        按概率生成每时隙的任务，返回Task对象列表
+        """
+        return self.generate_task_batch(current_time).to_tasks(self.TaskTypes)
+
+    def next_arrival_slot(self, current_time_slot):
+        """下一个有任务到达的时隙（没有任务到达时返回None）"""
+        if self.ArrivalSource is not None:
+            return self.ArrivalSource.next_arrival_slot(current_time_slot)
+        if Constants.N() > 0 and self.get_arrival_cdf() is not None:
+            return current_time_slot + 1
+        return None
+
+    def add_batch_to_backlog(self, batch):
+        """将TaskBatch中的任务按类型追加到积压队列（保持到达顺序）"""
+        if len(batch) == 0:
+            return
+        order = np.argsort(batch.TaskType, kind='stable')
+        sorted_types = batch.TaskType[order]
+        task_types, starts = np.unique(sorted_types, return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        for task_type, start, end in zip(task_types.tolist(), starts.tolist(), ends.tolist()):
+            if task_type not in self.BacklogQueue:
+                self.BacklogQueue[task_type] = TypeBacklog(task_type)
+            rows = order[start:end]
+            expire_slots = self._expire_slots(batch.CreateTime[rows], batch.SKR[rows])
+            seqs = self.CandidateIndex.add(task_type, batch.MKR[rows], batch.CreateTime[rows] + batch.SKR[rows])
+            self.BacklogQueue[task_type].extend(batch.ID[rows], batch.MKR[rows], batch.SKR[rows],
+                                                batch.CreateTime[rows], expire_slots, seqs)
+            self._schedule_expiry(task_type, expire_slots)
+
+    def _expire_slots(self, create_times, skrs):
+        """任务被移除的时隙（Age > SKR 的第一个时隙），不早于下一次过期检查"""
+        return np.maximum(create_times + skrs + 1, self.ExpiryWheel.LastSlot + 1)
+
+    def _schedule_expiry(self, task_type, expire_slots):
+        """在时间轮中登记一批同类型任务的过期时隙"""
+        key = (task_type, self.BacklogGeneration.get(task_type, 0))
+        slots, counts = np.unique(expire_slots, return_counts=True)
+        for expire_slot, count in zip(slots.tolist(), counts.tolist()):
+            self.ExpiryWheel.schedule(expire_slot, key, count)
 
     def add_to_backlog(self, task):
         """将任务添加到积压队列"""
         if task.TaskType not in self.BacklogQueue:
-            self.BacklogQueue[task.TaskType] = []
-        self.BacklogQueue[task.TaskType].append(task)
+            self.BacklogQueue[task.TaskType] = TypeBacklog(task.TaskType)
+        expire_at = max(task.CreateTime + task.SKR + 1, self.ExpiryWheel.LastSlot + 1)
+        seqs = self.CandidateIndex.add(task.TaskType, np.array([task.MKR], dtype=np.int64),
+                                       np.array([task.CreateTime + task.SKR], dtype=np.int64))
+        self.BacklogQueue[task.TaskType].append(task.ID, task.MKR, task.SKR, task.CreateTime, expire_at, seqs[0])
+        self.ExpiryWheel.schedule(expire_at, (task.TaskType, self.BacklogGeneration.get(task.TaskType, 0)), 1)
 
     def remove_expired_tasks(self, current_time_slot):
-        """移除过期任务的计数"""
+        """
+        移除过期任务的计数
+        由时间轮取出在本时隙到期的登记，只处理真正过期的任务；返回 {任务类型: 过期数量}（只含有过期的类型）
+        """
+        self.CurrentTimeSlot = current_time_slot
         expired_count = {}
 
-        for task_type in self.BacklogQueue:
-            tasks = self.BacklogQueue[task_type]
-            remaining_tasks = []
-            expired = 0
-
-            for task in tasks:
-                task.Age = current_time_slot - task.CreateTime
-                if task.Age > task.SKR:
-                    expired += 1
-                else:
-                    remaining_tasks.append(task)
+        for bucket in self.ExpiryWheel.advance(current_time_slot):
+            for (task_type, generation), count in bucket.items():
+                if generation == self.BacklogGeneration.get(task_type, 0):
+                    expired_count[task_type] = expired_count.get(task_type, 0) + count
 
-            self.BacklogQueue[task_type] = remaining_tasks
-            expired_count[task_type] = expired
+        for task_type, count in expired_count.items():
+            self.BacklogQueue[task_type].mark_expired(count)
+            self.CandidateIndex.drop_expired_type(task_type, current_time_slot)
 
         return expired_count
 
@@ -162,29 +226,107 @@ class TaskManager:
         else:
             return 0
 
+    def get_backlog_counts(self):
+        """返回长度为K+1的数组，各任务类型积压队列中的任务数量（索引0不使用）"""
+        counts = np.zeros(Constants.K() + 1, dtype=np.int64)
+        for task_type, backlog in self.BacklogQueue.items():
+            counts[task_type] = len(backlog)
+        return counts
+
+    def _purged_backlog(self, task_type):
+        """返回已物理删除过期行的积压队列"""
+        backlog = self.BacklogQueue[task_type]
+        backlog.purge(self.ExpiryWheel.LastSlot)
+        return backlog
+
     def remove_tasks_from_backlog(self, task_type, count):
         """从积压队列中移除指定类型的任务"""
         if count <= 0:
             return
 
         if task_type in self.BacklogQueue:
-            tasks = self.BacklogQueue[task_type]
-            if count >= len(tasks):
-                self.BacklogQueue[task_type] = []
+            backlog = self._purged_backlog(task_type)
+            if count >= len(backlog):
+                # 整体清空：代数加一，使时间轮中的旧登记失效
+                backlog.clear()
+                self.BacklogGeneration[task_type] = self.BacklogGeneration.get(task_type, 0) + 1
+                self.CandidateIndex.clear_type(task_type)
             else:
-                self.BacklogQueue[task_type] = tasks[count:]
+                key = (task_type, self.BacklogGeneration.get(task_type, 0))
+                slots, counts = np.unique(backlog.ExpireAt[:count], return_counts=True)
+                for expire_slot, removed in zip(slots.tolist(), counts.tolist()):
+                    self.ExpiryWheel.unschedule(expire_slot, key, removed)
+                removed_mkrs = backlog.MKR[:count].copy()
+                removed_deadlines = backlog.CreateTime[:count] + backlog.SKR[:count]
+                backlog.pop_front(count)
+                self.CandidateIndex.remove_front(task_type, removed_mkrs, removed_deadlines, backlog)
+
+    def _make_task(self, task_type, backlog, idx):
+        """由积压队列的第idx行构造Task对象"""
+        tt = self.TaskTypes[task_type]
+        task = Task(int(backlog.ID[idx]), task_type, tt.Priority, int(backlog.SKR[idx]),
+                    int(backlog.MKR[idx]), tt.Ck, tt.MetaK, int(backlog.CreateTime[idx]))
+        task.Age = self.CurrentTimeSlot - task.CreateTime
+        return task
 
     def get_backlog_tasks(self, task_type):
         """获取指定类型积压队列中的所有任务"""
         if task_type in self.BacklogQueue:
-            return self.BacklogQueue[task_type].copy()
+            backlog = self._purged_backlog(task_type)
+            return [self._make_task(task_type, backlog, i) for i in range(len(backlog))]
         else:
             return []
+
+    def get_best_candidate(self, task_type):
+        """
+        通过增量索引获取指定类型中所需计算频率最小的任务
+        返回 (MKR, 所需计算频率)，没有可行任务时返回 (None, inf)
+        """
+        index = self.CandidateIndex
+        if index.covers(task_type) and index.Exact[task_type]:
+            best_mkr, best_freq = index.best(self.CurrentTimeSlot)
+            if best_freq[task_type] == float('inf'):
+                return None, float('inf')
+            return int(best_mkr[task_type]), float(best_freq[task_type])
+
+        best_task, required_freq = self.find_best_backlog_task(task_type)
+        if best_task is None:
+            return None, float('inf')
+        return best_task.MKR, required_freq
+
+    def get_best_candidates(self):
+        """
+        获取所有类型中所需计算频率最小的任务
+        返回 (MKR向量, 所需计算频率向量)，下标为任务类型，没有可行任务的类型频率为inf
+        """
+        index = self.CandidateIndex
+        best_mkr, best_freq = index.best(self.CurrentTimeSlot)
+        best_mkr, best_freq = best_mkr.copy(), best_freq.copy()
+        # 索引不可用的类型逐个回退为扫描
+        for task_type in np.flatnonzero(~index.Exact[1:]) + 1:
+            mkr, required_freq = self.get_best_candidate(int(task_type))
+            if mkr is not None:
+                best_mkr[task_type] = mkr
+                best_freq[task_type] = required_freq
+        return best_mkr, best_freq
+
+    def find_best_backlog_task(self, task_type):
+        """
+        选择指定类型积压队列中所需计算频率最小的任务
+        返回 (任务, 所需计算频率)，没有可行任务时返回 (None, inf)
+        """
+        if task_type not in self.BacklogQueue or task_type not in self.TaskTypes:
+            return None, float('inf')
+        backlog = self._purged_backlog(task_type)
+        idx, required_freq = backlog.best_index(self.CurrentTimeSlot, self.TaskTypes[task_type].Ck)
+        if idx < 0:
+            return None, float('inf')
+        return self._make_task(task_type, backlog, idx), required_freq
         
     def peek_task_from_backlog(self, task_type):
         """查看但不移除指定类型积压队列中的第一个任务"""
         if task_type in self.BacklogQueue and len(self.BacklogQueue[task_type]) > 0:
-            return self.BacklogQueue[task_type][0]
+            return self._make_task(task_type, self._purged_backlog(task_type), 0)
         else:
             return None
         
@@ -8,6 +8,21 @@ from .mec import MEC
 from .lyapunov_classes import LyapunovManager
 from .scheduler import Scheduler
 from .simulator import Simulator
+from .lookup_tables import LookupTables
+from .knapsack import solve_knapsack, solve_knapsack_fptas, IncrementalKnapsack
+from .cache_policies import CachePolicy, CACHE_POLICIES, register_cache_policy, LRUPolicy, ARCPolicy, TinyLFUAdmission, GDSFPolicy
+from .cache_classes import FrequencySketch, AccessHistory
+from .benchmark_cache_policies import record_access_stream, replay_access_stream, stream_from_arrival_trace, stream_from_trace
+from .popularity import PopularityEstimator
+from .logger import Logger
+from .trace_recorder import TraceRecorder, load_trace
+from .arrival_source import ArrivalTrace
+from .task_classes import Task
+import os
+import random
+import tempfile
+from itertools import combinations
+import numpy as np
 
 
 def test_mec_system():
@@ -27,6 +42,30 @@ def test_mec_system():
     print('3. 测试不同缓存策略...')
     test_cache_strategies()
     
+    # 测试4: 列式积压队列测试
+    print('4. 测试列式积压队列...')
+    test_backlog_store()
+    
+    # 测试5: 批量任务生成测试
+    print('5. 测试批量任务生成...')
+    test_task_batch_generation()
+    
+    # 测试6: 事件驱动仿真测试
+    print('6. 测试事件驱动仿真模式...')
+    test_event_driven_simulation()
+    
+    # 测试7: 匹配算法测试
+    print('7. 测试任务-节点匹配算法...')
+    test_matching_modes()
+    
+    # 测试8: 背包求解器测试
+    print('8. 测试01背包求解器...')
+    test_knapsack_solver()
+    
+    # 测试9: 可插拔缓存策略测试
+    print('9. 测试可插拔缓存策略...')
+    test_cache_policies()
+    
     print('\n=== 所有测试完成 ===')
 
 
@@ -55,6 +94,53 @@ def test_basic_components():
         mec = MEC()
         assert len(mec.VirtualNodes) == Constants.V, '虚拟节点数量错误'
         assert len(mec.Cache) == 0, '缓存应为空'
+        assert mec.schedule_task(3, 1, Constants.MIN_MKR, Constants.MIN_CK), '调度到空闲节点失败'
+        assert mec.is_task_type_computing(3) and not mec.is_task_type_computing(4), '计算状态错误'
+        while not mec.update_nodes():
+            pass
+        assert not mec.get_computing_mask().any(), '计算完成后类型应不在计算中'
+        print('通过')
+
+        # 测试缓存替换策略选择的替换对象
+        print('  - 测试缓存替换顺序... ', end='')
+        original_size = Constants.total_cache_size()
+        try:
+            Constants.total_cache_size(sum(tm.TaskTypes[t].MetaK for t in (1, 2, 3)))
+            tm.TaskTypes[4].MetaK = Constants.MIN_METAK
+            for task_type, priority in ((1, 3), (2, 1), (3, 2), (4, 5)):
+                tm.TaskTypes[task_type].Priority = priority
+            expected_victims = {Constants.FIFO: 1, Constants.LFU: 2, Constants.LRU: 3, Constants.Priority: 2}
+            for strategy, victim in expected_victims.items():
+                cache_mec = MEC()
+                cache_mec.set_cache_strategy(strategy)
+                for task_type in (1, 2, 3):
+                    cache_mec.add_to_cache(task_type, tm.TaskTypes[task_type].MetaK, tm)
+                cache_mec.update_time_slot(5)
+                for task_type in (1, 1, 3):
+                    cache_mec.is_cache_hit(task_type)
+                for task_type in (1, 2):
+                    cache_mec.record_task_access(task_type)
+                assert cache_mec.add_to_cache(4, tm.TaskTypes[4].MetaK, tm), '新任务应被加入缓存'
+                assert sorted(cache_mec.Cache) == sorted({1, 2, 3, 4} - {victim}), f'策略{strategy}的替换对象错误'
+                assert cache_mec.UsedCacheSize == sum(entry.MetaSize for entry in cache_mec.Cache.values()), '缓存占用统计错误'
+            tm.TaskTypes[5].Priority = 1
+            tm.TaskTypes[5].MetaK = Constants.MAX_METAK
+            assert not cache_mec.add_to_cache(5, tm.TaskTypes[5].MetaK, tm), '优先级不高于缓存项时不应替换'
+        finally:
+            Constants.total_cache_size(original_size)
+        print('通过')
+
+        # 测试查找表与公式计算一致
+        print('  - 测试预计算查找表... ', end='')
+        tables = LookupTables(tm.TaskTypes, mec.VirtualNodes.ComputeFrequency)
+        for task_type in (1, Constants.K()):
+            ck = tm.TaskTypes[task_type].Ck
+            for mkr in (Constants.MIN_MKR, Constants.MAX_MKR):
+                assert tables.wkr(task_type, mkr) == TaskManager.calculate_wkr(mkr, ck), 'wkr查表错误'
+                for node in mec.VirtualNodes:
+                    freq = node.ComputeFrequency
+                    assert tables.slots(task_type, mkr, node.Index) == TaskManager.calculate_scheduling_slots(mkr, ck, freq), '占用时隙数查表错误'
+                    assert tables.Bkr[task_type, mkr - Constants.MIN_MKR, node.Index] == TaskManager.calculate_bkr(mkr, ck, freq, False), 'bkr查表错误'
         print('通过')
         
         # 测试李雅普诺夫管理器
@@ -62,12 +148,50 @@ def test_basic_components():
         lm = LyapunovManager()
         assert len(lm.Queues) == Constants.K(), '队列数量错误'
         assert lm.get_queue_length(1) == 0, '初始队列长度应为0'
+        # 向量化更新应与逐类型更新一致
+        tm.add_batch_to_backlog(tm.generate_task_batch(0))
+        tm.remove_expired_tasks(1)
+        K = Constants.K()
+        bk = np.arange(K + 1, dtype=np.int64) % 3
+        ak = np.arange(K + 1, dtype=np.int64) % 5
+        dropped = np.arange(K + 1, dtype=np.int64) % 2
+        mkrs = np.where(np.arange(K + 1) % 4 == 0, Constants.MAX_MKR, 0)
+        per_type = LyapunovManager()
+        for _ in range(2):
+            lm.update_queues(bk, dropped, ak, tm, mkrs, 1)
+            for i in range(1, K + 1):
+                per_type.update_queue(i, bk[i], dropped[i], ak[i], tm, int(mkrs[i]) or None, 1)
+        assert lm.get_all_queue_lengths() == per_type.get_all_queue_lengths(), '向量化队列更新结果不一致'
+        assert lm.calculate_drift() == per_type.calculate_drift(), '李雅普诺夫漂移不一致'
         print('通过')
         
         # 测试调度器
         print('  - 测试调度器... ', end='')
         scheduler = Scheduler(Constants.GreedySchedule, Constants.VV_DEFAULT)
         assert scheduler.Algorithm == Constants.GreedySchedule, '调度算法错误'
+        weights = np.array([[2.0, np.inf, 1.0], [1.0, 1.0, -np.inf]])
+        pairs = sorted((weights[i, j], i, j) for i in range(2) for j in range(3) if np.isfinite(weights[i, j]))
+        assert Scheduler._sorted_pairs(weights, False) == [(i, j) for _, i, j in pairs], '权重对升序排序错误'
+        assert Scheduler._sorted_pairs(weights, True) == [(i, j) for _, i, j in reversed(pairs)], '权重对降序排序错误'
+        print('通过')
+        
+        # 测试日志
+        print('  - 测试日志... ', end='')
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = os.path.join(tmp, 'log.txt')
+            log = Logger(log_file, enable_log=False)
+            calls = []
+            log.info(lambda: calls.append(1) or '禁用')
+            assert not calls, '日志禁用时不应构造消息'
+            log.set_enable_log(True)
+            log.set_level(Logger.WARNING, 'scheduler')
+            log.get_child('scheduler').info('跳过 %s', 1)
+            log.get_child('scheduler').warning('模块 %s', 2)
+            log.get_child('mec').debug(lambda: '延迟')
+            log.flush()
+            with open(log_file, encoding='utf-8') as f:
+                lines = [line.split('] ', 2)[2] for line in f.read().splitlines()]
+            assert lines == ['模块 2', '延迟'], '日志级别过滤或格式化错误'
         print('通过')
         
     except Exception as e:
@@ -94,6 +218,33 @@ def test_simple_simulation():
         print(f'  - 简单仿真测试完成，生成任务数: {stats.TotalTasksGenerated}，'
               f'完成任务数: {stats.TotalTasksCompleted}')
         
+        print('  - 事件轨迹记录... ', end='')
+        with tempfile.TemporaryDirectory() as tmp:
+            sim = Simulator(50)
+            sim.set_trace(tmp, buffer_records=64, chunk_records=500)  # 小缓冲区和分块，覆盖多次写入和换文件
+            sim.run_simulation()
+            assert sim.Trace.File is None, '仿真结束后应关闭分块文件'
+            chunks = load_trace(tmp)
+            events = np.concatenate(chunks)
+            assert len(chunks) > 1 and len(events) == sum(len(chunk) for chunk in chunks), '轨迹分块错误'
+            stats = sim.get_statistics()
+            for event, expected in ((TraceRecorder.ARRIVAL, stats.TotalTasksGenerated),
+                                    (TraceRecorder.EXPIRY, stats.TotalTasksDropped),
+                                    (TraceRecorder.CACHE_HIT, stats.CacheHitCount)):
+                assert events['count'][events['event'] == event].sum() == expected, '轨迹事件数量与统计不一致'
+            assert np.all(np.diff(events['slot']) >= 0), '轨迹记录应按时隙排序'
+            del chunks, events
+            
+            # 复用同一目录记录较短的轨迹，不应读到上一次留下的分块
+            recorder = TraceRecorder(tmp, buffer_records=4, chunk_records=5)
+            for time_slot in range(3):
+                recorder.record(time_slot, TraceRecorder.ARRIVAL, 1, count=time_slot + 100)
+            recorder.close()
+            chunks = load_trace(tmp)
+            assert len(chunks) == 1 and chunks[0]['count'].tolist() == [100, 101, 102], '复用目录时应清除旧的分块文件'
+            del chunks
+        print('通过')
+        
     except Exception as e:
         print(f'失败: {e}')
         raise e
@@ -155,6 +306,464 @@ def test_cache_strategies():
           f'(收益: {results[best_idx]["revenue"]:.2f})')
 
 
+def test_backlog_store():
+    """测试列式积压队列的过期、选择和移除"""
+    
+    print('  - 测试积压队列... ', end='')
+    tm = TaskManager()
+    tt = tm.TaskTypes[1]
+    # (ID, SKR, MKR, CreateTime)
+    specs = [(101, 6, 10, 0), (102, 10, 8, 2), (103, 6, 4, 3), (104, 9, 4, 5)]
+    for task_id, skr, mkr, create_time in specs:
+        tm.add_to_backlog(Task(task_id, 1, tt.Priority, skr, mkr, tt.Ck, tt.MetaK, create_time))
+    assert tm.get_backlog_count(1) == 4, '积压数量错误'
+    
+    # 时隙7：任务101的年龄为7 > SKR=6，应过期
+    expired = tm.remove_expired_tasks(7)
+    assert expired[1] == 1, '过期数量错误'
+    assert [task.ID for task in tm.get_backlog_tasks(1)] == [102, 103, 104], '剩余任务错误'
+    assert tm.get_backlog_tasks(1)[0].Age == 5, '任务年龄错误'
+    
+    # 剩余时隙分别为 5、2、7，所需频率最小的是 MKR=4 且剩余7个时隙的任务104
+    best_task, required_freq = tm.find_best_backlog_task(1)
+    assert best_task.ID == 104, '最优任务选择错误'
+    assert abs(required_freq - tt.Ck * 4 / 7 / 1e6) < 1e-15, '所需频率计算错误'
+    assert tm.get_best_candidate(1) == (4, required_freq), '增量索引与扫描结果不一致'
+    
+    # 同频率时选择先到达的任务：MKR=8且剩余14个时隙与任务104所需频率相同
+    tm.add_to_backlog(Task(105, 1, tt.Priority, 10, 8, tt.Ck, tt.MetaK, 11))
+    assert tm.find_best_backlog_task(1)[0].ID == 104, '同频率应选择先到达的任务'
+    assert tm.get_best_candidate(1) == (4, required_freq), '增量索引同频率选择错误'
+    
+    tm.remove_tasks_from_backlog(1, 2)
+    assert tm.peek_task_from_backlog(1).ID == 104, '移除顺序错误'
+    assert tm.get_best_candidate(1)[0] == 4, '部分移除后索引重建错误'
+    tm.remove_tasks_from_backlog(1, 5)
+    assert tm.get_backlog_count(1) == 0, '积压队列应为空'
+    assert tm.find_best_backlog_task(1) == (None, float('inf')), '空队列不应有可选任务'
+    assert tm.get_best_candidate(1) == (None, float('inf')), '空队列索引应为空'
+    
+    # 时间轮：被移除的任务到期时不应再计入过期数量
+    for task_id, create_time in [(201, 8), (202, 8), (203, 9)]:
+        tm.add_to_backlog(Task(task_id, 2, tt.Priority, 6, 5, tt.Ck, tt.MetaK, create_time))
+    tm.remove_tasks_from_backlog(2, 1)
+    assert tm.remove_expired_tasks(14).get(2, 0) == 0, '未到期的任务不应过期'
+    assert tm.remove_expired_tasks(15) == {2: 1}, '部分移除后过期数量错误'
+    assert [task.ID for task in tm.get_backlog_tasks(2)] == [203], '过期任务未被删除'
+    tm.remove_tasks_from_backlog(2, 1)
+    assert tm.remove_expired_tasks(30) == {}, '清空后的旧登记不应计入过期数量'
+    print('通过')
+    
+    print('  - 部分移除后的增量索引... ', end='')
+    rng = np.random.default_rng(4)
+    tm = TaskManager()
+    for t in range(60):
+        tm.remove_expired_tasks(t)
+        tm.add_batch_to_backlog(tm.generate_task_batch(t))
+        for task_type in rng.choice(np.arange(1, Constants.K() + 1), 5, replace=False).tolist():
+            count = tm.get_backlog_count(task_type)
+            if count > 1:
+                tm.remove_tasks_from_backlog(task_type, int(rng.integers(1, count)))  # 只移除队首的一部分
+        for task_type in range(1, Constants.K() + 1):
+            best_task, required_freq = tm.find_best_backlog_task(task_type)
+            expected = (None, float('inf')) if best_task is None else (best_task.MKR, required_freq)
+            assert tm.get_best_candidate(task_type) == expected, '部分移除后增量索引与扫描结果不一致'
+    print('通过')
+
+
+def test_task_batch_generation():
+    """测试批量任务生成的可复现性和积压队列写入"""
+    
+    print('  - 测试批量生成... ', end='')
+    random.seed(2024)
+    tm = TaskManager()
+    batch = tm.generate_task_batch(3)
+    random.seed(2024)
+    batch_again = TaskManager().generate_task_batch(3)
+    
+    assert len(batch) == Constants.N(), '生成任务数量错误'
+    assert (batch.TaskType == batch_again.TaskType).all(), 'random.seed下应可复现'
+    assert batch.TaskType.min() >= 1 and batch.TaskType.max() <= Constants.K(), '任务类型越界'
+    assert batch.MKR.min() >= Constants.MIN_MKR and batch.MKR.max() <= Constants.MAX_MKR, 'MKR越界'
+    assert list(batch.ID) == list(range(1, Constants.N() + 1)), '任务ID应连续'
+    
+    tm.add_batch_to_backlog(batch)
+    counts = batch.type_counts(Constants.K())
+    for task_type in range(1, Constants.K() + 1):
+        assert tm.get_backlog_count(task_type) == counts[task_type], '积压数量与到达数量不一致'
+    
+    # 只有一个类型概率非零时，所有任务都属于该类型
+    for task_type in tm.TaskTypes:
+        tm.set_task_type_pk(task_type, 1.0 if task_type == 5 else 0.0)
+    assert (tm.generate_task_batch(4).TaskType == 5).all(), 'PK修改后CDF未更新'
+    print('通过')
+
+
+def _stats_snapshot(sim):
+    """提取用于比较的统计结果"""
+    stats = sim.get_statistics()
+    snapshot = {key: value for key, value in vars(stats).items() if key != 'TaskTypeStats'}
+    snapshot['TaskTypeStats'] = {k: vars(v) for k, v in stats.TaskTypeStats.items()}
+    snapshot['QueueLengths'] = sim.LyapunovManager.get_all_queue_lengths()
+    snapshot['Cache'] = sorted(sim.MEC.Cache)
+    return snapshot
+
+
+def _run_with_engine(engine_mode, seed, time_slots, preload_tasks=0, arrival_source=None):
+    """以指定推进模式运行一次静默仿真"""
+    import builtins
+    random.seed(seed)
+    sim = Simulator(time_slots, arrival_source)
+    sim.set_schedule_strategy(Constants.LyapunovSchedule)
+    sim.set_cache_strategy(Constants.Knapsack)
+    sim.set_engine_mode(engine_mode)
+    for _ in range(preload_tasks):
+        task_type = random.randint(1, Constants.K())
+        sim.TaskManager.add_to_backlog(sim.TaskManager.generate_task(task_type, 0))
+    original_print = builtins.print
+    builtins.print = lambda *args, **kwargs: None
+    try:
+        sim.run_simulation()
+    finally:
+        builtins.print = original_print
+    return sim
+
+
+def test_event_driven_simulation():
+    """测试事件驱动模式与逐时隙推进的统计结果一致"""
+    
+    original_n = Constants.N()
+    try:
+        print('  - 每时隙均有任务到达... ', end='')
+        slot_sim = _run_with_engine(Constants.SlotStepping, 11, 60)
+        event_sim = _run_with_engine(Constants.EventDriven, 11, 60)
+        assert _stats_snapshot(slot_sim) == _stats_snapshot(event_sim), '统计结果不一致'
+        print('通过')
+        
+        print('  - 无新任务到达的长时隙仿真... ', end='')
+        Constants.N(0)
+        slot_sim = _run_with_engine(Constants.SlotStepping, 12, 400, preload_tasks=60)
+        event_sim = _run_with_engine(Constants.EventDriven, 12, 400, preload_tasks=60)
+        assert _stats_snapshot(slot_sim) == _stats_snapshot(event_sim), '统计结果不一致'
+        assert event_sim.ProcessedTimeSlots < slot_sim.ProcessedTimeSlots, '事件驱动模式应跳过空闲时隙'
+        print(f'通过 (完整执行 {event_sim.ProcessedTimeSlots}/{slot_sim.ProcessedTimeSlots} 个时隙)')
+        Constants.N(original_n)
+        
+        print('  - 回放预先生成的到达序列... ', end='')
+        live_sim = _run_with_engine(Constants.SlotStepping, 13, 60)
+        random.seed(13)
+        trace = ArrivalTrace.record(Simulator(60).TaskManager, 60)  # 与live_sim相同的任务类型表和到达过程
+        for engine_mode in (Constants.SlotStepping, Constants.EventDriven):
+            replay_sim = _run_with_engine(engine_mode, 13, 60, arrival_source=trace)
+            assert _stats_snapshot(replay_sim) == _stats_snapshot(live_sim), '回放到达序列的结果应与随机生成一致'
+        assert len(trace.batch(replay_sim.TaskManager, 60)) == 0 and trace.next_arrival_slot(59) is None, '序列之外不应有任务到达'
+        state = random.getstate()
+        assert np.array_equal(ArrivalTrace.generate(20, 7).TaskType, ArrivalTrace.generate(20, 7).TaskType), '相同种子应生成相同序列'
+        assert random.getstate() == state, '生成到达序列不应改变random模块的状态'
+        print('通过')
+    finally:
+        Constants.N(original_n)
+
+
+def test_matching_modes():
+    """测试匈牙利匹配模式"""
+    
+    print('  - 匈牙利算法优于贪心匹配... ', end='')
+    rng = np.random.default_rng(5)
+    greedy = Scheduler(Constants.LyapunovSchedule, Constants.VV_DEFAULT, Constants.GreedyMatching)
+    hungarian = Scheduler(Constants.LyapunovSchedule, Constants.VV_DEFAULT, Constants.HungarianMatching)
+    for shape in [(6, 4), (4, 6), (8, 8)]:
+        weights = rng.normal(size=shape)
+        weights[rng.random(shape) < 0.3] = np.inf
+        greedy_pairs = greedy.match_pairs(weights, maximize=False)
+        optimal_pairs = hungarian.match_pairs(weights, maximize=False)
+        assert len(optimal_pairs) >= len(greedy_pairs), '匈牙利算法的匹配数不应更少'
+        if len(optimal_pairs) == len(greedy_pairs):
+            assert sum(weights[p] for p in optimal_pairs) <= sum(weights[p] for p in greedy_pairs) + 1e-12, '匈牙利算法的总权重不应更差'
+        assert all(np.isfinite(weights[p]) for p in optimal_pairs), '不应匹配不可行组合'
+        assert len({i for i, _ in optimal_pairs}) == len({j for _, j in optimal_pairs}) == len(optimal_pairs), '匹配不唯一'
+    print('通过')
+    
+    print('  - 匈牙利匹配模式仿真... ', end='')
+    sim = Simulator(30)
+    sim.set_matching_mode(Constants.HungarianMatching)
+    sim.set_schedule_strategy(Constants.ShortTermSchedule)
+    assert sim.Scheduler.MatchingMode == Constants.HungarianMatching, '切换调度策略后匹配模式丢失'
+    sim.run_simulation()
+    assert sim.get_statistics().TotalTasksCompleted > 0, '应该完成了任务'
+    print('通过')
+
+
+def test_knapsack_solver():
+    """测试01背包求解器"""
+    
+    print('  - 与穷举结果比较... ', end='')
+    rng = random.Random(3)
+    for _ in range(30):
+        n = rng.randint(1, 8)
+        values = [rng.random() for _ in range(n)]
+        weights = [rng.randint(1, 60) for _ in range(n)]
+        capacity = rng.randint(0, 200)
+        best = max((sum(values[i] for i in subset), subset)
+                   for r in range(n + 1) for subset in combinations(range(n), r)
+                   if sum(weights[i] for i in subset) <= capacity)
+        selected = solve_knapsack(values, weights, capacity)
+        assert abs(sum(values[i] for i in selected) - best[0]) < 1e-12, '背包求解结果不是最优'
+        assert sum(weights[i] for i in selected) <= capacity, '超出背包容量'
+    # 价值相同时保留先加入的物品，只有严格更优才选择后面的物品
+    assert solve_knapsack([1.0, 1.0], [5, 5], 5) == [0], '同价值时应选择先加入的物品'
+    assert solve_knapsack([1.0, 2.0], [5, 6], 4) == [], '容量不足时不应选择物品'
+    print('通过')
+    
+    print('  - 增量求解与差异更新... ', end='')
+    solver = IncrementalKnapsack()
+    values, weights = [0.5, 0.2, 0.9], [40, 30, 50]
+    for new_value in (0.1, 0.3, 2.0):
+        expected = solve_knapsack(values + [new_value], weights + [45], 130)
+        assert solver.solve_with_item([1, 2, 3], values, weights, 130, new_value, 45) == expected, '增量求解结果不一致'
+    assert solver.SolveCount == 1 and solver.ReuseCount == 2, '前缀结果未被复用'
+    # 新物品价值低于需要移出重量的最小价值密度下界时不会被选中
+    assert solver.cannot_improve(values, weights, 130, 0.1, 45), '应判定新物品不会被选中'
+    assert not solver.cannot_improve(values, weights, 130, 2.0, 45), '不应跳过价值足够高的新物品'
+    
+    tm = TaskManager()
+    mec = MEC()
+    mec.set_cache_strategy(Constants.Knapsack)
+    original_size = Constants.total_cache_size()
+    try:
+        Constants.total_cache_size(sum(tm.TaskTypes[t].MetaK for t in (1, 2, 3)))
+        for task_type in (1, 2, 3, 4):
+            mec.AccessFrequency[task_type] = 0.25
+        for task_type in (1, 2, 3):
+            assert mec.add_to_cache(task_type, tm.TaskTypes[task_type].MetaK, tm), '缓存空间足够时应直接加入'
+        mec.Cache[1].HitCount = 7
+        mec.AccessFrequency[1] = 10.0
+        mec.AccessFrequency[4] = 100.0
+        tm.TaskTypes[4].MetaK = Constants.MIN_METAK
+        assert mec.add_to_cache(4, tm.TaskTypes[4].MetaK, tm), '高价值任务应被加入缓存'
+        assert 4 in mec.Cache and len(mec.Cache) == 3, '缓存替换结果错误'
+        assert mec.UsedCacheSize == sum(entry.MetaSize for entry in mec.Cache.values()), '缓存占用统计错误'
+        assert mec.Cache[1].HitCount == 7, '保留的缓存项统计信息不应被重置'
+    finally:
+        Constants.total_cache_size(original_size)
+    print('通过')
+    
+    print('  - 近似求解（FPTAS）... ', end='')
+    for _ in range(30):
+        n = rng.randint(1, 15)
+        values = [rng.random() for _ in range(n)]
+        weights = [rng.randint(1, 60) for _ in range(n)]
+        capacity = rng.randint(0, 300)
+        exact = sum(values[i] for i in solve_knapsack(values, weights, capacity))
+        selected = solve_knapsack_fptas(values, weights, capacity, 0.2)
+        assert sum(weights[i] for i in selected) <= capacity, '近似解超出背包容量'
+        assert sum(values[i] for i in selected) >= 0.8 * exact - 1e-12, '近似解不满足(1-epsilon)保证'
+    # 大容量下代价与容量无关
+    assert len(solve_knapsack_fptas([1.0, 2.0, 3.0], [10**8, 2 * 10**8, 3 * 10**8], 4 * 10**8, 0.1)) == 2, '大容量近似求解错误'
+    sim = Simulator(20)
+    sim.set_cache_strategy(Constants.Knapsack)
+    sim.set_knapsack_mode(Constants.ApproxKnapsack, 0.2)
+    sim.run_simulation()
+    assert sim.MEC.UsedCacheSize <= Constants.total_cache_size(), '近似模式缓存超出容量'
+    print('通过')
+
+
+class RejectAllPolicy(CachePolicy):
+    """测试用缓存策略：缓存空间不足时拒绝所有新任务"""
+
+    def admit(self, cache, task_type, meta_size, task_manager):
+        return False
+
+
+def test_cache_policies():
+    """测试缓存策略注册表和访问序列回放"""
+    
+    print('  - 注册自定义策略... ', end='')
+    tm = TaskManager()
+    original_size = Constants.total_cache_size()
+    try:
+        register_cache_policy(99, RejectAllPolicy)
+        Constants.total_cache_size(tm.TaskTypes[1].MetaK)
+        mec = MEC()
+        mec.set_cache_strategy(99)
+        assert isinstance(mec.CachePolicy, RejectAllPolicy), '注册的策略未被使用'
+        assert mec.add_to_cache(1, tm.TaskTypes[1].MetaK, tm), '空间足够时应直接加入缓存'
+        assert not mec.add_to_cache(2, tm.TaskTypes[2].MetaK, tm), '策略拒绝时不应替换'
+        assert list(mec.Cache) == [1], '缓存内容错误'
+        # 切换策略时现有缓存项登记到新策略
+        mec.set_cache_strategy(Constants.LRU, tm)
+        assert isinstance(mec.CachePolicy, LRUPolicy) and 1 in mec.CachePolicy.Heap, '现有缓存项未登记到新策略'
+        assert mec.add_to_cache(2, tm.TaskTypes[1].MetaK, tm) and list(mec.Cache) == [2], 'LRU替换失败'
+    finally:
+        CACHE_POLICIES.pop(99, None)
+        Constants.total_cache_size(original_size)
+    print('通过')
+    
+    print('  - 缓存成员探测... ', end='')
+    original_size = Constants.total_cache_size()
+    try:
+        size = Constants.MIN_METAK
+        Constants.total_cache_size(2 * size)
+        mec = MEC()
+        mec.set_cache_strategy(Constants.LFU, tm)
+        for task_type in (1, 2, 3):
+            mec.add_to_cache(task_type, size, tm)
+        assert mec.get_cached_mask().nonzero()[0].tolist() == sorted(mec.Cache), '缓存掩码应与缓存同步'
+        task_type = next(iter(mec.Cache))
+        assert mec.is_cached(task_type) and mec.Cache[task_type].HitCount == 0, '成员探测不应记录命中'
+        tm.add_to_backlog(tm.generate_task(task_type, 0))
+        Scheduler(Constants.GreedySchedule, Constants.VV_DEFAULT).get_candidate_tasks(mec, tm)
+        assert mec.Cache[task_type].HitCount == 0, '筛选候选任务不应记录命中'
+        tm.remove_tasks_from_backlog(task_type, tm.get_backlog_count(task_type))
+        mec.set_cache_enabled(False)
+        assert not mec.get_cached_mask().any() and not mec.is_cached(task_type), '缓存禁用时不应命中'
+    finally:
+        Constants.total_cache_size(original_size)
+    print('通过')
+    
+    print('  - ARC策略... ', end='')
+    original_size = Constants.total_cache_size()
+    try:
+        size = Constants.MIN_METAK
+        Constants.total_cache_size(3 * size)
+        mec = MEC()
+        mec.set_cache_strategy(Constants.ARC, tm)
+        for task_type in (1, 2, 3):
+            mec.add_to_cache(task_type, size, tm)
+        assert mec.is_cache_hit(1), '类型1应命中'
+        # T1超过目标大小，移出T1中最久未用的类型2
+        assert mec.add_to_cache(4, size, tm) and 2 not in mec.Cache, 'ARC应移出T1中最久未用的缓存项'
+        arc = mec.CachePolicy
+        assert isinstance(arc, ARCPolicy) and 2 in arc.B1 and 1 in arc.T2, 'ARC列表状态错误'
+        # 再次访问幽灵列表B1中的类型时增大T1的目标大小，重新加入后进入T2
+        mec.record_task_access(2)
+        assert arc.Target == size, 'ARC目标大小调整错误'
+        assert mec.add_to_cache(2, size, tm) and sorted(mec.Cache) == [1, 2, 4], 'ARC替换结果错误'
+        assert 2 in arc.T2 and 3 in arc.B1, 'ARC列表状态错误'
+        assert arc.T1.Size + arc.T2.Size == mec.UsedCacheSize, 'ARC列表大小与缓存占用不一致'
+    finally:
+        Constants.total_cache_size(original_size)
+    print('通过')
+    
+    print('  - GDSF策略... ', end='')
+    original_size = Constants.total_cache_size()
+    try:
+        Constants.total_cache_size(3 * Constants.MAX_METAK)
+        for task_type, priority in ((1, 2), (2, 4), (3, 4)):
+            tm.TaskTypes[task_type].Priority = priority
+        mec = MEC()
+        mec.set_cache_strategy(Constants.GDSF, tm)
+        mec.add_to_cache(1, Constants.MAX_METAK, tm)   # H = 2/100
+        mec.add_to_cache(2, Constants.MAX_METAK, tm)   # H = 4/100
+        mec.add_to_cache(3, Constants.MAX_METAK, tm)   # H = 4/100，命中两次后 H = 12/100
+        mec.is_cache_hit(3)
+        mec.is_cache_hit(3)
+        gdsf = mec.CachePolicy
+        assert isinstance(gdsf, GDSFPolicy) and abs(gdsf.Heap.key(3) - 0.12) < 1e-12, 'GDSF命中后的H值错误'
+        # 单位元数据量价值最低的类型1先被移出，时钟增大到其H值
+        assert mec.add_to_cache(4, Constants.MIN_METAK, tm) and 1 not in mec.Cache, 'GDSF应移出单位价值最低的缓存项'
+        assert gdsf.Clock == 0.02, 'GDSF膨胀时钟错误'
+        assert abs(gdsf.Heap.key(4) - (0.02 + tm.TaskTypes[4].Priority / Constants.MIN_METAK)) < 1e-12, '新缓存项的H值应包含时钟'
+        # 准入过滤拒绝替换时没有缓存项被移出，时钟不应增大
+        Constants.total_cache_size(Constants.MAX_METAK)
+        mec = MEC()
+        mec.set_admission_filter(True)
+        mec.set_cache_strategy(Constants.GDSF, tm)
+        mec.add_to_cache(1, Constants.MAX_METAK, tm)
+        assert not mec.add_to_cache(2, Constants.MAX_METAK, tm) and sorted(mec.Cache) == [1], '准入过滤应拒绝替换'
+        assert mec.CachePolicy.RejectCount == 1 and mec.CachePolicy.Policy.Clock == 0.0, '拒绝替换时GDSF时钟不应增大'
+    finally:
+        Constants.total_cache_size(original_size)
+    print('通过')
+    
+    print('  - TinyLFU准入过滤... ', end='')
+    sketch = FrequencySketch(64, 4, 100, 15)
+    counts = {1: 30, 2: 5, 3: 1}
+    for task_type, count in counts.items():
+        for _ in range(count):
+            sketch.increment(task_type)
+    assert all(sketch.estimate(t) >= min(c, 15) for t, c in counts.items()), '频率估计不应低于实际次数'
+    assert sketch.estimate(1) == 15, '计数器应在上限处饱和'
+    for _ in range(100 - sketch.Additions):
+        sketch.increment(4)
+    assert sketch.ResetCount == 1 and sketch.estimate(1) == 7, '达到采样数后计数器应减半'
+    original_size = Constants.total_cache_size()
+    try:
+        size = Constants.MIN_METAK
+        Constants.total_cache_size(size)
+        mec = MEC()
+        mec.set_cache_strategy(Constants.LRU, tm)
+        mec.set_admission_filter(True)
+        for _ in range(5):
+            mec.record_task_access(1)
+        mec.add_to_cache(1, size, tm)
+        mec.record_task_access(2)
+        assert not mec.add_to_cache(2, size, tm) and list(mec.Cache) == [1], '低频任务不应挤出高频缓存项'
+        assert isinstance(mec.CachePolicy, TinyLFUAdmission) and mec.CachePolicy.RejectCount == 1, '拒绝准入次数错误'
+        for _ in range(5):
+            mec.record_task_access(2)
+        assert mec.add_to_cache(2, size, tm) and list(mec.Cache) == [2], '高频任务应替换低频缓存项'
+        mec.set_admission_filter(False)
+        assert isinstance(mec.CachePolicy, LRUPolicy) and 2 in mec.CachePolicy.Heap, '关闭准入过滤后应保留原策略状态'
+    finally:
+        Constants.total_cache_size(original_size)
+    print('通过')
+    
+    print('  - 滑动窗口访问记录... ', end='')
+    history = AccessHistory(4, 5)
+    rng = random.Random(3)
+    accesses = []
+    time_slot = 0
+    for _ in range(40):
+        time_slot += rng.choice((0, 1, 1, 2, 7))  # 包含跳过多个时隙（事件驱动模式）
+        history.advance(time_slot)
+        for _ in range(rng.randint(0, 3)):
+            task_type = rng.randint(1, 4)
+            history.record(task_type)
+            accesses.append((time_slot, task_type))
+        for task_type in range(1, 5):
+            expected = [t for t, k in accesses if k == task_type and t > time_slot - 5]
+            assert history.window_count(task_type) == len(expected), '窗口访问次数错误'
+            assert history.access_times(task_type) == expected, '窗口访问时隙错误'
+    print('通过')
+    
+    print('  - 衰减流行度估计... ', end='')
+    estimator = PopularityEstimator(3, 10)
+    estimator.update(np.array([0, 8, 0, 0]), 0)
+    estimator.update(np.array([0, 0, 4, 0]), 10)  # 跳过的时隙按经过的时隙数衰减，类型1衰减到一半
+    assert np.allclose(estimator.Counts, [0, 4, 4, 0]), '衰减计数错误'
+    assert np.isclose(estimator.frequency(1), 0.5) and np.isclose(estimator.frequency(2), 0.5), '流行度应为衰减计数的占比'
+    mec = MEC()
+    mec.record_task_access(1)
+    mec.record_arrivals(np.bincount([1], minlength=Constants.K() + 1))
+    assert mec.popularity(1) == mec.AccessFrequency[1], '默认应使用累计访问频率'
+    mec.set_popularity_mode(Constants.DecayedPopularity)
+    assert mec.popularity(1) == 1.0 and mec.popularity(2) == 0.0, '衰减模式应使用衰减计数的占比'
+    print('通过')
+    
+    print('  - 回放访问序列... ', end='')
+    stream, task_manager = record_access_stream(30)
+    results = {strategy: replay_access_stream(strategy, stream, task_manager) for strategy in (Constants.FIFO, Constants.LRU)}
+    for result in results.values():
+        assert 0 < result['hit_rate'] < 1, '命中率应在0和1之间'
+        assert result['value'] > 0 and result['ns_per_op'] > 0, '回放统计错误'
+    assert replay_access_stream(Constants.LRU, stream, task_manager)['hit_rate'] == results[Constants.LRU]['hit_rate'], '回放结果应可复现'
+    print('通过')
+    
+    print('  - 回放录制的到达序列... ', end='')
+    trace = ArrivalTrace.generate(30, 3)
+    stream, task_manager = stream_from_arrival_trace(trace)
+    assert sum(len(task_types) for task_types in stream) == len(trace.TaskType), '访问序列应包含全部录制的到达'
+    with tempfile.TemporaryDirectory() as tmp:
+        sim = Simulator(30, arrival_source=trace)
+        sim.set_trace(tmp)
+        sim.run_simulation()
+        recorded = stream_from_trace(tmp, sim.TaskManager, num_slots=30)
+    assert [sorted(task_types) for task_types in stream] == recorded, '轨迹中的到达记录应与录制的到达序列一致'
+    assert replay_access_stream(Constants.LRU, recorded, sim.TaskManager)['value'] > 0, '回放统计错误'
+    print('通过')
+
+
 def quick_demo():
     """快速演示程序"""
     
@@ -0,0 +1,140 @@
+"""
+仿真事件轨迹记录（定长二进制记录，可用np.memmap零拷贝读取）
+"""
+
+import os
+import numpy as np
+try:
+    from .constants import Constants
+except ImportError:
+    from constants import Constants
+
+
+# 轨迹记录格式（紧凑排列，每条记录33字节）
+TRACE_DTYPE = np.dtype([
+    ('slot', '<i8'),       # 时隙
+    ('event', 'u1'),       # 事件类型（TraceRecorder.ARRIVAL等）
+    ('task_type', '<i4'),  # 任务类型
+    ('node', '<i4'),       # 虚拟节点ID（调度事件，其余为0）
+    ('count', '<i8'),      # 任务数量（调度事件为mkr）
+    ('value', '<f8'),      # 附加数值（调度事件为bkr，缓存事件为元数据量）
+])
+
+
+class TraceRecorder:
+    """
+    TraceRecorder 仿真事件轨迹记录器
+    事件先写入预分配的结构化数组缓冲区，缓冲区满时整块追加到当前分块文件；
+    分块文件达到chunk_records条记录后换下一个文件（trace_00000.bin, trace_00001.bin, ...），
+    文件内容为TRACE_DTYPE的原始字节，可用load_trace按np.memmap零拷贝读取
+    """
+
+    ARRIVAL = 1       # 任务到达：count=到达数
+    EXPIRY = 2        # 任务过期：count=过期数
+    CACHE_HIT = 3     # 缓存命中：count=直接完成的积压任务数
+    SCHEDULE = 4      # 调度决策：node=节点ID，count=mkr，value=bkr
+    COMPLETION = 5    # 节点计算完成：count=随之完成的积压任务数
+    CACHE_INSERT = 6  # 加入缓存：value=元数据量
+    CACHE_EVICT = 7   # 移出缓存：value=元数据量
+
+    def __init__(self, directory, buffer_records=None, chunk_records=None):
+        """构造函数，directory不存在时创建，已有的分块文件（上一次记录的轨迹）会被删除"""
+        if buffer_records is None:
+            buffer_records = Constants.TRACE_BUFFER_RECORDS
+        if chunk_records is None:
+            chunk_records = Constants.TRACE_CHUNK_RECORDS
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if name.startswith('trace_') and name.endswith('.bin'):
+                os.remove(os.path.join(directory, name))
+        self.Directory = directory
+        self.ChunkRecords = chunk_records
+        self.Buffer = np.zeros(buffer_records, dtype=TRACE_DTYPE)  # 预分配的记录缓冲区
+        self.Size = 0              # 缓冲区中的记录数
+        self.ChunkIndex = 0        # 当前分块文件序号
+        self.ChunkSize = 0         # 当前分块文件中的记录数
+        self.File = None           # 当前分块文件
+        self.TotalRecords = 0      # 已记录的事件总数
+
+    def record(self, time_slot, event, task_type, node=0, count=0, value=0.0):
+        """记录一个事件"""
+        if self.Size == len(self.Buffer):
+            self.flush()
+        self.Buffer[self.Size] = (time_slot, event, task_type, node, count, value)
+        self.Size += 1
+        self.TotalRecords += 1
+
+    def record_counts(self, time_slot, event, counts):
+        """按长度为K+1的数量数组批量记录事件（只记录数量非零的任务类型）"""
+        task_types = np.flatnonzero(counts)
+        n = len(task_types)
+        if n == 0:
+            return
+        if self.Size + n > len(self.Buffer):
+            self.flush()
+            if n > len(self.Buffer):
+                self.Buffer = np.zeros(n, dtype=TRACE_DTYPE)
+        rows = self.Buffer[self.Size:self.Size + n]
+        rows['slot'] = time_slot
+        rows['event'] = event
+        rows['task_type'] = task_types
+        rows['node'] = 0
+        rows['count'] = counts[task_types]
+        rows['value'] = 0.0
+        self.Size += n
+        self.TotalRecords += n
+
+    def flush(self):
+        """把缓冲区中的记录追加到分块文件"""
+        start = 0
+        while start < self.Size:
+            if self.File is None or self.ChunkSize >= self.ChunkRecords:
+                self._next_chunk()
+            n = min(self.Size - start, self.ChunkRecords - self.ChunkSize)
+            self.Buffer[start:start + n].tofile(self.File)
+            self.ChunkSize += n
+            start += n
+        self.Size = 0
+        if self.File is not None:
+            self.File.flush()
+
+    def close(self):
+        """写出剩余记录并关闭分块文件（之后继续记录时写入下一个分块文件）"""
+        self.flush()
+        if self.File is not None:
+            self.File.close()
+            self.File = None
+            self.ChunkIndex += 1
+            self.ChunkSize = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _next_chunk(self):
+        """关闭当前分块文件并打开下一个"""
+        if self.File is not None:
+            self.File.close()
+            self.ChunkIndex += 1
+        self.File = open(trace_chunk_path(self.Directory, self.ChunkIndex), 'wb')
+        self.ChunkSize = 0
+
+
+def trace_chunk_path(directory, index):
+    """分块文件路径"""
+    return os.path.join(directory, f'trace_{index:05d}.bin')
+
+
+def load_trace(directory):
+    """按分块顺序返回轨迹文件的只读np.memmap列表（结构化数组，字段见TRACE_DTYPE），跳过空文件"""
+    chunks = []
+    index = 0
+    while os.path.exists(trace_chunk_path(directory, index)):
+        path = trace_chunk_path(directory, index)
+        if os.path.getsize(path) >= TRACE_DTYPE.itemsize:
+            chunks.append(np.memmap(path, dtype=TRACE_DTYPE, mode='r'))
+        index += 1
+    return chunks
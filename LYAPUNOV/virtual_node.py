@@ -2,9 +2,12 @@
 虚拟节点类
 """
 
+import numpy as np
+
+
 class VirtualNode:
     """VirtualNode 虚拟节点"""
-    
+
     def __init__(self, node_id, compute_frequency):
         """构造函数"""
         self.ID = node_id                         # 节点ID
@@ -12,3 +15,105 @@ class VirtualNode:
         self.IsIdle = True                        # 是否空闲
         self.CurrentTaskType = -1                 # 当前计算的任务类型，-1表示无任务
         self.RemainingSlots = 0                   # 剩余计算时隙数
+
+
+class VirtualNodeView:
+    """VirtualNodeView 节点池中单个节点的视图，属性与VirtualNode一致，读写直接作用于节点池数组"""
+
+    __slots__ = ('Pool', 'Index')
+
+    def __init__(self, pool, index):
+        self.Pool = pool    # 所属节点池
+        self.Index = index  # 在节点池中的0基下标
+
+    @property
+    def ID(self):
+        return self.Index + 1
+
+    @property
+    def ComputeFrequency(self):
+        return int(self.Pool.ComputeFrequency[self.Index])
+
+    @ComputeFrequency.setter
+    def ComputeFrequency(self, value):
+        self.Pool.ComputeFrequency[self.Index] = value
+
+    @property
+    def IsIdle(self):
+        return bool(self.Pool.IsIdle[self.Index])
+
+    @IsIdle.setter
+    def IsIdle(self, value):
+        self.Pool.IsIdle[self.Index] = value
+
+    @property
+    def CurrentTaskType(self):
+        return int(self.Pool.CurrentTaskType[self.Index])
+
+    @CurrentTaskType.setter
+    def CurrentTaskType(self, value):
+        self.Pool.CurrentTaskType[self.Index] = value
+
+    @property
+    def RemainingSlots(self):
+        return int(self.Pool.RemainingSlots[self.Index])
+
+    @RemainingSlots.setter
+    def RemainingSlots(self, value):
+        self.Pool.RemainingSlots[self.Index] = value
+
+
+class VirtualNodePool:
+    """VirtualNodePool 虚拟节点池，节点状态按列存储在NumPy数组中（下标 = 节点ID - 1）"""
+
+    def __init__(self, frequencies):
+        """构造函数，frequencies为各节点的计算频率"""
+        count = len(frequencies)
+        self.ComputeFrequency = np.array(frequencies, dtype=np.int64)  # 计算频率 (MHz)
+        self.IsIdle = np.ones(count, dtype=bool)                       # 是否空闲
+        self.CurrentTaskType = np.full(count, -1, dtype=np.int64)      # 当前计算的任务类型，-1表示无任务
+        self.RemainingSlots = np.zeros(count, dtype=np.int64)          # 剩余计算时隙数
+        self.Views = [VirtualNodeView(self, i) for i in range(count)]  # VirtualNode风格的节点视图
+
+    def __len__(self):
+        return len(self.Views)
+
+    def __getitem__(self, index):
+        return self.Views[index]
+
+    def __iter__(self):
+        return iter(self.Views)
+
+    def idle_indices(self):
+        """空闲节点的0基下标数组（按节点ID升序）"""
+        return np.flatnonzero(self.IsIdle)
+
+    def busy_count(self):
+        """忙碌节点数量"""
+        return len(self.IsIdle) - int(np.count_nonzero(self.IsIdle))
+
+    def assign(self, index, task_type, required_slots):
+        """把任务分配给下标为index的节点"""
+        self.IsIdle[index] = False
+        self.CurrentTaskType[index] = task_type
+        self.RemainingSlots[index] = required_slots
+
+    def tick(self):
+        """
+        所有忙碌节点倒计时一个时隙
+        返回本时隙完成计算的任务类型数组（按节点ID顺序）
+        """
+        busy = ~self.IsIdle
+        self.RemainingSlots[busy] -= 1
+        done = busy & (self.RemainingSlots <= 0)
+        if not done.any():
+            return self.CurrentTaskType[:0]
+        completed_types = self.CurrentTaskType[done]
+        self.IsIdle[done] = True
+        self.CurrentTaskType[done] = -1
+        self.RemainingSlots[done] = 0
+        return completed_types
+
+    def advance(self, slots):
+        """忙碌节点的剩余时隙数一次性减少slots"""
+        self.RemainingSlots[~self.IsIdle] -= slots